@@ -144,6 +144,42 @@ CREATE TABLE MealPlans (
     FOREIGN KEY (recipe_id) REFERENCES Recipes(id)
 );
 
+/*
+ MealPlanRules
+ -------------
+ Purpose : Recurring plans ("pizza every Friday", "soup every other Sunday").
+ Why needed: A rule stands for an unbounded number of dated plans; they are
+             expanded only for the window being shown (scripts/meal_calendar.py)
+             instead of being stored one row per occurrence.
+
+ Columns:
+   - id: unique rule id.
+   - recipe_id: FK to Recipes.
+   - starts_on: first day the rule can fire ('YYYY-MM-DD'); also the anchor
+                that "every N" periods count from.
+   - ends_on: last day the rule can fire (inclusive); NULL = open-ended.
+   - freq: 'daily', 'weekly' or 'monthly'.
+   - every: period length in freq units (2 + 'weekly' = every other week).
+   - weekdays: weekly rules only; bitmask Monday = 1 ... Sunday = 64. 0 means
+               the weekday of starts_on.
+   - time_of_day: 'HH:MM:SS' given to every occurrence.
+   - servings: as in MealPlans.
+ Monthly rules fire on starts_on's day of the month, or the month's last day
+ when it is shorter.
+*/
+CREATE TABLE MealPlanRules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipe_id INTEGER NOT NULL,
+    starts_on TEXT NOT NULL,
+    ends_on TEXT,
+    freq TEXT NOT NULL CHECK (freq IN ('daily', 'weekly', 'monthly')),
+    every INTEGER NOT NULL DEFAULT 1 CHECK (every >= 1),
+    weekdays INTEGER NOT NULL DEFAULT 0 CHECK (weekdays BETWEEN 0 AND 127),
+    time_of_day TEXT NOT NULL DEFAULT '18:00:00',
+    servings INTEGER NOT NULL DEFAULT 1,
+    FOREIGN KEY (recipe_id) REFERENCES Recipes(id) ON DELETE CASCADE
+);
+
 /*
  CookHistory
  -----------
@@ -164,6 +200,254 @@ CREATE TABLE CookHistory (
     FOREIGN KEY (recipe_id) REFERENCES Recipes(id)
 );
 
+-- Inventory history ---------------------------------------------------------
+/*
+ InventoryEvents
+ ---------------
+ Purpose : Append-only log of every pantry change (restock, use, correction,
+           removal); Inventory keeps only the latest state.
+ Why needed: Depletion history and "what did the pantry hold at time T".
+
+ Columns:
+   - id: append order; events are appended in occurred_at order, so id order
+         is time order.
+   - ingredient_id: FK to Ingredients.
+   - occurred_at: when the change happened.
+   - kind: 'restock', 'use', 'adjust' or 'remove'.
+   - delta: signed quantity change, for depletion analytics.
+   - quantity / unit / expires_at: the ingredient's state after the change, so
+     replay is "last event wins" rather than a running sum.
+*/
+CREATE TABLE InventoryEvents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ingredient_id INTEGER NOT NULL,
+    occurred_at TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    delta REAL NOT NULL,
+    quantity REAL NOT NULL,
+    unit TEXT NOT NULL,
+    expires_at TEXT,
+    FOREIGN KEY (ingredient_id) REFERENCES Ingredients(id) ON DELETE CASCADE
+);
+
+/*
+ InventoryCheckpoints / InventoryCheckpointRows
+ ----------------------------------------------
+ Purpose : Periodic snapshots of the whole pantry as of an event id.
+ Why needed: A point-in-time query starts from the newest checkpoint at or
+             before T and replays only the events after it (at most one
+             checkpoint interval) instead of the whole log. Compaction drops
+             events and checkpoints older than the retained ones
+             (scripts/inventory_log.py).
+
+ Columns:
+   - taken_at / last_event_id: the snapshot reflects every event up to and
+     including last_event_id, whose occurred_at is taken_at.
+   - is_base: set on the oldest checkpoint left after compaction; history
+              before it is gone.
+   - rows: one row per ingredient present at that point.
+*/
+CREATE TABLE InventoryCheckpoints (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    taken_at TEXT NOT NULL,
+    last_event_id INTEGER NOT NULL,
+    is_base INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE InventoryCheckpointRows (
+    checkpoint_id INTEGER NOT NULL,
+    ingredient_id INTEGER NOT NULL,
+    quantity REAL NOT NULL,
+    unit TEXT NOT NULL,
+    expires_at TEXT,
+    PRIMARY KEY (checkpoint_id, ingredient_id),
+    FOREIGN KEY (checkpoint_id) REFERENCES InventoryCheckpoints(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Cooking analytics ---------------------------------------------------------
+/*
+ CookRollups / CookCuisineRollups
+ --------------------------------
+ Purpose : Pre-aggregated cook counts per recipe and per cuisine.
+ Why needed: "Most cooked" over months or years of CookHistory would otherwise
+             be a GROUP BY over every row on each request. A top-N over any
+             date range sums whole weeks plus the odd days at either end
+             (scripts/cook_rollups.py); all-time ranks read one row per recipe.
+
+ Columns:
+   - grain: 'day', 'week' (period is that week's Monday) or 'all' (period '').
+   - period: 'YYYY-MM-DD' start of the day/week.
+   - recipe_id / cuisine: what was cooked; recipes without a cuisine count
+                          under ''.
+   - cooks: number of CookHistory rows in the bucket.
+
+ The triggers below keep both tables current on every CookHistory insert,
+ update and delete, and move counts between cuisines when a recipe's cuisine
+ changes. Bulk loads create the triggers after the data and rebuild the
+ rollups with one GROUP BY instead.
+*/
+CREATE TABLE CookRollups (
+    grain TEXT NOT NULL,
+    period TEXT NOT NULL,
+    recipe_id INTEGER NOT NULL,
+    cooks INTEGER NOT NULL,
+    PRIMARY KEY (grain, period, recipe_id)
+) WITHOUT ROWID;
+
+CREATE TABLE CookCuisineRollups (
+    grain TEXT NOT NULL,
+    period TEXT NOT NULL,
+    cuisine TEXT NOT NULL,
+    cooks INTEGER NOT NULL,
+    PRIMARY KEY (grain, period, cuisine)
+) WITHOUT ROWID;
+
+CREATE TRIGGER trg_cookhistory_rollup_insert AFTER INSERT ON CookHistory
+BEGIN
+    INSERT INTO CookRollups (grain, period, recipe_id, cooks)
+    VALUES ('day', date(NEW.cooked_at), NEW.recipe_id, 1),
+           ('week', date(NEW.cooked_at, 'weekday 0', '-6 days'), NEW.recipe_id, 1),
+           ('all', '', NEW.recipe_id, 1)
+    ON CONFLICT (grain, period, recipe_id) DO UPDATE SET cooks = cooks + 1;
+    INSERT INTO CookCuisineRollups (grain, period, cuisine, cooks)
+    SELECT g.grain, g.period, COALESCE(r.cuisine, ''), 1
+    FROM (SELECT 'day' AS grain, date(NEW.cooked_at) AS period
+          UNION ALL SELECT 'week', date(NEW.cooked_at, 'weekday 0', '-6 days')
+          UNION ALL SELECT 'all', '') AS g
+    JOIN Recipes AS r ON r.id = NEW.recipe_id
+    WHERE true
+    ON CONFLICT (grain, period, cuisine) DO UPDATE SET cooks = cooks + 1;
+END;
+
+CREATE TRIGGER trg_cookhistory_rollup_delete AFTER DELETE ON CookHistory
+BEGIN
+    UPDATE CookRollups SET cooks = cooks - 1
+    WHERE recipe_id = OLD.recipe_id
+      AND (grain, period) IN (VALUES ('day', date(OLD.cooked_at)),
+                                     ('week', date(OLD.cooked_at, 'weekday 0', '-6 days')),
+                                     ('all', ''));
+    UPDATE CookCuisineRollups SET cooks = cooks - 1
+    WHERE cuisine = (SELECT COALESCE(cuisine, '') FROM Recipes WHERE id = OLD.recipe_id)
+      AND (grain, period) IN (VALUES ('day', date(OLD.cooked_at)),
+                                     ('week', date(OLD.cooked_at, 'weekday 0', '-6 days')),
+                                     ('all', ''));
+    DELETE FROM CookRollups WHERE recipe_id = OLD.recipe_id AND cooks <= 0;
+    DELETE FROM CookCuisineRollups
+    WHERE cuisine = (SELECT COALESCE(cuisine, '') FROM Recipes WHERE id = OLD.recipe_id) AND cooks <= 0;
+END;
+
+CREATE TRIGGER trg_cookhistory_rollup_update AFTER UPDATE OF recipe_id, cooked_at ON CookHistory
+WHEN OLD.recipe_id IS NOT NEW.recipe_id OR date(OLD.cooked_at) IS NOT date(NEW.cooked_at)
+BEGIN
+    UPDATE CookRollups SET cooks = cooks - 1
+    WHERE recipe_id = OLD.recipe_id
+      AND (grain, period) IN (VALUES ('day', date(OLD.cooked_at)),
+                                     ('week', date(OLD.cooked_at, 'weekday 0', '-6 days')),
+                                     ('all', ''));
+    UPDATE CookCuisineRollups SET cooks = cooks - 1
+    WHERE cuisine = (SELECT COALESCE(cuisine, '') FROM Recipes WHERE id = OLD.recipe_id)
+      AND (grain, period) IN (VALUES ('day', date(OLD.cooked_at)),
+                                     ('week', date(OLD.cooked_at, 'weekday 0', '-6 days')),
+                                     ('all', ''));
+    INSERT INTO CookRollups (grain, period, recipe_id, cooks)
+    VALUES ('day', date(NEW.cooked_at), NEW.recipe_id, 1),
+           ('week', date(NEW.cooked_at, 'weekday 0', '-6 days'), NEW.recipe_id, 1),
+           ('all', '', NEW.recipe_id, 1)
+    ON CONFLICT (grain, period, recipe_id) DO UPDATE SET cooks = cooks + 1;
+    INSERT INTO CookCuisineRollups (grain, period, cuisine, cooks)
+    SELECT g.grain, g.period, COALESCE(r.cuisine, ''), 1
+    FROM (SELECT 'day' AS grain, date(NEW.cooked_at) AS period
+          UNION ALL SELECT 'week', date(NEW.cooked_at, 'weekday 0', '-6 days')
+          UNION ALL SELECT 'all', '') AS g
+    JOIN Recipes AS r ON r.id = NEW.recipe_id
+    WHERE true
+    ON CONFLICT (grain, period, cuisine) DO UPDATE SET cooks = cooks + 1;
+    DELETE FROM CookRollups WHERE recipe_id = OLD.recipe_id AND cooks <= 0;
+    DELETE FROM CookCuisineRollups
+    WHERE cuisine = (SELECT COALESCE(cuisine, '') FROM Recipes WHERE id = OLD.recipe_id) AND cooks <= 0;
+END;
+
+CREATE TRIGGER trg_recipes_rollup_cuisine AFTER UPDATE OF cuisine ON Recipes
+WHEN COALESCE(OLD.cuisine, '') IS NOT COALESCE(NEW.cuisine, '')
+BEGIN
+    UPDATE CookCuisineRollups
+    SET cooks = cooks - (SELECT r.cooks FROM CookRollups AS r
+                         WHERE r.recipe_id = NEW.id
+                           AND r.grain = CookCuisineRollups.grain
+                           AND r.period = CookCuisineRollups.period)
+    WHERE cuisine = COALESCE(OLD.cuisine, '')
+      AND (grain, period) IN (SELECT grain, period FROM CookRollups WHERE recipe_id = NEW.id);
+    INSERT INTO CookCuisineRollups (grain, period, cuisine, cooks)
+    SELECT grain, period, COALESCE(NEW.cuisine, ''), cooks FROM CookRollups WHERE recipe_id = NEW.id
+    ON CONFLICT (grain, period, cuisine) DO UPDATE SET cooks = cooks + excluded.cooks;
+    DELETE FROM CookCuisineRollups WHERE cuisine = COALESCE(OLD.cuisine, '') AND cooks <= 0;
+END;
+
+-- Change tracking -----------------------------------------------------------
+/*
+ DataVersions
+ ------------
+ Purpose : Monotonic counters bumped by triggers whenever a group of tables is
+           written.
+ Why needed: Derived answers ("what can I cook", "what do I need") can be cached
+             and reused until one of the tables they read actually changes;
+             see scripts/query_cache.py.
+
+ Columns:
+   - name: counter name: 'inventory' (Inventory), 'recipes' (Recipes,
+           RecipeIngredients and Ingredients, whose names recipe answers
+           show) or 'plans' (MealPlans and MealPlanRules).
+   - version: incremented once per written row.
+*/
+CREATE TABLE DataVersions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT INTO DataVersions (name) VALUES ('inventory'), ('recipes'), ('plans');
+
+CREATE TRIGGER trg_inventory_version_insert AFTER INSERT ON Inventory
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'inventory'; END;
+CREATE TRIGGER trg_inventory_version_update AFTER UPDATE ON Inventory
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'inventory'; END;
+CREATE TRIGGER trg_inventory_version_delete AFTER DELETE ON Inventory
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'inventory'; END;
+
+CREATE TRIGGER trg_recipes_version_insert AFTER INSERT ON Recipes
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'recipes'; END;
+CREATE TRIGGER trg_recipes_version_update AFTER UPDATE ON Recipes
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'recipes'; END;
+CREATE TRIGGER trg_recipes_version_delete AFTER DELETE ON Recipes
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'recipes'; END;
+
+CREATE TRIGGER trg_recipeingredients_version_insert AFTER INSERT ON RecipeIngredients
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'recipes'; END;
+CREATE TRIGGER trg_recipeingredients_version_update AFTER UPDATE ON RecipeIngredients
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'recipes'; END;
+CREATE TRIGGER trg_recipeingredients_version_delete AFTER DELETE ON RecipeIngredients
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'recipes'; END;
+
+CREATE TRIGGER trg_ingredients_version_insert AFTER INSERT ON Ingredients
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'recipes'; END;
+CREATE TRIGGER trg_ingredients_version_update AFTER UPDATE ON Ingredients
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'recipes'; END;
+CREATE TRIGGER trg_ingredients_version_delete AFTER DELETE ON Ingredients
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'recipes'; END;
+
+CREATE TRIGGER trg_mealplans_version_insert AFTER INSERT ON MealPlans
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'plans'; END;
+CREATE TRIGGER trg_mealplans_version_update AFTER UPDATE ON MealPlans
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'plans'; END;
+CREATE TRIGGER trg_mealplans_version_delete AFTER DELETE ON MealPlans
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'plans'; END;
+
+CREATE TRIGGER trg_mealplanrules_version_insert AFTER INSERT ON MealPlanRules
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'plans'; END;
+CREATE TRIGGER trg_mealplanrules_version_update AFTER UPDATE ON MealPlanRules
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'plans'; END;
+CREATE TRIGGER trg_mealplanrules_version_delete AFTER DELETE ON MealPlanRules
+BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = 'plans'; END;
+
 -- Helpful indexes -----------------------------------------------------------
 /*
  idx_recipeingredients_recipe: speeds up lookups of all ingredients for a recipe.
@@ -171,7 +455,63 @@ CREATE TABLE CookHistory (
                                    given ingredient (for suggestions/alternatives).
  idx_shopping_status: allows quick filtering of shopping items by status so the
                       UI can show pending vs. bought lists efficiently.
+ idx_inventory_expiry: expiry-ordered partial index over perishable stock; the
+                       "use it up" ranking walks it up to a date horizon instead
+                       of scanning the whole pantry.
+
+ Keyset pagination (scripts/pagination.py) seeks straight to "rows after the
+ last one shown", so every paged list needs an index matching its sort key.
+ The rowid (id) is implicitly the last column of each index and breaks ties;
+ shopping lists page by (status, id) and are already covered by
+ idx_shopping_status.
+ idx_recipes_created: recipe list ordered by creation date.
+ idx_recipes_favorite: favorites-first recipe list, newest first within each group.
+ idx_cookhistory_cooked: cook history ordered by when it was cooked.
+
+ Foreign-key child indexes: without them every parent delete/update scans the
+ child table for references, and "all rows belonging to these recipes /
+ ingredients" (scripts/subset_db.py) becomes a full scan.
+ idx_shopping_ingredient: shopping items per ingredient.
+ idx_mealplans_recipe: meal plans per recipe.
+ idx_cookhistory_recipe: cook history per recipe.
+
+ idx_inventoryevents_time: finds the last event at or before T (the upper end
+                           of a point-in-time replay).
+ idx_inventoryevents_ingredient: one ingredient's history, and the subset
+                                 closure by ingredient.
+ idx_inventorycheckpoints_taken: newest checkpoint at or before T.
+
+ idx_cookrollups_rank: top-N recipes within one bucket (e.g. all time) read in
+                       rank order.
+ idx_cookrollups_recipe: a recipe's buckets, for the rollup triggers.
+ idx_cookcuisinerollups_rank: top-N cuisines within one bucket.
+
+ Calendar windows [start, end) (scripts/meal_calendar.py):
+ idx_mealplans_scheduled: one-off plans inside the window.
+ idx_mealplanrules_active: rules that can fire inside the window. An interval
+                           overlap is not one b-tree range, so the query reads
+                           it twice: open-ended rules (ends_on IS NULL, then
+                           starts_on < end) and rules with ends_on >= start,
+                           filtering starts_on from the index. Expired rules,
+                           the bulk of a long-lived calendar, are never read.
+ idx_mealplanrules_recipe: a recipe's rules, and the subset closure by recipe.
 */
 CREATE INDEX idx_recipeingredients_recipe ON RecipeIngredients(recipe_id);
 CREATE INDEX idx_recipeingredients_ingredient ON RecipeIngredients(ingredient_id);
 CREATE INDEX idx_shopping_status ON ShoppingItems(status);
+CREATE INDEX idx_inventory_expiry ON Inventory(expires_at) WHERE expires_at IS NOT NULL;
+CREATE INDEX idx_recipes_created ON Recipes(created_at);
+CREATE INDEX idx_recipes_favorite ON Recipes(favorite, created_at);
+CREATE INDEX idx_cookhistory_cooked ON CookHistory(cooked_at);
+CREATE INDEX idx_shopping_ingredient ON ShoppingItems(ingredient_id);
+CREATE INDEX idx_mealplans_recipe ON MealPlans(recipe_id);
+CREATE INDEX idx_cookhistory_recipe ON CookHistory(recipe_id);
+CREATE INDEX idx_inventoryevents_time ON InventoryEvents(occurred_at);
+CREATE INDEX idx_inventoryevents_ingredient ON InventoryEvents(ingredient_id);
+CREATE INDEX idx_inventorycheckpoints_taken ON InventoryCheckpoints(taken_at);
+CREATE INDEX idx_cookrollups_rank ON CookRollups(grain, period, cooks DESC);
+CREATE INDEX idx_cookrollups_recipe ON CookRollups(recipe_id);
+CREATE INDEX idx_cookcuisinerollups_rank ON CookCuisineRollups(grain, period, cooks DESC);
+CREATE INDEX idx_mealplans_scheduled ON MealPlans(scheduled_for);
+CREATE INDEX idx_mealplanrules_active ON MealPlanRules(ends_on, starts_on);
+CREATE INDEX idx_mealplanrules_recipe ON MealPlanRules(recipe_id);
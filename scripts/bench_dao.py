@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pooled DAO layer (scripts/dao) against ad hoc sqlite3 access.
+
+Cases:
+  * inventory writes: connect-per-call with literal SQL vs pooled single
+    upserts (cached statements) vs one ``upsert_many`` batch;
+  * concurrent reads: threads opening their own connection per lookup vs
+    threads sharing the pool.
+
+Usage:
+    python scripts/bench_dao.py --scale 50 --rows 2000 --threads 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import shutil
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import benchlib
+from dao import WAL_PRAGMAS, Database, InventoryEntity
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=2000, help="inventory rows written per case")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--reads", type=int, default=500, help="lookups per thread")
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    pristine = benchlib.scaled_database(args.scale)
+    path = pristine.with_name("dao-work.db")
+    shutil.copyfile(pristine, path)
+
+    db = Database(path, max_size=args.threads, pragmas=WAL_PRAGMAS)
+    ingredient_ids = [row.id for row in db.ingredients.get_all()]
+    rng = random.Random(5)
+    batch = [
+        InventoryEntity(ingredient_id, round(rng.uniform(1, 500), 1), "g", None, "2030-01-01 00:00:00")
+        for ingredient_id in rng.sample(ingredient_ids, min(args.rows, len(ingredient_ids)))
+    ]
+
+    def ad_hoc_writes() -> None:
+        for row in batch:
+            conn = sqlite3.connect(path)
+            conn.execute(
+                "INSERT INTO Inventory (ingredient_id, quantity, unit, expires_at, updated_at) "
+                f"VALUES ({row.ingredient_id}, {row.quantity}, '{row.unit}', NULL, '{row.updated_at}') "
+                "ON CONFLICT (ingredient_id) DO UPDATE SET quantity = excluded.quantity, "
+                "unit = excluded.unit, expires_at = excluded.expires_at, updated_at = excluded.updated_at"
+            )
+            conn.commit()
+            conn.close()
+
+    def pooled_writes() -> None:
+        for row in batch:
+            db.inventory.upsert(row)
+
+    def pooled_batch() -> None:
+        db.inventory.upsert_many(batch)
+
+    lookups = [rng.choice(ingredient_ids) for _ in range(args.reads)]
+
+    def ad_hoc_reader() -> None:
+        for ingredient_id in lookups:
+            conn = sqlite3.connect(path)
+            conn.execute(f"SELECT id, name, default_unit, category FROM Ingredients WHERE id = {ingredient_id}").fetchone()
+            conn.close()
+
+    def pooled_reader() -> None:
+        for ingredient_id in lookups:
+            db.ingredients.find_by_id(ingredient_id)
+
+    def fan_out(reader) -> None:
+        with ThreadPoolExecutor(args.threads) as executor:
+            for future in [executor.submit(reader) for _ in range(args.threads)]:
+                future.result()
+
+    results = {
+        f"{len(batch)} writes, connect per call": benchlib.measure(ad_hoc_writes, args.repeat),
+        f"{len(batch)} writes, pooled upsert": benchlib.measure(pooled_writes, args.repeat),
+        f"{len(batch)} writes, pooled upsert_many": benchlib.measure(pooled_batch, args.repeat),
+        f"{args.threads}x{args.reads} reads, connect per call": benchlib.measure(
+            lambda: fan_out(ad_hoc_reader), args.repeat
+        ),
+        f"{args.threads}x{args.reads} reads, pooled": benchlib.measure(lambda: fan_out(pooled_reader), args.repeat),
+    }
+    stats = dict(db.pool.stats)
+    db.close()
+    benchlib.print_results(f"DAO layer vs ad hoc sqlite3, scale x{args.scale} (pool: {stats})", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Benchmark result history with regression detection.
+
+Every ``benchlib.print_results`` call also records its cases here: one run per
+benchmark process (script, arguments, ``--scale``, git revision + dirty flag,
+machine fingerprint) and, per case, the median/mean/stdev/min/max and raw
+samples. The store is a SQLite file, build/bench-history.db by default;
+MOONYAM_BENCH_HISTORY=path moves it and MOONYAM_BENCH_HISTORY=off disables
+recording.
+
+``compare`` pools the samples of every run at the baseline revision and at
+the candidate (default: the newest run's revision, including uncommitted
+trees) on this machine. Cases match on script, arguments, position of the
+suite within the run and case name (suite titles may carry run-specific
+numbers). A
+case is a regression when the candidate is slower by at least
+``--min-change`` (relative median) *and* a one-sided Mann-Whitney U test
+rejects "not slower" at ``--alpha``. The test is exact for small samples and
+uses the normal approximation otherwise. The command exits 1 when anything
+regressed, so it can gate CI.
+
+Machine fingerprints hash OS, kernel, CPU model/count, Python and SQLite
+versions; results from different machines are never compared.
+
+Usage:
+    python scripts/use_it_up.py bench --scale 20            # recorded automatically
+    python scripts/bench_history.py runs
+    python scripts/bench_history.py compare --baseline 243d1ce
+    python scripts/bench_history.py compare --baseline 243d1ce --candidate bb88f12 --min-change 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import functools
+import hashlib
+import json
+import math
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_STORE = ROOT / "build" / "bench-history.db"
+ENV_VAR = "MOONYAM_BENCH_HISTORY"
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS BenchRuns (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    script TEXT NOT NULL,
+    argv TEXT NOT NULL,
+    scale INTEGER,
+    revision TEXT NOT NULL,
+    dirty INTEGER NOT NULL,
+    machine TEXT NOT NULL,
+    machine_info TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS BenchCases (
+    run_id INTEGER NOT NULL REFERENCES BenchRuns(id) ON DELETE CASCADE,
+    suite_index INTEGER NOT NULL,
+    suite TEXT NOT NULL,
+    name TEXT NOT NULL,
+    median_ms REAL NOT NULL,
+    mean_ms REAL NOT NULL,
+    stdev_ms REAL NOT NULL,
+    min_ms REAL NOT NULL,
+    max_ms REAL NOT NULL,
+    samples TEXT NOT NULL,
+    PRIMARY KEY (run_id, suite_index, name)
+);
+CREATE INDEX IF NOT EXISTS idx_benchruns_revision ON BenchRuns(machine, revision);
+"""
+# Exact U distribution up to this many samples in total; normal approximation above.
+EXACT_LIMIT = 40
+
+
+# Recording ---------------------------------------------------------------------
+def store_path() -> Path | None:
+    value = os.environ.get(ENV_VAR, "")
+    if value.lower() in ("off", "0", "no"):
+        return None
+    return Path(value) if value else DEFAULT_STORE
+
+
+def _cpu_model() -> str:
+    try:
+        for line in Path("/proc/cpuinfo").read_text().splitlines():
+            if line.startswith("model name"):
+                return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or "unknown"
+
+
+@functools.lru_cache(maxsize=None)
+def machine() -> Tuple[str, str]:
+    """(fingerprint, JSON description) of this machine and runtime."""
+    info = {
+        "system": platform.system(),
+        "release": platform.release(),
+        "arch": platform.machine(),
+        "cpu": _cpu_model(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+    }
+    text = json.dumps(info, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()[:12], text
+
+
+@functools.lru_cache(maxsize=None)
+def git_revision() -> Tuple[str, bool]:
+    """(HEAD commit, whether tracked files differ from it); ("unknown", False) outside git."""
+    try:
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return head, bool(status.strip())
+
+
+def _scale(argv: Sequence[str]) -> int | None:
+    for idx, arg in enumerate(argv):
+        if arg.startswith("--scale="):
+            value = arg.split("=", 1)[1]
+        elif arg == "--scale" and idx + 1 < len(argv):
+            value = argv[idx + 1]
+        else:
+            continue
+        return int(value) if value.isdigit() else None
+    return None
+
+
+def open_store(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(STORE_SCHEMA)
+    return conn
+
+
+_runs: Dict[Path, List[int]] = {}  # store -> [run id, suites recorded so far]
+
+
+def record(suite: str, results: Dict[str, Dict[str, float]]) -> int | None:
+    """Store one suite of ``benchlib.measure`` results under this process's run; returns the run id."""
+    path = store_path()
+    if path is None or not results:
+        return None
+    conn = open_store(path)
+    try:
+        with conn:
+            run = _runs.get(path)
+            if run is None:
+                argv = sys.argv[1:]
+                revision, dirty = git_revision()
+                fingerprint, info = machine()
+                run_id = conn.execute(
+                    "INSERT INTO BenchRuns (started_at, script, argv, scale, revision, dirty, machine, machine_info) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        dt.datetime.now().isoformat(timespec="seconds"),
+                        Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else "python",
+                        " ".join(argv),
+                        _scale(argv),
+                        revision,
+                        int(dirty),
+                        fingerprint,
+                        info,
+                    ),
+                ).lastrowid
+                run = _runs[path] = [run_id, 0]
+            run_id, suite_index = run
+            run[1] += 1
+            conn.executemany(
+                "INSERT OR REPLACE INTO BenchCases "
+                "(run_id, suite_index, suite, name, median_ms, mean_ms, stdev_ms, min_ms, max_ms, samples) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id, suite_index, suite, name, stats["median_ms"], stats["mean_ms"], stats["stdev_ms"],
+                        stats["min_ms"], stats["max_ms"], json.dumps(stats.get("samples", [stats["median_ms"]])),
+                    )
+                    for name, stats in results.items()
+                ],
+            )
+    finally:
+        conn.close()
+    return run_id
+
+
+# Statistics --------------------------------------------------------------------
+def _u_statistic(baseline: Sequence[float], candidate: Sequence[float]) -> float:
+    """Pairs where the candidate is slower (ties count half)."""
+    u = 0.0
+    for c in candidate:
+        for b in baseline:
+            u += 1.0 if c > b else 0.5 if c == b else 0.0
+    return u
+
+
+@functools.lru_cache(maxsize=None)
+def _u_counts(n1: int, n2: int) -> Tuple[int, ...]:
+    """Number of orderings of n1 baseline / n2 candidate samples giving each U value."""
+    if n1 == 0 or n2 == 0:
+        return (1,)
+    # The largest sample is either a candidate (beating all n1 baselines) or a baseline.
+    with_candidate = _u_counts(n1, n2 - 1)
+    with_baseline = _u_counts(n1 - 1, n2)
+    counts = [0] * (n1 * n2 + 1)
+    for u, count in enumerate(with_candidate):
+        counts[u + n1] += count
+    for u, count in enumerate(with_baseline):
+        counts[u] += count
+    return tuple(counts)
+
+
+def slower_p_value(baseline: Sequence[float], candidate: Sequence[float]) -> float:
+    """One-sided Mann-Whitney p-value for "candidate samples are larger than baseline samples"."""
+    n1, n2 = len(baseline), len(candidate)
+    if not n1 or not n2:
+        return 1.0
+    u = _u_statistic(baseline, candidate)
+    if n1 + n2 <= EXACT_LIMIT:
+        counts = _u_counts(n1, n2)
+        return sum(counts[math.ceil(u):]) / math.comb(n1 + n2, n1)
+    mean = n1 * n2 / 2
+    sd = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    z = (u - mean - 0.5) / sd
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+# Comparison --------------------------------------------------------------------
+CaseKey = Tuple[str, str, int, str]  # script, argv, suite index, case
+
+
+def _resolve(conn: sqlite3.Connection, machine_id: str, revision: str | None) -> Tuple[str, bool] | None:
+    """(revision, dirty) to compare: a revision prefix (clean runs preferred), or the newest run when None."""
+    if revision is None:
+        return conn.execute(
+            "SELECT revision, dirty FROM BenchRuns WHERE machine = ? ORDER BY id DESC LIMIT 1", (machine_id,)
+        ).fetchone()
+    rows = conn.execute(
+        "SELECT DISTINCT revision, dirty FROM BenchRuns WHERE machine = ? AND revision LIKE ? || '%' "
+        "ORDER BY dirty",
+        (machine_id, revision),
+    ).fetchall()
+    if len({row[0] for row in rows}) > 1:
+        raise SystemExit(f"revision prefix {revision!r} is ambiguous")
+    return rows[0] if rows else None
+
+
+def _samples(conn: sqlite3.Connection, machine_id: str, revision: str, dirty: bool) -> Dict[CaseKey, List[float]]:
+    pooled: Dict[CaseKey, List[float]] = {}
+    cursor = conn.execute(
+        "SELECT r.script, r.argv, c.suite_index, c.name, c.samples FROM BenchCases AS c "
+        "JOIN BenchRuns AS r ON r.id = c.run_id WHERE r.machine = ? AND r.revision = ? AND r.dirty = ?",
+        (machine_id, revision, int(dirty)),
+    )
+    for script, argv, suite_index, name, samples in cursor:
+        pooled.setdefault((script, argv, suite_index, name), []).extend(json.loads(samples))
+    return pooled
+
+
+def compare(
+    conn: sqlite3.Connection,
+    baseline: str,
+    candidate: str | None = None,
+    machine_id: str | None = None,
+    alpha: float = 0.05,
+    min_change: float = 0.05,
+) -> List[Dict[str, object]]:
+    """Per matching case: medians, relative change, p-value and verdict ('regression', 'improvement' or 'same')."""
+    machine_id = machine_id or machine()[0]
+    base = _resolve(conn, machine_id, baseline)
+    if base is None:
+        raise SystemExit(f"no runs for baseline {baseline!r} on machine {machine_id}")
+    cand = _resolve(conn, machine_id, candidate)
+    if cand is None:
+        raise SystemExit(f"no runs for candidate {candidate or '(latest)'!r} on machine {machine_id}")
+    base_samples = _samples(conn, machine_id, *base)
+    cand_samples = _samples(conn, machine_id, *cand)
+    rows = []
+    for key in sorted(base_samples.keys() & cand_samples.keys()):
+        before, after = base_samples[key], cand_samples[key]
+        base_median, cand_median = statistics.median(before), statistics.median(after)
+        change = (cand_median - base_median) / base_median if base_median else 0.0
+        if change >= min_change and slower_p_value(before, after) < alpha:
+            verdict = "regression"
+        elif change <= -min_change and slower_p_value(after, before) < alpha:
+            verdict = "improvement"
+        else:
+            verdict = "same"
+        rows.append(
+            {
+                "script": key[0], "argv": key[1], "suite_index": key[2], "case": key[3],
+                "baseline_ms": base_median, "candidate_ms": cand_median, "change": change,
+                "p_slower": slower_p_value(before, after), "n": (len(before), len(after)), "verdict": verdict,
+            }
+        )
+    return rows
+
+
+def _label(revision: str, dirty: bool) -> str:
+    return revision[:10] + ("+dirty" if dirty else "")
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["runs", "compare"])
+    parser.add_argument("--store", type=Path, help=f"results store (default: ${ENV_VAR} or {DEFAULT_STORE})")
+    parser.add_argument("--baseline", help="compare: baseline revision (prefix)")
+    parser.add_argument("--candidate", help="compare: candidate revision (default: newest run)")
+    parser.add_argument("--machine", help="machine fingerprint (default: this machine)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="compare: significance level")
+    parser.add_argument("--min-change", type=float, default=0.05, help="compare: smallest relative slowdown to flag")
+    parser.add_argument("--all", action="store_true", help="compare: list unchanged cases too")
+    parser.add_argument("--limit", type=int, default=20, help="runs: number of runs to list")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    path = args.store or store_path() or DEFAULT_STORE
+    if not path.exists():
+        print(f"Benchmark history not found at {path}", file=sys.stderr)
+        raise SystemExit(1)
+    conn = sqlite3.connect(path)
+    try:
+        if args.command == "runs":
+            rows = conn.execute(
+                "SELECT r.id, r.started_at, r.revision, r.dirty, r.machine, r.script, r.argv, COUNT(c.name) "
+                "FROM BenchRuns AS r LEFT JOIN BenchCases AS c ON c.run_id = r.id "
+                "GROUP BY r.id ORDER BY r.id DESC LIMIT ?",
+                (args.limit,),
+            ).fetchall()
+            for run_id, started, revision, dirty, machine_id, script, run_argv, cases in rows:
+                print(f"  #{run_id:<5} {started}  {_label(revision, dirty):<16} {machine_id}  "
+                      f"{script} {run_argv}  ({cases} cases)")
+            return
+        if not args.baseline:
+            print("--baseline is required", file=sys.stderr)
+            raise SystemExit(2)
+        rows = compare(conn, args.baseline, args.candidate, args.machine, args.alpha, args.min_change)
+    finally:
+        conn.close()
+    if not rows:
+        print("No cases in common between baseline and candidate")
+        return
+    regressions = [row for row in rows if row["verdict"] == "regression"]
+    print(f"  {'case':<60} {'base ms':>10} {'cand ms':>10} {'change':>8} {'p':>7}  verdict")
+    for row in rows:
+        if row["verdict"] == "same" and not args.all:
+            continue
+        name = f"{row['script']}: {row['case']}"
+        name = name if len(name) <= 60 else name[:57] + "..."
+        print(
+            f"  {name:<60} {row['baseline_ms']:>10.3f} {row['candidate_ms']:>10.3f} "
+            f"{row['change'] * 100:>+7.1f}% {row['p_slower']:>7.3f}  {row['verdict']}"
+        )
+    print(f"{len(rows)} cases compared, {len(regressions)} regressions")
+    if regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
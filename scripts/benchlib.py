@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Small timing helpers shared by the Moonyam benchmark scripts.
+
+Every benchmark builds (or reuses) a scaled SQLite database produced by
+generate_seed_data.py and times a handful of named cases with ``measure``.
+Set MOONYAM_SQLTRACE=report.json to get a per-statement breakdown of the run
+(see sqltrace.py). ``print_results`` also records every suite in the
+benchmark history store (see bench_history.py).
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import bench_history
+import generate_seed_data as seed
+import sqltrace
+
+# Benchmarks import this module before opening any connection, so every one of
+# them is traced when $MOONYAM_SQLTRACE names a report path (no-op otherwise).
+sqltrace.install()
+
+# Scaled databases (and the work copies benchmarks make next to them) live here
+# and are overwritten by the next run instead of piling up in the temp dir.
+BENCH_DIR = seed.ROOT / "build" / "bench-dbs"
+
+
+def measure(
+    fn: Callable[[], object],
+    repeat: int = 7,
+    warmup: int = 1,
+    setup: Callable[[], object] | None = None,
+) -> Dict[str, float]:
+    """Time ``fn``; ``setup`` (untimed) runs before every call, e.g. to reset mutated state."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "samples": samples,
+    }
+
+
+def scaled_database(
+    scale: int,
+    seed_value: int = 42,
+    directory: Path | None = None,
+    history_years: int = 0,
+    plan_rules: int = 0,
+    now: dt.datetime | None = None,
+) -> Path:
+    """Build the scaled database; pass ``now`` to compare it with a dataset generated separately."""
+    directory = Path(directory or BENCH_DIR)
+    path = directory / f"moonyam-x{scale}-s{seed_value}-h{history_years}-r{plan_rules}.db"
+    dataset = seed.generate_dataset(
+        scale, random.Random(seed_value), now=now, history_years=history_years, plan_rules=plan_rules
+    )
+    seed.write_db(path, dataset)
+    return path
+
+
+def print_results(title: str, results: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    print(f"  {'case':<40} {'median ms':>12} {'stdev ms':>10} {'min ms':>10}")
+    for name, stats in results.items():
+        print(
+            f"  {name:<40} {stats['median_ms']:>12.3f} "
+            f"{stats['stdev_ms']:>10.3f} {stats['min_ms']:>10.3f}"
+        )
+    bench_history.record(title, results)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Lazy loader for the ingredient catalog and sample recipes.
+
+The catalog lives in plain data files under docs/catalog/:
+
+  * ingredients.csv - ``category,name,default_unit``; ids follow row order;
+  * recipes.json    - recipes with ``[name, quantity, unit, optional]`` links.
+
+Nothing is read at import time. The first ``load()`` parses the files and
+writes a marshal-compiled copy to build/catalog-cache/; later loads validate
+it against the sources' size and mtime (the same check CPython uses for .pyc
+files) and skip parsing entirely. Any catalog in the same format can be
+loaded, so 100k+ entry catalogs work the same way as the bundled one.
+
+Usage:
+    python scripts/catalog.py                 # summary of the bundled catalog
+    python scripts/catalog.py --ingredients big.csv --recipes none
+    python scripts/catalog.py bench --ingredients big.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import importlib.util
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+CATALOG_DIR = ROOT / "docs" / "catalog"
+INGREDIENTS_CSV = CATALOG_DIR / "ingredients.csv"
+RECIPES_JSON = CATALOG_DIR / "recipes.json"
+CACHE_DIR = ROOT / "build" / "catalog-cache"
+
+CACHE_FORMAT = 1
+
+
+class Catalog:
+    """Parsed catalog; derived views are built on first access."""
+
+    def __init__(self, ingredients: List[dict], recipes: List[dict]):
+        self.ingredients = ingredients
+        self.recipes = recipes
+
+    @functools.cached_property
+    def lookup(self) -> Dict[str, dict]:
+        return {row["name"]: row for row in self.ingredients}
+
+    @functools.cached_property
+    def by_category(self) -> Dict[str, List[Tuple[str, str]]]:
+        grouped: Dict[str, List[Tuple[str, str]]] = {}
+        for row in self.ingredients:
+            grouped.setdefault(row["category"], []).append((row["name"], row["default_unit"]))
+        return grouped
+
+
+def parse_ingredients(path: Path) -> List[dict]:
+    import csv
+
+    with open(path, newline="", encoding="utf-8") as handle:
+        return [
+            {"id": idx, "name": row["name"], "default_unit": row["default_unit"], "category": row["category"]}
+            for idx, row in enumerate(csv.DictReader(handle), start=1)
+        ]
+
+
+def parse_recipes(path: Path) -> List[dict]:
+    import json
+
+    with open(path, encoding="utf-8") as handle:
+        recipes = json.load(handle)
+    for recipe in recipes:
+        recipe["ingredients"] = [tuple(link) for link in recipe["ingredients"]]
+    return recipes
+
+
+def _source_stamp(paths: List[Path | None]) -> tuple:
+    stamp = [importlib.util.MAGIC_NUMBER, CACHE_FORMAT]
+    for path in paths:
+        if path is None:
+            stamp.append(None)
+        else:
+            info = path.stat()
+            stamp.append((str(path.resolve()), info.st_size, info.st_mtime_ns))
+    return tuple(stamp)
+
+
+def _cache_path(cache_dir: Path, ingredients_path: Path, recipes_path: Path | None) -> Path:
+    name = f"{ingredients_path.resolve()}|{recipes_path.resolve() if recipes_path else ''}"
+    return cache_dir / f"catalog-{hashlib.sha1(name.encode()).hexdigest()[:12]}.marshal"
+
+
+def load(
+    ingredients_path: Path = INGREDIENTS_CSV,
+    recipes_path: Path | None = RECIPES_JSON,
+    cache_dir: Path | None = CACHE_DIR,
+) -> Catalog:
+    """Load a catalog, going through the compiled cache unless ``cache_dir`` is None."""
+    ingredients_path = Path(ingredients_path)
+    recipes_path = Path(recipes_path) if recipes_path else None
+    stamp = _source_stamp([ingredients_path, recipes_path])
+    cache_file = _cache_path(Path(cache_dir), ingredients_path, recipes_path) if cache_dir else None
+    if cache_file is not None:
+        try:
+            cached_stamp, ingredients, recipes = marshal.loads(cache_file.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        else:
+            if cached_stamp == stamp:
+                return Catalog(ingredients, recipes)
+
+    ingredients = parse_ingredients(ingredients_path)
+    recipes = parse_recipes(recipes_path) if recipes_path else []
+    if cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(marshal.dumps((stamp, ingredients, recipes)))
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass  # read-only checkout: the cache is an optimization only
+    return Catalog(ingredients, recipes)
+
+
+@functools.lru_cache(maxsize=None)
+def default() -> Catalog:
+    """The bundled catalog, loaded once per process."""
+    return load()
+
+
+def run_benchmark(ingredients_path: Path, recipes_path: Path | None, repeat: int) -> None:
+    import benchlib
+
+    def cold() -> None:
+        Catalog(parse_ingredients(ingredients_path), parse_recipes(recipes_path) if recipes_path else []).lookup
+
+    def cached() -> None:
+        load(ingredients_path, recipes_path).lookup
+
+    count = len(load(ingredients_path, recipes_path).ingredients)
+    benchlib.print_results(
+        f"catalog load, {count} ingredients",
+        {
+            "parse CSV/JSON": benchlib.measure(cold, repeat),
+            "compiled cache": benchlib.measure(cached, repeat),
+        },
+    )
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["show", "bench"], default="show")
+    parser.add_argument("--ingredients", type=Path, default=INGREDIENTS_CSV)
+    parser.add_argument("--recipes", default=str(RECIPES_JSON), help="recipes JSON, or 'none'")
+    parser.add_argument("--repeat", type=int, default=10, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    recipes_path = None if args.recipes == "none" else Path(args.recipes)
+    for path in (args.ingredients, recipes_path):
+        if path is not None and not path.exists():
+            print(f"Catalog file not found at {path}", file=sys.stderr)
+            raise SystemExit(1)
+    if args.command == "bench":
+        run_benchmark(args.ingredients, recipes_path, args.repeat)
+        return
+    data = load(args.ingredients, recipes_path)
+    print(f"{len(data.ingredients)} ingredients in {len(data.by_category)} categories, {len(data.recipes)} recipes")
+    for category, items in data.by_category.items():
+        print(f"  {category:<24} {len(items):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Dictionary-encoded ("compact") variant of the Moonyam schema.
+
+The regular layout repeats short TEXT values on every row: units ('g', 'pcs'),
+shopping statuses ('pending') and category names ('Dairy & Eggs'). The
+compact layout stores each distinct value once in a lookup table and keeps a
+one-byte integer key on the row:
+
+  Ingredients.default_unit, Ingredients.category -> Units, Categories
+  Inventory.unit, RecipeIngredients.unit         -> Units
+  ShoppingItems.unit, ShoppingItems.status       -> Units, ShoppingStatuses
+
+The compact DDL is derived from docs/db-schema.sql (``compact_schema``), so
+the two layouts never drift apart. Every encoded table gets a ``<Table>Text``
+view that decodes it back to the regular columns for ad-hoc reads; the other
+scripts keep targeting the regular layout.
+
+Build a compact database with ``generate_seed_data.py --db out.db --layout
+compact``; ``bench`` compares size, page count, page-cache hit rate and
+scan/join latency of the two layouts.
+
+Usage:
+    python scripts/compact_layout.py schema > /tmp/compact.sql
+    python scripts/compact_layout.py bench --scale 200 --cache-kb 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import generate_seed_data as seed
+import validate_dataset
+
+# table -> encoded column -> lookup table
+ENCODED_COLUMNS: Dict[str, Dict[str, str]] = {
+    "Ingredients": {"default_unit": "Units", "category": "Categories"},
+    "Inventory": {"unit": "Units"},
+    "ShoppingItems": {"unit": "Units", "status": "ShoppingStatuses"},
+    "RecipeIngredients": {"unit": "Units"},
+}
+# Lookups with a fixed vocabulary get stable ids (so column DEFAULTs can point
+# at them); the others are numbered in sorted order of the values present.
+FIXED_VOCABULARIES: Dict[str, Tuple[str, ...]] = {"ShoppingStatuses": validate_dataset.SHOPPING_STATUSES}
+LOOKUP_TABLES = ["Units", "Categories", "ShoppingStatuses"]
+LOOKUP_COLUMNS = ["id", "name"]
+
+LookupIds = Dict[str, Dict[str, int]]
+
+
+def _lookup_ddl() -> str:
+    lines = ["-- Lookup tables (compact layout) ---------------------------------------------"]
+    for table in LOOKUP_TABLES:
+        lines.append(f"CREATE TABLE {table} (\n    id INTEGER PRIMARY KEY,\n    name TEXT NOT NULL UNIQUE\n);\n")
+    return "\n".join(lines)
+
+
+def _rewrite_column(table: str, column: str, lookup: str, block: str) -> str:
+    pattern = re.compile(rf"^(\s+){column} TEXT( NOT NULL)?(?: DEFAULT '([^']*)')?(,?)$", re.MULTILINE)
+    match = pattern.search(block)
+    if match is None:
+        raise ValueError(f"{table}.{column} is not a plain TEXT column in the schema")
+    indent, not_null, default, comma = match.groups()
+    definition = f"{indent}{column}_id INTEGER{not_null or ''}"
+    if default is not None:
+        vocabulary = FIXED_VOCABULARIES.get(lookup)
+        if vocabulary is None or default not in vocabulary:
+            raise ValueError(f"{table}.{column} defaults to {default!r}, which has no fixed id in {lookup}")
+        definition += f" DEFAULT {vocabulary.index(default) + 1}"
+    definition += f" REFERENCES {lookup}(id){comma}"
+    return block[: match.start()] + definition + block[match.end():]
+
+
+def _decode_view(table: str) -> str:
+    encoded = ENCODED_COLUMNS[table]
+    selects, joins = [], []
+    for column in seed.TABLE_COLUMNS[table]:
+        lookup = encoded.get(column)
+        if lookup is None:
+            selects.append(f"t.{column}")
+        else:
+            alias = f"d_{column}"
+            selects.append(f"{alias}.name AS {column}")
+            joins.append(f"LEFT JOIN {lookup} AS {alias} ON {alias}.id = t.{column}_id")
+    return f"CREATE VIEW {table}Text AS\nSELECT {', '.join(selects)}\nFROM {table} AS t\n" + "\n".join(joins) + ";\n"
+
+
+def compact_schema(schema: str) -> str:
+    """The compact layout's DDL, derived from the regular ``schema`` text."""
+    for table, columns in ENCODED_COLUMNS.items():
+        block_pattern = re.compile(rf"^CREATE TABLE {table} \(\n.*?^\)( WITHOUT ROWID)?;", re.MULTILINE | re.DOTALL)
+        match = block_pattern.search(schema)
+        if match is None:
+            raise ValueError(f"CREATE TABLE {table} not found in the schema")
+        block = match.group(0)
+        for column, lookup in columns.items():
+            block = _rewrite_column(table, column, lookup, block)
+        schema = schema[: match.start()] + block + schema[match.end():]
+
+        def rename_index_columns(index: re.Match) -> str:
+            names = [name.strip() for name in index.group(2).split(",")]
+            return f"{index.group(1)}({', '.join(f'{n}_id' if n in columns else n for n in names)})"
+
+        schema = re.sub(rf"(CREATE INDEX \w+ ON {table})\(([^)]*)\)", rename_index_columns, schema)
+    views = "\n".join(_decode_view(table) for table in ENCODED_COLUMNS)
+    header = "-- Decoding views (compact layout) ------------------------------------------"
+    return f"{_lookup_ddl()}\n{schema}\n{header}\n{views}"
+
+
+def lookup_ids(dataset: Dict[str, List[dict]]) -> LookupIds:
+    """Value -> id per lookup table for everything ``dataset`` references."""
+    values: Dict[str, set] = {lookup: set() for lookup in LOOKUP_TABLES}
+    for table, columns in ENCODED_COLUMNS.items():
+        for column, lookup in columns.items():
+            values[lookup].update(row[column] for row in dataset[table] if row[column] is not None)
+    ids: LookupIds = {}
+    for lookup in LOOKUP_TABLES:
+        vocabulary = FIXED_VOCABULARIES.get(lookup)
+        if vocabulary is not None:
+            unknown = values[lookup] - set(vocabulary)
+            if unknown:
+                raise ValueError(f"{lookup} has no id for {sorted(unknown)}")
+        else:
+            vocabulary = tuple(sorted(values[lookup]))
+        ids[lookup] = {name: idx for idx, name in enumerate(vocabulary, start=1)}
+    return ids
+
+
+def encode(dataset: Dict[str, List[dict]]) -> Dict[str, Tuple[List[str], List[dict]]]:
+    """(columns, rows) per table in load order for the compact layout, lookup tables first."""
+    ids = lookup_ids(dataset)
+    tables: Dict[str, Tuple[List[str], List[dict]]] = {
+        lookup: (LOOKUP_COLUMNS, [{"id": idx, "name": name} for name, idx in ids[lookup].items()])
+        for lookup in LOOKUP_TABLES
+    }
+    for table, columns in seed.TABLE_COLUMNS.items():
+        encoded = ENCODED_COLUMNS.get(table)
+        if encoded is None:
+            tables[table] = (columns, dataset[table])
+            continue
+        rows = []
+        for row in dataset[table]:
+            row = dict(row)
+            for column, lookup in encoded.items():
+                value = row.pop(column)
+                row[f"{column}_id"] = None if value is None else ids[lookup][value]
+            rows.append(row)
+        tables[table] = ([f"{c}_id" if c in encoded else c for c in columns], rows)
+    return tables
+
+
+# Benchmark ---------------------------------------------------------------------
+# name -> (regular layout SQL, compact layout SQL); both return the same rows.
+WORKLOAD: Dict[str, Tuple[str, str]] = {
+    "pantry by unit (scan)": (
+        "SELECT unit, COUNT(*), SUM(quantity) FROM Inventory GROUP BY unit",
+        "SELECT u.name, COUNT(*), SUM(i.quantity) FROM Inventory AS i "
+        "JOIN Units AS u ON u.id = i.unit_id GROUP BY i.unit_id",
+    ),
+    "ingredients by category (scan)": (
+        "SELECT category, COUNT(*) FROM Ingredients GROUP BY category",
+        "SELECT c.name, COUNT(*) FROM Ingredients AS i "
+        "LEFT JOIN Categories AS c ON c.id = i.category_id GROUP BY i.category_id",
+    ),
+    "pending shopping (filter)": (
+        "SELECT COUNT(*), SUM(quantity) FROM ShoppingItems WHERE status = 'pending'",
+        "SELECT COUNT(*), SUM(quantity) FROM ShoppingItems "
+        "WHERE status_id = (SELECT id FROM ShoppingStatuses WHERE name = 'pending')",
+    ),
+    "needs covered by pantry (join)": (
+        "SELECT COUNT(*) FROM RecipeIngredients AS ri JOIN Inventory AS inv "
+        "ON inv.ingredient_id = ri.ingredient_id AND inv.unit = ri.unit WHERE inv.quantity >= ri.quantity",
+        "SELECT COUNT(*) FROM RecipeIngredients AS ri JOIN Inventory AS inv "
+        "ON inv.ingredient_id = ri.ingredient_id AND inv.unit_id = ri.unit_id WHERE inv.quantity >= ri.quantity",
+    ),
+}
+
+
+class _CacheProbe:
+    """Runs SQL on a private libsqlite3 connection to read its page-cache hit/miss counters.
+
+    Python's sqlite3 module does not expose sqlite3_db_status(), so this opens
+    the same file through ctypes. ``available`` is False when the library
+    cannot be found.
+    """
+
+    CACHE_HIT, CACHE_MISS = 7, 8  # SQLITE_DBSTATUS_CACHE_HIT / _MISS
+
+    def __init__(self) -> None:
+        import ctypes
+        import ctypes.util
+
+        self.ctypes = ctypes
+        name = ctypes.util.find_library("sqlite3")
+        self.lib = ctypes.CDLL(name) if name else None
+        self.available = self.lib is not None
+
+    def hit_rate(self, path: Path, statements: List[str], cache_kb: int) -> float:
+        ctypes, lib = self.ctypes, self.lib
+        db = ctypes.c_void_p()
+        if lib.sqlite3_open_v2(str(path).encode(), ctypes.byref(db), 0x01, None) != 0:  # SQLITE_OPEN_READONLY
+            raise RuntimeError(f"cannot open {path}")
+        try:
+            def run(sql: str) -> None:
+                if lib.sqlite3_exec(db, sql.encode(), None, None, None) != 0:
+                    raise RuntimeError(f"query failed: {sql}")
+
+            run(f"PRAGMA cache_size = -{cache_kb}")
+            for sql in statements:  # cold pass fills the cache; only the warm pass is counted
+                run(sql)
+            counters = {}
+            for op in (self.CACHE_HIT, self.CACHE_MISS):
+                current, high = ctypes.c_int(), ctypes.c_int()
+                lib.sqlite3_db_status(db, op, ctypes.byref(current), ctypes.byref(high), 1)
+            for sql in statements:
+                run(sql)
+            for op in (self.CACHE_HIT, self.CACHE_MISS):
+                current, high = ctypes.c_int(), ctypes.c_int()
+                lib.sqlite3_db_status(db, op, ctypes.byref(current), ctypes.byref(high), 0)
+                counters[op] = current.value
+        finally:
+            lib.sqlite3_close(db)
+        total = counters[self.CACHE_HIT] + counters[self.CACHE_MISS]
+        return counters[self.CACHE_HIT] / total if total else 1.0
+
+
+def storage_stats(path: Path) -> Dict[str, int]:
+    import sqlite3
+
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        stats = {
+            "bytes": path.stat().st_size,
+            "pages": conn.execute("PRAGMA page_count").fetchone()[0],
+        }
+        try:
+            # dbstat is optional at compile time; per-table pages of the encoded tables
+            for table in ENCODED_COLUMNS:
+                stats[table] = conn.execute(
+                    "SELECT COUNT(*) FROM dbstat WHERE name = ?", (table,)
+                ).fetchone()[0]
+        except sqlite3.OperationalError:
+            pass
+        return stats
+    finally:
+        conn.close()
+
+
+def run_benchmark(scale: int, cache_kb: int, repeat: int) -> None:
+    import random
+    import sqlite3
+
+    import benchlib
+
+    workdir = benchlib.BENCH_DIR
+    dataset = seed.generate_dataset(scale, random.Random(42))
+    paths = {layout: workdir / f"layout-x{scale}-{layout}.db" for layout in seed.LAYOUTS}
+    for layout, path in paths.items():
+        seed.write_db(path, dataset, layout)
+        conn = sqlite3.connect(path)
+        conn.execute("VACUUM")
+        conn.close()
+
+    probe = _CacheProbe()
+    print(f"\nstorage and page cache (scale x{scale}, cache {cache_kb} KiB, warm pass)")
+    print(f"  {'layout':<10} {'file KiB':>10} {'pages':>8} " + " ".join(f"{t[:17]:>17}" for t in ENCODED_COLUMNS)
+          + f" {'cache hit %':>12}")
+    for idx, (layout, path) in enumerate(paths.items()):
+        stats = storage_stats(path)
+        per_table = " ".join(f"{stats.get(t, '-'):>17}" for t in ENCODED_COLUMNS)
+        statements = [pair[idx] for pair in WORKLOAD.values()]
+        hit = f"{probe.hit_rate(path, statements, cache_kb) * 100:.1f}" if probe.available else "n/a"
+        print(f"  {layout:<10} {stats['bytes'] / 1024:>10.0f} {stats['pages']:>8} {per_table} {hit:>12}")
+    print("  (per-table columns are page counts)")
+
+    results = {}
+    conns = {
+        layout: sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True) for layout, path in paths.items()
+    }
+    try:
+        for name, queries in WORKLOAD.items():
+            expected = sorted(conns["text"].execute(queries[0]).fetchall(), key=repr)
+            if sorted(conns["compact"].execute(queries[1]).fetchall(), key=repr) != expected:
+                raise SystemExit(f"layouts disagree on {name}")
+            for layout, sql in zip(seed.LAYOUTS, queries):
+                conn = conns[layout]
+                results[f"{name}: {layout}"] = benchlib.measure(lambda: conn.execute(sql).fetchall(), repeat)
+    finally:
+        for conn in conns.values():
+            conn.close()
+    benchlib.print_results(f"scan/join latency, regular vs compact layout, scale x{scale}", results)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["schema", "bench"])
+    parser.add_argument("--scale", type=int, default=200, help="bench: dataset scale factor")
+    parser.add_argument("--cache-kb", type=int, default=512, help="bench: page cache size for the hit-rate pass")
+    parser.add_argument("--repeat", type=int, default=7, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "schema":
+        sys.stdout.write(compact_schema(seed.SCHEMA.read_text()))
+    else:
+        run_benchmark(args.scale, args.cache_kb, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
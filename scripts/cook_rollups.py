@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Cook-history rollups: daily, weekly and all-time cook counts per recipe and cuisine.
+
+CookRollups and CookCuisineRollups (docs/db-schema.sql) are kept current by
+triggers on CookHistory, so every insert, edit or delete adjusts three
+buckets per table ('day', 'week' and 'all') in place. Bulk loads skip the
+triggers (``bulk_load``) and aggregate once with ``rebuild`` afterwards.
+
+A top-N over an arbitrary date range reads whole weeks from the weekly
+buckets and only the days before the first / after the last full week from
+the daily ones, so a two-year range touches ~100 weekly buckets per recipe
+instead of every cook row. All-time ranks come straight off
+idx_cookrollups_rank.
+
+Usage:
+    python scripts/cook_rollups.py top --db path/to/moonyam.db
+    python scripts/cook_rollups.py top --start 2024-01-01 --end 2025-01-01 --by cuisine
+    python scripts/cook_rollups.py rebuild --db path/to/moonyam.db
+    python scripts/cook_rollups.py bench --scale 20 --years 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime as dt
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+ROLLUP_TRIGGERS = "trg_cookhistory_rollup_%"
+WEEK_START_SQL = "date(cooked_at, 'weekday 0', '-6 days')"
+
+# (table, key column, expression over CookHistory h / Recipes r)
+ROLLUP_TABLES = {
+    "recipe": ("CookRollups", "recipe_id", "h.recipe_id"),
+    "cuisine": ("CookCuisineRollups", "cuisine", "COALESCE(r.cuisine, '')"),
+}
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Recompute both rollup tables from CookHistory; returns the number of buckets written."""
+    grains = [
+        ("day", "date(h.cooked_at)"),
+        ("week", WEEK_START_SQL.replace("cooked_at", "h.cooked_at")),
+        ("all", "''"),
+    ]
+    written = 0
+    conn.execute("SAVEPOINT rebuild_rollups")
+    try:
+        for table, key, expr in ROLLUP_TABLES.values():
+            conn.execute(f"DELETE FROM {table}")
+            for grain, period in grains:
+                written += conn.execute(
+                    f"INSERT INTO {table} (grain, period, {key}, cooks) "
+                    f"SELECT '{grain}', {period}, {expr}, COUNT(*) "
+                    "FROM CookHistory AS h JOIN Recipes AS r ON r.id = h.recipe_id "
+                    "GROUP BY 2, 3"
+                ).rowcount
+    except BaseException:
+        conn.execute("ROLLBACK TO rebuild_rollups")
+        conn.execute("RELEASE rebuild_rollups")
+        raise
+    conn.execute("RELEASE rebuild_rollups")
+    return written
+
+
+@contextlib.contextmanager
+def bulk_load(conn: sqlite3.Connection) -> Iterator[None]:
+    """Drop the per-row rollup triggers for the duration of a load, then rebuild and restore them.
+
+    Everything, the DROP/CREATE TRIGGER statements included, runs inside one
+    savepoint (nested in the caller's transaction when there is one), so an
+    exception in the block rolls the load back and leaves the triggers in place.
+    """
+    conn.execute("SAVEPOINT bulk_load")
+    try:
+        triggers = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?", (ROLLUP_TRIGGERS,)
+        ).fetchall()
+        for name, _ in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+        yield
+        rebuild(conn)
+        for _, sql in triggers:
+            conn.execute(sql)
+    except BaseException:
+        conn.execute("ROLLBACK TO bulk_load")
+        conn.execute("RELEASE bulk_load")
+        raise
+    conn.execute("RELEASE bulk_load")
+
+
+def week_start(day: dt.date) -> dt.date:
+    return day - dt.timedelta(days=day.weekday())
+
+
+def _split_range(start: dt.date, end: dt.date) -> Tuple[dt.date, dt.date]:
+    """Whole weeks inside [start, end) as [first, last); first == last == end when there are none."""
+    first = week_start(start + dt.timedelta(days=6))
+    last = week_start(end)
+    if first >= last:
+        return end, end
+    return first, last
+
+
+def top(
+    conn: sqlite3.Connection,
+    by: str = "recipe",
+    start: dt.date | None = None,
+    end: dt.date | None = None,
+    n: int = 10,
+) -> List[Tuple[object, int]]:
+    """Top ``n`` recipes (ids) or cuisines by cooks in [start, end); all time when no range is given."""
+    table, key, _ = ROLLUP_TABLES[by]
+    if start is None and end is None:
+        return conn.execute(
+            f"SELECT {key}, cooks FROM {table} WHERE grain = 'all' AND period = '' "
+            f"ORDER BY cooks DESC, {key} LIMIT ?",
+            (n,),
+        ).fetchall()
+    start = start or dt.date.min
+    end = end or dt.date.max
+    first, last = _split_range(start, end)
+    # Three primary-key range scans; UNION ALL avoids the row de-duplication an
+    # OR of ranges would cost.
+    bucket = f"SELECT {key}, cooks FROM {table} WHERE grain = ? AND period >= ? AND period < ?"
+    return conn.execute(
+        f"SELECT {key}, SUM(cooks) AS total FROM ({bucket} UNION ALL {bucket} UNION ALL {bucket}) "
+        f"GROUP BY {key} ORDER BY total DESC, {key} LIMIT ?",
+        ("week", str(first), str(last), "day", str(start), str(first), "day", str(last), str(end), n),
+    ).fetchall()
+
+
+def top_scan(
+    conn: sqlite3.Connection,
+    by: str = "recipe",
+    start: dt.date | None = None,
+    end: dt.date | None = None,
+    n: int = 10,
+) -> List[Tuple[object, int]]:
+    """Baseline for ``top``: GROUP BY over the raw CookHistory rows."""
+    _, _, expr = ROLLUP_TABLES[by]
+    where, params = [], []
+    if start is not None:
+        where.append("h.cooked_at >= ?")
+        params.append(str(start))
+    if end is not None:
+        where.append("h.cooked_at < ?")
+        params.append(str(end))
+    return conn.execute(
+        f"SELECT {expr} AS key, COUNT(*) AS total "
+        "FROM CookHistory AS h JOIN Recipes AS r ON r.id = h.recipe_id "
+        f"{'WHERE ' + ' AND '.join(where) if where else ''} "
+        "GROUP BY key ORDER BY total DESC, key LIMIT ?",
+        params + [n],
+    ).fetchall()
+
+
+def print_top(conn: sqlite3.Connection, by: str, rows: List[Tuple[object, int]]) -> None:
+    for key, cooks in rows:
+        if by == "recipe":
+            name = conn.execute("SELECT name FROM Recipes WHERE id = ?", (key,)).fetchone()
+            label = f"#{key} {name[0] if name else '?'}"
+        else:
+            label = key or "(no cuisine)"
+        print(f"  {cooks:>7}  {label}")
+
+
+# Benchmark ---------------------------------------------------------------------
+def run_benchmark(scale: int, years: int, inserts: int, repeat: int) -> None:
+    import random
+
+    import benchlib
+
+    path = benchlib.scaled_database(scale, history_years=years)
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        total, last = conn.execute("SELECT COUNT(*), MAX(cooked_at) FROM CookHistory").fetchone()
+        end = dt.date.fromisoformat(last[:10]) + dt.timedelta(days=1)
+        ranges = {
+            "last 30 days": (end - dt.timedelta(days=30), end),
+            "last year": (end - dt.timedelta(days=365), end),
+            "all time": (None, None),
+        }
+        results = {}
+        for label, (start, stop) in ranges.items():
+            for by in ROLLUP_TABLES:
+                if top(conn, by, start, stop) != top_scan(conn, by, start, stop):
+                    raise SystemExit(f"rollups disagree with CookHistory for {by}, {label}")
+                results[f"top {by}s, {label}: scan"] = benchlib.measure(
+                    lambda: top_scan(conn, by, start, stop), repeat
+                )
+                results[f"top {by}s, {label}: rollups"] = benchlib.measure(
+                    lambda: top(conn, by, start, stop), repeat
+                )
+
+        recipe_ids = [row[0] for row in conn.execute("SELECT id FROM Recipes")]
+        rng = random.Random(7)
+        rows = [(rng.choice(recipe_ids), f"{last[:10]} 19:00:00") for _ in range(inserts)]
+
+        def insert_batch() -> None:
+            conn.execute("BEGIN")
+            conn.executemany("INSERT INTO CookHistory (recipe_id, cooked_at) VALUES (?, ?)", rows)
+            conn.execute("ROLLBACK")
+
+        results[f"insert {inserts} cooks with triggers"] = benchlib.measure(insert_batch, repeat)
+        results["full rebuild"] = benchlib.measure(
+            lambda: (conn.execute("BEGIN"), rebuild(conn), conn.execute("ROLLBACK")), repeat
+        )
+    finally:
+        conn.close()
+    benchlib.print_results(f"cook rollups, scale x{scale}, {total} cooks over {years} years", results)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["top", "rebuild", "bench"], default="top")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--by", choices=sorted(ROLLUP_TABLES), default="recipe")
+    parser.add_argument("--start", type=dt.date.fromisoformat, help="first day (inclusive)")
+    parser.add_argument("--end", type=dt.date.fromisoformat, help="last day (exclusive)")
+    parser.add_argument("-n", type=int, default=10, help="number of rows to show")
+    parser.add_argument("--scale", type=int, default=20, help="bench: dataset scale factor")
+    parser.add_argument("--years", type=int, default=5, help="bench: years of cook history")
+    parser.add_argument("--inserts", type=int, default=1000, help="bench: cooks inserted per batch")
+    parser.add_argument("--repeat", type=int, default=7, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.scale, args.years, args.inserts, args.repeat)
+        return
+    if not args.db.exists():
+        print(f"Database not found at {args.db}", file=sys.stderr)
+        raise SystemExit(1)
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.command == "rebuild":
+            with conn:
+                print(f"Rebuilt {rebuild(conn)} rollup buckets")
+        else:
+            print_top(conn, args.by, top(conn, args.by, args.start, args.end, args.n))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Python data-access layer for the Moonyam SQLite schema (docs/db-schema.sql).
+
+Mirrors the DAOs from AviyaStuff/diagrams/data-layer.mml so benchmark, replay
+and maintenance scripts share one connection pool and one set of statements
+instead of opening ad hoc ``sqlite3`` connections.
+
+    from dao import Database
+
+    db = Database("moonyam.db")
+    with db.transaction():
+        db.inventory.upsert_many(rows)
+    db.recipes.find_by_id(3)
+"""
+
+from .database import DEFAULT_PRAGMAS, WAL_PRAGMAS, ConnectionPool, Database
+from .daos import (
+    CookHistoryDao,
+    IngredientsDao,
+    InventoryDao,
+    InventoryEventsDao,
+    MealPlansDao,
+    RecipeIngredientsDao,
+    RecipesDao,
+    ShoppingDao,
+)
+from .entities import (
+    CookHistoryEntity,
+    IngredientEntity,
+    InventoryCheckpointEntity,
+    InventoryCheckpointRowEntity,
+    InventoryEntity,
+    InventoryEventEntity,
+    MealPlanEntity,
+    RecipeEntity,
+    RecipeIngredientEntity,
+    ShoppingItemEntity,
+)
+
+__all__ = [
+    "ConnectionPool",
+    "CookHistoryDao",
+    "CookHistoryEntity",
+    "DEFAULT_PRAGMAS",
+    "Database",
+    "IngredientEntity",
+    "IngredientsDao",
+    "InventoryCheckpointEntity",
+    "InventoryCheckpointRowEntity",
+    "InventoryDao",
+    "InventoryEntity",
+    "InventoryEventEntity",
+    "InventoryEventsDao",
+    "MealPlanEntity",
+    "MealPlansDao",
+    "RecipeEntity",
+    "RecipeIngredientEntity",
+    "RecipeIngredientsDao",
+    "RecipesDao",
+    "ShoppingDao",
+    "ShoppingItemEntity",
+    "WAL_PRAGMAS",
+]
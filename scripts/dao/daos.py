@@ -0,0 +1,317 @@
+"""Table-level DAOs mirroring the data-layer diagram.
+
+Every statement is a constant with ``?`` placeholders so sqlite3's statement
+cache compiles it once per pooled connection. ``*_many`` methods run their
+batch with ``executemany`` inside a single transaction.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING, Iterable, List, Sequence, Type, TypeVar
+
+from .entities import (
+    CookHistoryEntity,
+    IngredientEntity,
+    InventoryCheckpointEntity,
+    InventoryCheckpointRowEntity,
+    InventoryEntity,
+    InventoryEventEntity,
+    MealPlanEntity,
+    RecipeEntity,
+    RecipeIngredientEntity,
+    ShoppingItemEntity,
+)
+
+if TYPE_CHECKING:
+    from .database import ConnectionPool
+
+E = TypeVar("E")
+
+
+class BaseDao:
+    def __init__(self, pool: "ConnectionPool"):
+        self._pool = pool
+
+    def _all(self, entity: Type[E], sql: str, params: Sequence = ()) -> List[E]:
+        with self._pool.connection() as conn:
+            return [entity._make(row) for row in conn.execute(sql, params)]
+
+    def _one(self, entity: Type[E], sql: str, params: Sequence = ()) -> E | None:
+        with self._pool.connection() as conn:
+            row = conn.execute(sql, params).fetchone()
+        return None if row is None else entity._make(row)
+
+    def _execute(self, sql: str, params: Sequence = ()) -> sqlite3.Cursor:
+        with self._pool.connection() as conn:
+            return conn.execute(sql, params)
+
+    def _execute_many(self, sql: str, rows: Iterable[Sequence]) -> int:
+        with self._pool.transaction() as conn:
+            return conn.executemany(sql, rows).rowcount
+
+
+class IngredientsDao(BaseDao):
+    SELECT = "SELECT id, name, default_unit, category FROM Ingredients"
+    GET_ALL = SELECT + " ORDER BY id"
+    FIND_BY_ID = SELECT + " WHERE id = ?"
+    FIND_BY_NAME = SELECT + " WHERE name = ?"
+    INSERT = "INSERT INTO Ingredients (id, name, default_unit, category) VALUES (?, ?, ?, ?)"
+    UPDATE = "UPDATE Ingredients SET name = ?, default_unit = ?, category = ? WHERE id = ?"
+    DELETE = "DELETE FROM Ingredients WHERE id = ?"
+
+    def get_all(self) -> List[IngredientEntity]:
+        return self._all(IngredientEntity, self.GET_ALL)
+
+    def find_by_id(self, ingredient_id: int) -> IngredientEntity | None:
+        return self._one(IngredientEntity, self.FIND_BY_ID, (ingredient_id,))
+
+    def find_by_name(self, name: str) -> IngredientEntity | None:
+        return self._one(IngredientEntity, self.FIND_BY_NAME, (name,))
+
+    def insert(self, entity: IngredientEntity) -> int:
+        return self._execute(self.INSERT, entity).lastrowid
+
+    def insert_many(self, entities: Iterable[IngredientEntity]) -> int:
+        return self._execute_many(self.INSERT, entities)
+
+    def update(self, entity: IngredientEntity) -> None:
+        self._execute(self.UPDATE, (entity.name, entity.default_unit, entity.category, entity.id))
+
+    def delete(self, ingredient_id: int) -> None:
+        self._execute(self.DELETE, (ingredient_id,))
+
+
+class InventoryDao(BaseDao):
+    """Plain Inventory writes; they are not appended to the event log (see inventory_log.record)."""
+
+    SELECT = "SELECT ingredient_id, quantity, unit, expires_at, updated_at FROM Inventory"
+    GET_ALL = SELECT + " ORDER BY ingredient_id"
+    GET = SELECT + " WHERE ingredient_id = ?"
+    GET_EXPIRING = SELECT + " WHERE expires_at <= ? ORDER BY expires_at"
+    UPSERT = """
+        INSERT INTO Inventory (ingredient_id, quantity, unit, expires_at, updated_at)
+        VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        ON CONFLICT (ingredient_id) DO UPDATE SET
+            quantity = excluded.quantity,
+            unit = excluded.unit,
+            expires_at = excluded.expires_at,
+            updated_at = excluded.updated_at
+    """
+    ADJUST = """
+        UPDATE Inventory SET quantity = max(quantity + ?, 0), updated_at = COALESCE(?, CURRENT_TIMESTAMP)
+        WHERE ingredient_id = ?
+    """
+    DELETE = "DELETE FROM Inventory WHERE ingredient_id = ?"
+
+    def get_all(self) -> List[InventoryEntity]:
+        return self._all(InventoryEntity, self.GET_ALL)
+
+    def get(self, ingredient_id: int) -> InventoryEntity | None:
+        return self._one(InventoryEntity, self.GET, (ingredient_id,))
+
+    def get_expiring(self, threshold_date: str) -> List[InventoryEntity]:
+        return self._all(InventoryEntity, self.GET_EXPIRING, (threshold_date,))
+
+    def upsert(self, entity: InventoryEntity) -> None:
+        self._execute(self.UPSERT, entity)
+
+    def upsert_many(self, entities: Iterable[InventoryEntity]) -> int:
+        return self._execute_many(self.UPSERT, entities)
+
+    def adjust(self, ingredient_id: int, delta: float, updated_at: str | None = None) -> None:
+        """Add ``delta`` (negative to consume) to the stored quantity, never going below zero."""
+        self._execute(self.ADJUST, (delta, updated_at, ingredient_id))
+
+    def delete(self, ingredient_id: int) -> None:
+        self._execute(self.DELETE, (ingredient_id,))
+
+
+class InventoryEventsDao(BaseDao):
+    """InventoryEvents plus its checkpoints (see scripts/inventory_log.py for the log's semantics)."""
+
+    SELECT = "SELECT id, ingredient_id, occurred_at, kind, delta, quantity, unit, expires_at FROM InventoryEvents"
+    GET_LATEST = SELECT + " ORDER BY id DESC LIMIT 1"
+    COUNT_AFTER = "SELECT COUNT(*) FROM InventoryEvents WHERE id > ?"
+    INSERT = """
+        INSERT INTO InventoryEvents (id, ingredient_id, occurred_at, kind, delta, quantity, unit, expires_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    GET_LATEST_CHECKPOINT = (
+        "SELECT id, taken_at, last_event_id, is_base FROM InventoryCheckpoints ORDER BY id DESC LIMIT 1"
+    )
+    INSERT_CHECKPOINT = "INSERT INTO InventoryCheckpoints (id, taken_at, last_event_id, is_base) VALUES (?, ?, ?, ?)"
+    INSERT_CHECKPOINT_ROW = """
+        INSERT INTO InventoryCheckpointRows (checkpoint_id, ingredient_id, quantity, unit, expires_at)
+        VALUES (?, ?, ?, ?, ?)
+    """
+
+    def get_latest(self) -> InventoryEventEntity | None:
+        return self._one(InventoryEventEntity, self.GET_LATEST)
+
+    def count_after(self, event_id: int) -> int:
+        return self._execute(self.COUNT_AFTER, (event_id,)).fetchone()[0]
+
+    def insert_many(self, entities: Iterable[InventoryEventEntity]) -> int:
+        return self._execute_many(self.INSERT, entities)
+
+    def get_latest_checkpoint(self) -> InventoryCheckpointEntity | None:
+        return self._one(InventoryCheckpointEntity, self.GET_LATEST_CHECKPOINT)
+
+    def insert_checkpoints(
+        self, checkpoints: Iterable[InventoryCheckpointEntity], rows: Iterable[InventoryCheckpointRowEntity]
+    ) -> None:
+        with self._pool.transaction() as conn:
+            conn.executemany(self.INSERT_CHECKPOINT, checkpoints)
+            conn.executemany(self.INSERT_CHECKPOINT_ROW, rows)
+
+
+class ShoppingDao(BaseDao):
+    SELECT = "SELECT id, ingredient_id, quantity, unit, status, notes, created_at FROM ShoppingItems"
+    GET_BY_STATUS = SELECT + " WHERE status = ? ORDER BY id"
+    FIND_BY_ID = SELECT + " WHERE id = ?"
+    INSERT = """
+        INSERT INTO ShoppingItems (id, ingredient_id, quantity, unit, status, notes, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    """
+    UPDATE = """
+        UPDATE ShoppingItems SET ingredient_id = ?, quantity = ?, unit = ?, status = ?, notes = ?
+        WHERE id = ?
+    """
+    SET_STATUS = "UPDATE ShoppingItems SET status = ? WHERE id = ?"
+    DELETE = "DELETE FROM ShoppingItems WHERE id = ?"
+
+    def get_by_status(self, status: str) -> List[ShoppingItemEntity]:
+        return self._all(ShoppingItemEntity, self.GET_BY_STATUS, (status,))
+
+    def find_by_id(self, item_id: int) -> ShoppingItemEntity | None:
+        return self._one(ShoppingItemEntity, self.FIND_BY_ID, (item_id,))
+
+    def insert(self, entity: ShoppingItemEntity) -> int:
+        return self._execute(self.INSERT, entity).lastrowid
+
+    def insert_many(self, entities: Iterable[ShoppingItemEntity]) -> int:
+        return self._execute_many(self.INSERT, entities)
+
+    def update(self, entity: ShoppingItemEntity) -> None:
+        self._execute(
+            self.UPDATE,
+            (entity.ingredient_id, entity.quantity, entity.unit, entity.status, entity.notes, entity.id),
+        )
+
+    def set_status(self, item_id: int, status: str) -> None:
+        self._execute(self.SET_STATUS, (status, item_id))
+
+    def set_status_many(self, item_ids: Iterable[int], status: str) -> int:
+        return self._execute_many(self.SET_STATUS, ((status, item_id) for item_id in item_ids))
+
+    def delete(self, item_id: int) -> None:
+        self._execute(self.DELETE, (item_id,))
+
+
+class RecipesDao(BaseDao):
+    SELECT = "SELECT id, name, description, instructions, cuisine, created_at, favorite FROM Recipes"
+    GET_ALL = SELECT + " ORDER BY id"
+    FIND_BY_ID = SELECT + " WHERE id = ?"
+    INSERT = """
+        INSERT INTO Recipes (id, name, description, instructions, cuisine, created_at, favorite)
+        VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)
+    """
+    UPDATE = """
+        UPDATE Recipes SET name = ?, description = ?, instructions = ?, cuisine = ?, favorite = ?
+        WHERE id = ?
+    """
+    SET_FAVORITE = "UPDATE Recipes SET favorite = ? WHERE id = ?"
+    DELETE = "DELETE FROM Recipes WHERE id = ?"
+
+    def get_all(self) -> List[RecipeEntity]:
+        return self._all(RecipeEntity, self.GET_ALL)
+
+    def find_by_id(self, recipe_id: int) -> RecipeEntity | None:
+        return self._one(RecipeEntity, self.FIND_BY_ID, (recipe_id,))
+
+    def insert(self, entity: RecipeEntity) -> int:
+        return self._execute(self.INSERT, entity).lastrowid
+
+    def insert_many(self, entities: Iterable[RecipeEntity]) -> int:
+        return self._execute_many(self.INSERT, entities)
+
+    def update(self, entity: RecipeEntity) -> None:
+        self._execute(
+            self.UPDATE,
+            (entity.name, entity.description, entity.instructions, entity.cuisine, entity.favorite, entity.id),
+        )
+
+    def set_favorite(self, recipe_id: int, favorite: bool) -> None:
+        self._execute(self.SET_FAVORITE, (1 if favorite else 0, recipe_id))
+
+    def delete(self, recipe_id: int) -> None:
+        self._execute(self.DELETE, (recipe_id,))
+
+
+class RecipeIngredientsDao(BaseDao):
+    SELECT = "SELECT recipe_id, ingredient_id, quantity, unit, optional FROM RecipeIngredients"
+    GET_BY_RECIPE_ID = SELECT + " WHERE recipe_id = ? ORDER BY ingredient_id"
+    GET_BY_INGREDIENT_ID = SELECT + " WHERE ingredient_id = ? ORDER BY recipe_id"
+    INSERT = """
+        INSERT INTO RecipeIngredients (recipe_id, ingredient_id, quantity, unit, optional)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    DELETE = "DELETE FROM RecipeIngredients WHERE recipe_id = ? AND ingredient_id = ?"
+
+    def get_by_recipe_id(self, recipe_id: int) -> List[RecipeIngredientEntity]:
+        return self._all(RecipeIngredientEntity, self.GET_BY_RECIPE_ID, (recipe_id,))
+
+    def get_by_ingredient_id(self, ingredient_id: int) -> List[RecipeIngredientEntity]:
+        return self._all(RecipeIngredientEntity, self.GET_BY_INGREDIENT_ID, (ingredient_id,))
+
+    def insert(self, entity: RecipeIngredientEntity) -> None:
+        self._execute(self.INSERT, entity)
+
+    def insert_many(self, entities: Iterable[RecipeIngredientEntity]) -> int:
+        return self._execute_many(self.INSERT, entities)
+
+    def delete(self, recipe_id: int, ingredient_id: int) -> None:
+        self._execute(self.DELETE, (recipe_id, ingredient_id))
+
+
+class MealPlansDao(BaseDao):
+    SELECT = "SELECT id, recipe_id, scheduled_for, servings FROM MealPlans"
+    GET_ALL = SELECT + " ORDER BY scheduled_for, id"
+    FIND_BY_DATE = SELECT + " WHERE scheduled_for >= ? AND scheduled_for < date(?, '+1 day') ORDER BY scheduled_for"
+    INSERT = "INSERT INTO MealPlans (id, recipe_id, scheduled_for, servings) VALUES (?, ?, ?, ?)"
+    DELETE = "DELETE FROM MealPlans WHERE id = ?"
+
+    def get_all(self) -> List[MealPlanEntity]:
+        return self._all(MealPlanEntity, self.GET_ALL)
+
+    def find_by_date(self, date: str) -> List[MealPlanEntity]:
+        return self._all(MealPlanEntity, self.FIND_BY_DATE, (date, date))
+
+    def insert(self, entity: MealPlanEntity) -> int:
+        return self._execute(self.INSERT, entity).lastrowid
+
+    def insert_many(self, entities: Iterable[MealPlanEntity]) -> int:
+        return self._execute_many(self.INSERT, entities)
+
+    def delete(self, plan_id: int) -> None:
+        self._execute(self.DELETE, (plan_id,))
+
+
+class CookHistoryDao(BaseDao):
+    SELECT = "SELECT id, recipe_id, cooked_at, notes FROM CookHistory"
+    GET_RECENT = SELECT + " ORDER BY cooked_at DESC, id DESC LIMIT ?"
+    INSERT = "INSERT INTO CookHistory (id, recipe_id, cooked_at, notes) VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?)"
+    DELETE = "DELETE FROM CookHistory WHERE id = ?"
+
+    def get_recent(self, limit: int) -> List[CookHistoryEntity]:
+        return self._all(CookHistoryEntity, self.GET_RECENT, (limit,))
+
+    def insert(self, entity: CookHistoryEntity) -> int:
+        return self._execute(self.INSERT, entity).lastrowid
+
+    def insert_many(self, entities: Iterable[CookHistoryEntity]) -> int:
+        return self._execute_many(self.INSERT, entities)
+
+    def delete(self, entry_id: int) -> None:
+        self._execute(self.DELETE, (entry_id,))
@@ -0,0 +1,184 @@
+"""Connection pooling for the Moonyam SQLite database."""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+from .daos import (
+    CookHistoryDao,
+    IngredientsDao,
+    InventoryDao,
+    InventoryEventsDao,
+    MealPlansDao,
+    RecipeIngredientsDao,
+    RecipesDao,
+    ShoppingDao,
+)
+
+# Applied to every new connection.
+DEFAULT_PRAGMAS: Dict[str, str] = {
+    "foreign_keys": "ON",
+}
+
+# Opt-in (``pragmas=WAL_PRAGMAS``) for databases the tooling created itself,
+# e.g. benchmark copies. WAL lets readers on other pooled connections proceed
+# while one writer commits, and NORMAL sync is safe under it, but the journal
+# mode is stored in the file, so it is never switched on a database by default.
+WAL_PRAGMAS: Dict[str, str] = {
+    **DEFAULT_PRAGMAS,
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+}
+
+# Size of sqlite3's per-connection prepared-statement LRU. DAO statements are
+# module-level constants with ``?`` placeholders, so each one is compiled once
+# per connection and reused from this cache afterwards.
+STATEMENT_CACHE_SIZE = 256
+
+
+class ConnectionPool:
+    """Thread-aware pool of SQLite connections.
+
+    A thread holds at most one connection at a time: nested ``connection()``
+    blocks in the same thread reuse it, so a DAO call inside a
+    ``transaction()`` sees (and joins) the open transaction. Idle connections
+    are kept for reuse; when ``max_size`` are checked out, callers wait up to
+    ``timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_size: int = 8,
+        timeout: float = 30.0,
+        pragmas: Dict[str, str] | None = None,
+        statement_cache: int = STATEMENT_CACHE_SIZE,
+    ):
+        self.path = str(path)
+        self.max_size = 1 if self.path == ":memory:" else max_size
+        self.timeout = timeout
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        self.statement_cache = statement_cache
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._created = 0
+        self._closed = False
+        self.stats = {"created": 0, "reused": 0, "waited": 0}
+
+    def _create(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.statement_cache,
+        )
+        for name, value in self.pragmas.items():
+            if name == "journal_mode" and self.path == ":memory:":
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("connection pool is closed")
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            # Counters are shared across threads; ``+=`` on a dict entry is not atomic.
+            with self._lock:
+                self.stats["reused"] += 1
+            return conn
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                self.stats["created"] += 1
+                return self._create()
+            self.stats["waited"] += 1
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"no pooled connection to {self.path} freed within {self.timeout}s") from None
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """Run the block in one transaction; nested calls join the outer one."""
+        with self.connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class Database:
+    """Pool plus one instance of every DAO, the usual entry point for scripts."""
+
+    def __init__(self, path: str | Path, **pool_options):
+        self.pool = ConnectionPool(path, **pool_options)
+        self.ingredients = IngredientsDao(self.pool)
+        self.inventory = InventoryDao(self.pool)
+        self.inventory_events = InventoryEventsDao(self.pool)
+        self.shopping = ShoppingDao(self.pool)
+        self.recipes = RecipesDao(self.pool)
+        self.recipe_ingredients = RecipeIngredientsDao(self.pool)
+        self.meal_plans = MealPlansDao(self.pool)
+        self.cook_history = CookHistoryDao(self.pool)
+
+    def connection(self):
+        return self.pool.connection()
+
+    def transaction(self, immediate: bool = True):
+        return self.pool.transaction(immediate)
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def __enter__(self) -> "Database":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
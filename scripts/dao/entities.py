@@ -0,0 +1,88 @@
+"""Row types for the Moonyam tables; field order matches docs/db-schema.sql."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class IngredientEntity(NamedTuple):
+    id: int | None
+    name: str
+    default_unit: str
+    category: str | None = None
+
+
+class InventoryEntity(NamedTuple):
+    ingredient_id: int
+    quantity: float
+    unit: str
+    expires_at: str | None = None
+    updated_at: str | None = None
+
+
+class InventoryEventEntity(NamedTuple):
+    id: int | None
+    ingredient_id: int
+    occurred_at: str
+    kind: str
+    delta: float
+    quantity: float
+    unit: str
+    expires_at: str | None = None
+
+
+class InventoryCheckpointEntity(NamedTuple):
+    id: int | None
+    taken_at: str
+    last_event_id: int
+    is_base: int = 0
+
+
+class InventoryCheckpointRowEntity(NamedTuple):
+    checkpoint_id: int
+    ingredient_id: int
+    quantity: float
+    unit: str
+    expires_at: str | None = None
+
+
+class ShoppingItemEntity(NamedTuple):
+    id: int | None
+    ingredient_id: int
+    quantity: float
+    unit: str
+    status: str = "pending"
+    notes: str | None = None
+    created_at: str | None = None
+
+
+class RecipeEntity(NamedTuple):
+    id: int | None
+    name: str
+    description: str | None = None
+    instructions: str | None = None
+    cuisine: str | None = None
+    created_at: str | None = None
+    favorite: int = 0
+
+
+class RecipeIngredientEntity(NamedTuple):
+    recipe_id: int
+    ingredient_id: int
+    quantity: float
+    unit: str
+    optional: int = 0
+
+
+class MealPlanEntity(NamedTuple):
+    id: int | None
+    recipe_id: int
+    scheduled_for: str
+    servings: int = 1
+
+
+class CookHistoryEntity(NamedTuple):
+    id: int | None
+    recipe_id: int
+    cooked_at: str | None = None
+    notes: str | None = None
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Golden-snapshot cache of fully loaded Moonyam databases.
+
+Building a seeded database from schema + generator costs seconds to minutes at
+larger scale factors. ``golden_path`` builds it once per (schema hash,
+hash of the generator and every scripts/ module it imports, catalog hash,
+seed, scale, reference time), analyzes and vacuums it, and keeps it under
+build/db-snapshots/. Each test then takes a private copy:
+
+  * ``clone_file``  - copy_file_range (reflink on btrfs/XFS) or plain copy;
+  * ``clone_memory`` - SQLite online backup into a ``:memory:`` connection.
+
+Snapshots are written to a temp file and renamed into place, and builds are
+serialized with a lock file, so parallel test workers never see a partial file.
+
+Usage:
+    conn = db_snapshots.clone_memory(scale=10)               # in a test
+    path = db_snapshots.clone_file(tmp_path / "t.db", scale=10)
+
+    python scripts/db_snapshots.py build --scale 100
+    python scripts/db_snapshots.py bench --scales 1 10 100
+    python scripts/db_snapshots.py prune
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import contextlib
+import datetime as dt
+import functools
+import hashlib
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Iterator, List, Set, Tuple
+
+import catalog
+import generate_seed_data as seed
+
+SNAPSHOT_DIR = seed.ROOT / "build" / "db-snapshots"
+# Snapshots must be reproducible, so generated dates hang off a fixed instant
+# rather than the current time.
+DEFAULT_NOW = dt.datetime(2025, 1, 1, 12, 0, 0)
+# Imports inside these never run while a dataset is generated and loaded.
+CLI_ONLY_FUNCTIONS = ("main", "run_benchmark")
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class _LocalImports(ast.NodeVisitor):
+    """Top-level names imported by a module, skipping CLI/benchmark-only function bodies."""
+
+    def __init__(self) -> None:
+        self.names: Set[str] = set()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        if node.name not in CLI_ONLY_FUNCTIONS:
+            self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        self.names.update(alias.name.split(".")[0] for alias in node.names)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.level == 0 and node.module:
+            self.names.add(node.module.split(".")[0])
+
+
+@functools.lru_cache(maxsize=None)
+def generator_sources() -> Tuple[Path, ...]:
+    """generate_seed_data.py plus every scripts/ module it imports, directly or not (lazy imports included)."""
+    scripts = Path(seed.__file__).resolve().parent
+    seen: Set[Path] = set()
+    pending = [Path(seed.__file__).resolve()]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        visitor = _LocalImports()
+        visitor.visit(ast.parse(path.read_bytes(), str(path)))
+        for name in visitor.names:
+            if (scripts / f"{name}.py").exists():
+                pending.append(scripts / f"{name}.py")
+            elif (scripts / name / "__init__.py").exists():
+                pending.extend((scripts / name).glob("*.py"))
+    return tuple(sorted(seen))
+
+
+def snapshot_key(scale: int, seed_value: int, now: dt.datetime) -> str:
+    digest = hashlib.sha256()
+    digest.update(seed.SCHEMA.read_bytes())
+    for path in generator_sources():
+        digest.update(path.read_bytes())
+    digest.update(catalog.INGREDIENTS_CSV.read_bytes())
+    digest.update(catalog.RECIPES_JSON.read_bytes())
+    digest.update(f"{seed_value}:{scale}:{now.isoformat()}".encode())
+    return digest.hexdigest()[:16]
+
+
+@contextlib.contextmanager
+def _build_lock(directory: Path) -> Iterator[None]:
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / ".lock", "w") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def build_snapshot(path: Path, scale: int, seed_value: int, now: dt.datetime) -> None:
+    seed.write_db(path, seed.generate_dataset(scale, random.Random(seed_value), now))
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+def golden_path(
+    scale: int = 1,
+    seed_value: int = 42,
+    now: dt.datetime = DEFAULT_NOW,
+    directory: Path = SNAPSHOT_DIR,
+) -> Path:
+    """Path of the golden database for these parameters, building it on first use."""
+    directory = Path(directory)
+    path = directory / f"golden-x{scale}-s{seed_value}-{snapshot_key(scale, seed_value, now)}.db"
+    if path.exists():
+        return path
+    with _build_lock(directory):
+        if not path.exists():
+            fd, tmp_name = tempfile.mkstemp(prefix=".building-", suffix=".db", dir=directory)
+            os.close(fd)
+            tmp = Path(tmp_name)
+            try:
+                build_snapshot(tmp, scale, seed_value, now)
+                os.replace(tmp, path)
+            finally:
+                tmp.unlink(missing_ok=True)
+    return path
+
+
+def _copy(src: Path, dst: Path) -> None:
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is not None:
+        try:
+            with open(src, "rb") as fin, open(dst, "wb") as fout:
+                remaining = os.fstat(fin.fileno()).st_size
+                while remaining > 0:
+                    copied = copy_range(fin.fileno(), fout.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
+def clone_file(dest: Path, scale: int = 1, seed_value: int = 42, now: dt.datetime = DEFAULT_NOW) -> Path:
+    """Private on-disk copy of the golden database at ``dest``."""
+    dest = Path(dest)
+    _copy(golden_path(scale, seed_value, now), dest)
+    return dest
+
+
+def clone_memory(scale: int = 1, seed_value: int = 42, now: dt.datetime = DEFAULT_NOW) -> sqlite3.Connection:
+    """In-memory copy of the golden database via SQLite's online backup API."""
+    source = sqlite3.connect(f"{golden_path(scale, seed_value, now).resolve().as_uri()}?mode=ro", uri=True)
+    target = sqlite3.connect(":memory:")
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+    target.execute("PRAGMA foreign_keys = ON")
+    return target
+
+
+def prune(directory: Path = SNAPSHOT_DIR) -> List[Path]:
+    """Delete snapshots whose key no longer matches the current schema/generator."""
+    removed = []
+    for path in Path(directory).glob("golden-x*-s*-*.db"):
+        _, scale, seed_part, key = path.stem.split("-", 3)
+        current = snapshot_key(int(scale[1:]), int(seed_part[1:]), DEFAULT_NOW)
+        if key != current:
+            path.unlink()
+            removed.append(path)
+    return removed
+
+
+def run_benchmark(scales: List[int], repeat: int) -> None:
+    import benchlib
+
+    results = {}
+    workdir = Path(tempfile.mkdtemp(prefix="moonyam-snap-"))
+    for scale in scales:
+        cold = workdir / f"cold-x{scale}.db"
+        results[f"x{scale} cold build (schema + seed)"] = benchlib.measure(
+            lambda: build_snapshot(cold, scale, 42, DEFAULT_NOW), repeat=1, warmup=0
+        )
+        golden_path(scale)
+        dest = workdir / f"clone-x{scale}.db"
+        results[f"x{scale} clone_file"] = benchlib.measure(lambda: clone_file(dest, scale), repeat)
+        results[f"x{scale} clone_memory"] = benchlib.measure(lambda: clone_memory(scale).close(), repeat)
+    shutil.rmtree(workdir, ignore_errors=True)
+    benchlib.print_results("golden snapshot: cold build vs per-test clone", results)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["build", "path", "prune", "bench"])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="bench: scale factors")
+    parser.add_argument("--repeat", type=int, default=10, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command in ("build", "path"):
+        print(golden_path(args.scale, args.seed))
+    elif args.command == "prune":
+        for path in prune():
+            print(f"removed {path}")
+    else:
+        run_benchmark(args.scales, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Delta sync of a generated dataset into an existing Moonyam database.
+
+The seed SQL from ``write_sql()`` empties all seven tables and reinserts
+everything, so every fixture refresh rewrites the whole file and discards warm
+index pages. ``sync_database`` instead diffs the target against the dataset
+table by table (keyed on each table's primary key) and applies only:
+
+  * ``DELETE`` for rows that disappeared (children first), then
+  * ``INSERT ... ON CONFLICT DO UPDATE`` for new or changed rows (parents first),
+
+inside one transaction with foreign-key checks deferred to commit. Tables
+the target's schema does not have yet (a database built before the inventory
+log or meal-plan rules existed) are skipped and reported as such. Writes are
+proportional to the size of the change; the diff itself is a single read of
+each table. Unchanged rows are not touched, so the DataVersions counters only
+move when data really changed. Generated timestamps are relative to the
+generator's reference time, so pin it (``--now``) when refreshing fixtures.
+
+Usage:
+    python scripts/generate_seed_data.py --no-sql --now 2025-11-10T20:00 --sync src/main/resources/moonyam.db
+    python scripts/delta_sync.py bench --scale 100 --change 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import operator
+import random
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import generate_seed_data as seed
+
+PRIMARY_KEYS: Dict[str, Tuple[str, ...]] = {
+    "Ingredients": ("id",),
+    "Inventory": ("ingredient_id",),
+    "ShoppingItems": ("id",),
+    "Recipes": ("id",),
+    "RecipeIngredients": ("recipe_id", "ingredient_id"),
+    "MealPlans": ("id",),
+    "MealPlanRules": ("id",),
+    "CookHistory": ("id",),
+    "InventoryEvents": ("id",),
+    "InventoryCheckpoints": ("id",),
+    "InventoryCheckpointRows": ("checkpoint_id", "ingredient_id"),
+}
+
+# Parents before children; deletes run in reverse.
+SYNC_ORDER = [
+    "Ingredients", "Recipes", "Inventory", "ShoppingItems", "RecipeIngredients", "MealPlans", "MealPlanRules",
+    "CookHistory", "InventoryEvents", "InventoryCheckpoints", "InventoryCheckpointRows",
+]
+
+
+def _upsert_sql(table: str, columns: Sequence[str]) -> str:
+    keys = PRIMARY_KEYS[table]
+    placeholders = ", ".join("?" for _ in columns)
+    updates = ", ".join(f"{col} = excluded.{col}" for col in columns if col not in keys)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}"
+    )
+
+
+class TableDiff(NamedTuple):
+    inserts: List[tuple]
+    updates: List[tuple]
+    deletes: List[tuple]
+    unchanged: int
+
+
+def diff_table(conn: sqlite3.Connection, table: str, rows: Sequence[dict]) -> TableDiff:
+    columns = seed.TABLE_COLUMNS[table]
+    keys = PRIMARY_KEYS[table]
+    # itemgetter keeps the per-row work in C; bools compare and hash equal to
+    # the 0/1 integers SQLite hands back, so no normalization is needed.
+    row_values = operator.itemgetter(*columns)
+    key_of = operator.itemgetter(*(columns.index(key) for key in keys))
+    existing = {key_of(row): row for row in conn.execute(f"SELECT {', '.join(columns)} FROM {table}")}
+    inserts: List[tuple] = []
+    updates: List[tuple] = []
+    unchanged = 0
+    for row in rows:
+        values = row_values(row)
+        current = existing.pop(key_of(values), None)
+        if current is None:
+            inserts.append(values)
+        elif current == values:
+            unchanged += 1
+        else:
+            updates.append(values)
+    deletes = [key if len(keys) > 1 else (key,) for key in existing]
+    return TableDiff(inserts, updates, deletes, unchanged)
+
+
+def sync_database(path: Path, dataset: Dict[str, List[dict]], dry_run: bool = False) -> Dict[str, Dict[str, int]]:
+    """Bring the database at ``path`` in line with ``dataset``; build it from scratch if missing."""
+    path = Path(path)
+    if not path.exists():
+        if not dry_run:
+            seed.write_db(path, dataset)
+        return {table: {"inserted": len(dataset[table]), "updated": 0, "deleted": 0, "unchanged": 0}
+                for table in SYNC_ORDER}
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        # foreign_keys is per connection and off by default; it cannot change inside a transaction.
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("PRAGMA defer_foreign_keys = ON")
+        # Tables newer than the target's schema (e.g. the inventory log on the shipped
+        # moonyam.db) are left out rather than failing the whole sync.
+        present = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        tables = [table for table in SYNC_ORDER if table in present]
+        diffs = {table: diff_table(conn, table, dataset[table]) for table in tables}
+        if not dry_run:
+            for table in reversed(tables):
+                if diffs[table].deletes:
+                    where = " AND ".join(f"{key} = ?" for key in PRIMARY_KEYS[table])
+                    conn.executemany(f"DELETE FROM {table} WHERE {where}", diffs[table].deletes)
+            for table in tables:
+                upserts = diffs[table].inserts + diffs[table].updates
+                if upserts:
+                    conn.executemany(_upsert_sql(table, seed.TABLE_COLUMNS[table]), upserts)
+        if dry_run:
+            conn.execute("ROLLBACK")
+        else:
+            conn.execute("COMMIT")
+            conn.execute("PRAGMA optimize")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return {
+        table: {
+            "inserted": len(diff.inserts),
+            "updated": len(diff.updates),
+            "deleted": len(diff.deletes),
+            "unchanged": diff.unchanged,
+        }
+        for table, diff in diffs.items()
+    }
+
+
+def print_stats(stats: Dict[str, Dict[str, int]]) -> None:
+    print(f"  {'table':<24} {'inserted':>9} {'updated':>9} {'deleted':>9} {'unchanged':>10}")
+    for table in SYNC_ORDER:
+        counts = stats.get(table)
+        if counts is None:
+            print(f"  {table:<24} skipped: not in the target database's schema")
+            continue
+        print(
+            f"  {table:<24} {counts['inserted']:>9} {counts['updated']:>9} "
+            f"{counts['deleted']:>9} {counts['unchanged']:>10}"
+        )
+
+
+# Benchmark --------------------------------------------------------------------
+def perturb(dataset: Dict[str, List[dict]], fraction: float, rng: random.Random) -> Dict[str, List[dict]]:
+    """Copy of ``dataset`` with roughly ``fraction`` of the per-user rows changed, added or removed."""
+    changed = {table: [dict(row) for row in rows] for table, rows in dataset.items()}
+    for row in changed["Inventory"]:
+        if rng.random() < fraction:
+            row["quantity"] = round(row["quantity"] + 1.5, 1)
+    changed["ShoppingItems"] = [row for row in changed["ShoppingItems"] if rng.random() >= fraction]
+    recipe_ids = [row["id"] for row in changed["Recipes"]]
+    next_id = max((row["id"] for row in changed["CookHistory"]), default=0) + 1
+    for offset in range(max(1, int(len(changed["CookHistory"]) * fraction))):
+        changed["CookHistory"].append(
+            {"id": next_id + offset, "recipe_id": rng.choice(recipe_ids), "cooked_at": "2030-01-01 19:00:00",
+             "notes": None}
+        )
+    return changed
+
+
+def run_benchmark(scale: int, change: float, repeat: int) -> None:
+    import benchlib
+
+    # One reference time for both, or every timestamped row differs once generation takes over a second.
+    now = dt.datetime.now().replace(microsecond=0)
+    pristine = benchlib.scaled_database(scale, now=now)
+    base = seed.generate_dataset(scale, random.Random(42), now=now)
+    drift = {
+        table: counts for table, counts in sync_database(pristine, base, dry_run=True).items()
+        if counts["inserted"] or counts["updated"] or counts["deleted"]
+    }
+    if drift:
+        raise SystemExit(f"the benchmark database does not match its dataset before perturbing: {drift}")
+    target = perturb(base, change, random.Random(1))
+    work = pristine.with_name("sync-work.db")
+    sql_path = pristine.with_name("seed-reload.sql")
+    seed.write_sql(target, sql_path)
+
+    def reset() -> None:
+        shutil.copyfile(pristine, work)
+
+    def reload_sql() -> None:
+        conn = sqlite3.connect(work)
+        conn.executescript(sql_path.read_text())
+        conn.close()
+
+    reset()
+    stats = sync_database(work, target)
+    per_user = ("Inventory", "ShoppingItems", "CookHistory")
+    touched = sum(stats[t]["inserted"] + stats[t]["updated"] + stats[t]["deleted"] for t in stats)
+    rows = sum(len(base[table]) for table in per_user)
+    results = {
+        "rebuild from schema + dataset": benchlib.measure(lambda: seed.write_db(work, target), repeat, setup=reset),
+        "seed SQL (DELETE + reinsert)": benchlib.measure(reload_sql, repeat, setup=reset),
+        "delta sync": benchlib.measure(lambda: sync_database(work, target), repeat, setup=reset),
+    }
+    print_stats(stats)
+    benchlib.print_results(
+        f"fixture refresh, scale x{scale}, {touched} rows synced ({touched / rows:.1%} of per-user rows, "
+        f"--change {change:.1%})",
+        results,
+    )
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["bench"])
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--change", type=float, default=0.01, help="fraction of per-user rows to change")
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    run_benchmark(args.scale, args.change, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Generate a fleet of independent household pantry databases.
+
+In production every household has its own moonyam.db. ``generate`` builds
+thousands of them for fleet-level tests (backups, migrations, query fan-out):
+
+  1. the catalog-wide tables (Ingredients, Recipes, RecipeIngredients) are
+     generated once into a template database;
+  2. a process pool copies the template per household and fills only the
+     per-household tables (Inventory, ShoppingItems, MealPlans, MealPlanRules,
+     CookHistory, InventoryEvents + checkpoints, cook rollups).
+
+Household ``i`` uses seed ``base_seed + i``, and its size is drawn from that
+seed: a log-normal activity level scales pantry, shopping list and plans, and
+tenure (exponential, mean 1.5 years) decides between a few weeks of cooking
+and a seasonal multi-year history. Output is therefore the same for any
+worker count. A manifest.csv lists every household and its row counts;
+regenerating into the same directory removes households the new manifest no
+longer lists.
+
+``query`` fans one SQL statement out over the households in the manifest with
+the same pool.
+
+Usage:
+    python scripts/fleet.py generate --households 2000 --output build/fleet
+    python scripts/fleet.py query "SELECT COUNT(*) FROM Inventory" --output build/fleet
+    python scripts/fleet.py bench --households 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import functools
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import cook_rollups
+import generate_seed_data as seed
+import inventory_log
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_OUTPUT = ROOT / "build" / "fleet"
+TEMPLATE_NAME = "template.db"
+MANIFEST_NAME = "manifest.csv"
+
+SHARED_TABLES = ("Ingredients", "Recipes", "RecipeIngredients")
+HOUSEHOLD_TABLES = [table for table in seed.TABLE_COLUMNS if table not in SHARED_TABLES]
+MANIFEST_COLUMNS = ["household", "seed", "path", "activity", "tenure_years"] + HOUSEHOLD_TABLES + ["bytes"]
+
+# (household index, seed, output path, template path, reference time)
+HouseholdTask = Tuple[int, int, str, str, str]
+
+
+def household_path(output: Path, index: int) -> Path:
+    # Shard by thousands so directory listings stay manageable at fleet size.
+    return Path(output) / f"{index // 1000:03d}" / f"household-{index:06d}.db"
+
+
+def build_template(path: Path, catalog_scale: int, seed_value: int, now: dt.datetime) -> Path:
+    """Schema plus the catalog-wide tables every household shares."""
+    rng = random.Random(seed_value)
+    ingredients = seed.scale_ingredients(catalog_scale)
+    lookup = {row["name"]: row for row in ingredients}
+    recipes, links = seed.generate_recipe_rows(rng, now, seed.scale_recipes(rng, catalog_scale), lookup)
+    dataset = {table: [] for table in seed.TABLE_COLUMNS}
+    dataset.update({"Ingredients": ingredients, "Recipes": recipes, "RecipeIngredients": links})
+    seed.write_db(path, dataset)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return path
+
+
+def household_profile(rng: random.Random) -> Dict[str, float]:
+    """Size of one household: activity ~ log-normal around 1, tenure ~ exponential (mean 1.5 years)."""
+    return {
+        "activity": round(min(max(rng.lognormvariate(0.0, 0.6), 0.15), 6.0), 3),
+        "tenure_years": round(rng.expovariate(1 / 1.5), 2),
+    }
+
+
+def generate_household(
+    rng: random.Random, now: dt.datetime, ingredients: List[dict], recipe_ids: List[int], profile: Dict[str, float]
+) -> Dict[str, List[dict]]:
+    """Rows for the per-household tables."""
+    activity = profile["activity"]
+    pantry_size = min(max(round(95 * activity), 5), len(ingredients))
+    inventory = seed.generate_inventory_rows(rng, now, pantry_size, ingredients)
+    shopping = seed.generate_shopping_rows(rng, now, min(round(28 * activity), len(ingredients)), ingredients)
+    plans = seed.generate_meal_plans(rng, now, recipe_ids, round(10 * activity))
+    years = int(profile["tenure_years"])
+    if years >= 1:
+        cooks = seed.generate_seasonal_cook_history(rng, now, recipe_ids, years, 0.5 * activity)
+    else:
+        cooks = seed.generate_cook_history(rng, now, recipe_ids, max(round(14 * activity), 1))
+    events = seed.generate_inventory_events(rng, inventory)
+    checkpoints, checkpoint_rows = inventory_log.build_checkpoints(events)
+    rules = seed.generate_meal_plan_rules(rng, now, recipe_ids, round(2 * activity))
+    return {
+        "Inventory": inventory,
+        "ShoppingItems": shopping,
+        "MealPlans": plans,
+        "MealPlanRules": rules,
+        "CookHistory": cooks,
+        "InventoryEvents": events,
+        "InventoryCheckpoints": checkpoints,
+        "InventoryCheckpointRows": checkpoint_rows,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_rows(template: str) -> Tuple[List[dict], List[int]]:
+    # Read once per worker process, not once per household.
+    conn = sqlite3.connect(f"{Path(template).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        columns = seed.TABLE_COLUMNS["Ingredients"]
+        cursor = conn.execute(f"SELECT {', '.join(columns)} FROM Ingredients ORDER BY id")
+        ingredients = [dict(zip(columns, row)) for row in cursor]
+        recipe_ids = [row[0] for row in conn.execute("SELECT id FROM Recipes ORDER BY id")]
+    finally:
+        conn.close()
+    return ingredients, recipe_ids
+
+
+def build_household(task: HouseholdTask) -> Dict[str, object]:
+    """Worker: copy the template and fill in one household. Returns its manifest row."""
+    index, seed_value, path, template, now = task
+    rng = random.Random(seed_value)
+    profile = household_profile(rng)
+    ingredients, recipe_ids = _shared_rows(template)
+    rows = generate_household(rng, dt.datetime.fromisoformat(now), ingredients, recipe_ids, profile)
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(template, target)
+    conn = sqlite3.connect(target)
+    try:
+        with conn, cook_rollups.bulk_load(conn):
+            for table, table_rows in rows.items():
+                columns = seed.TABLE_COLUMNS[table]
+                conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                    (tuple(row[col] for col in columns) for row in table_rows),
+                )
+    finally:
+        conn.close()
+    return {
+        "household": index,
+        "seed": seed_value,
+        "path": str(target),
+        **profile,
+        **{table: len(rows[table]) for table in HOUSEHOLD_TABLES},
+        "bytes": target.stat().st_size,
+    }
+
+
+def generate_fleet(
+    output: Path,
+    households: int,
+    seed_value: int = 42,
+    workers: int | None = None,
+    catalog_scale: int = 1,
+    now: dt.datetime | None = None,
+) -> List[Dict[str, object]]:
+    """Build ``households`` databases under ``output``; returns the manifest rows."""
+    import csv
+
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    now = now or dt.datetime.now().replace(microsecond=0)
+    template = build_template(output / TEMPLATE_NAME, catalog_scale, seed_value, now)
+    tasks = [
+        (idx, seed_value + idx, str(household_path(output, idx)), str(template), now.isoformat())
+        for idx in range(1, households + 1)
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        manifest = [build_household(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            manifest = list(pool.map(build_household, tasks, chunksize=max(1, len(tasks) // (workers * 8))))
+    with open(output / MANIFEST_NAME, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=MANIFEST_COLUMNS)
+        writer.writeheader()
+        writer.writerows(manifest)
+    # Households from an earlier, larger run are no longer part of the fleet.
+    current = {Path(task[2]) for task in tasks}
+    for stale in output.glob("[0-9][0-9][0-9]/household-*.db"):
+        if stale not in current:
+            stale.unlink()
+    return manifest
+
+
+def build_household_full(task: HouseholdTask) -> None:
+    """Baseline: one household built like ``generate_seed_data.py --db``, catalog included."""
+    _index, seed_value, path, _template, now = task
+    seed.write_db(Path(path), seed.generate_dataset(1, random.Random(seed_value), dt.datetime.fromisoformat(now)))
+
+
+# Fan-out -----------------------------------------------------------------------
+def household_paths(output: Path) -> List[Path]:
+    """Databases of the fleet as listed in its manifest (empty when there is none)."""
+    import csv
+
+    manifest = Path(output) / MANIFEST_NAME
+    if not manifest.exists():
+        return []
+    with open(manifest, newline="") as handle:
+        # Rebuilt from the index: the manifest's path column is relative to wherever generate ran.
+        return [household_path(output, int(row["household"])) for row in csv.DictReader(handle)]
+
+
+def _query_one(args: Tuple[str, str]) -> Tuple[List[tuple], float]:
+    path, sql = args
+    start = time.perf_counter()
+    conn = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+    return rows, (time.perf_counter() - start) * 1000.0
+
+
+def fan_out(paths: List[Path], sql: str, workers: int | None = None) -> Tuple[List[tuple], List[float]]:
+    """Run ``sql`` against every database; returns all rows and the per-database latencies (ms)."""
+    tasks = [(str(path), sql) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [_query_one(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_query_one, tasks, chunksize=max(1, len(tasks) // (workers * 8))))
+    rows = [row for result_rows, _ in results for row in result_rows]
+    return rows, [latency for _, latency in results]
+
+
+def print_summary(manifest: List[Dict[str, object]]) -> None:
+    sizes = sorted(int(row["bytes"]) for row in manifest)
+    print(f"  households: {len(manifest)}, total {sum(sizes) / 1024 / 1024:.1f} MiB")
+    print(
+        f"  size KiB: p50 {sizes[len(sizes) // 2] / 1024:.0f}, p90 {sizes[int(len(sizes) * 0.9)] / 1024:.0f}, "
+        f"max {sizes[-1] / 1024:.0f}"
+    )
+    for table in ("Inventory", "CookHistory", "InventoryEvents"):
+        counts = [int(row[table]) for row in manifest]
+        print(f"  {table:<16} rows: median {statistics.median(counts):.0f}, max {max(counts)}")
+
+
+def run_benchmark(households: int, workers: int | None) -> None:
+    import tempfile
+
+    import benchlib
+
+    workdir = Path(tempfile.mkdtemp(prefix="moonyam-fleet-"))
+    now = dt.datetime(2025, 1, 1, 12, 0, 0)
+    results = {}
+    try:
+        baseline_dir = workdir / "full"
+        tasks = [
+            (idx, 42 + idx, str(household_path(baseline_dir, idx)), "", now.isoformat())
+            for idx in range(1, households + 1)
+        ]
+        for task in tasks:
+            Path(task[2]).parent.mkdir(parents=True, exist_ok=True)
+
+        results[f"{households} households, full build each"] = benchlib.measure(
+            lambda: [build_household_full(task) for task in tasks], repeat=1, warmup=0
+        )
+        results[f"{households} households, shared template, 1 worker"] = benchlib.measure(
+            lambda: generate_fleet(workdir / "serial", households, workers=1, now=now), repeat=1, warmup=0
+        )
+        pool_workers = workers or os.cpu_count() or 1
+        manifest: List[Dict[str, object]] = []
+        results[f"{households} households, shared template, {pool_workers} workers"] = benchlib.measure(
+            lambda: manifest.extend(generate_fleet(workdir / "pool", households, workers=pool_workers, now=now)),
+            repeat=1,
+            warmup=0,
+        )
+        paths = household_paths(workdir / "pool")
+        sql = "SELECT COUNT(*) FROM Inventory WHERE expires_at IS NOT NULL"
+        results["fan-out query, 1 worker"] = benchlib.measure(lambda: fan_out(paths, sql, 1), repeat=3)
+        results[f"fan-out query, {pool_workers} workers"] = benchlib.measure(
+            lambda: fan_out(paths, sql, pool_workers), repeat=3
+        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    benchlib.print_results("household fleet generation and fan-out", results)
+    print_summary(manifest)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["generate", "query", "bench"])
+    parser.add_argument("sql", nargs="?", help="query: statement to run against every household")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="fleet directory")
+    parser.add_argument("--households", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42, help="base seed; household i uses seed + i")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--catalog-scale", type=int, default=1, help="scale factor of the shared catalog")
+    parser.add_argument(
+        "--now", type=dt.datetime.fromisoformat, help="reference timestamp for generated dates (default: now)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.households, args.workers)
+        return
+    if args.command == "query":
+        if not args.sql:
+            print("a SQL statement is required", file=sys.stderr)
+            raise SystemExit(2)
+        paths = household_paths(args.output)
+        if not paths:
+            print(f"No fleet manifest ({MANIFEST_NAME}) under {args.output}", file=sys.stderr)
+            raise SystemExit(1)
+        start = time.perf_counter()
+        rows, latencies = fan_out(paths, args.sql, args.workers)
+        elapsed = (time.perf_counter() - start) * 1000.0
+        latencies.sort()
+        print(f"{len(rows)} rows from {len(paths)} databases in {elapsed:.0f} ms")
+        print(f"  per database ms: p50 {latencies[len(latencies) // 2]:.2f}, max {latencies[-1]:.2f}")
+        if rows and all(len(row) == 1 and isinstance(row[0], (int, float)) for row in rows):
+            print(f"  sum: {sum(row[0] for row in rows)}")
+        return
+    start = time.perf_counter()
+    manifest = generate_fleet(args.output, args.households, args.seed, args.workers, args.catalog_scale, args.now)
+    print(f"Built {len(manifest)} households under {args.output} in {time.perf_counter() - start:.1f} s")
+    print_summary(manifest)
+
+
+if __name__ == "__main__":
+    main()
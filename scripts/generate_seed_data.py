@@ -6,920 +6,50 @@ The script creates INSERT statements aligned with docs/db-schema.sql and writes
 them to docs/seed-data.sql. Data includes hundreds of ingredients, sample
 inventory/shopping rows, dozens of recipes with ingredient links, and planning
 tables to showcase realistic usage.
+
+The ingredient catalog and recipes are read lazily from docs/catalog/ (see
+catalog.py). Importing this module has no side effects: randomness and the
+reference time are passed in (``rng``/``now``) rather than taken from globals.
 """
 
 from __future__ import annotations
 
+import argparse
 import datetime as dt
+import math
+import os
 import random
+import sqlite3
+import sys
 from pathlib import Path
-from typing import Dict, List, Sequence
+from typing import Dict, List
+
+import catalog
+import cook_rollups
+import inventory_log
+import meal_calendar
 
 ROOT = Path(__file__).resolve().parents[1]
 OUTPUT = ROOT / "docs" / "seed-data.sql"
+SCHEMA = ROOT / "docs" / "db-schema.sql"
 
-# Ingredient catalog ---------------------------------------------------------
-INGREDIENTS_BY_CATEGORY: Dict[str, Sequence[tuple[str, str]]] = {
-    "Produce": [
-        ("Roma Tomato", "pcs"),
-        ("Cherry Tomato", "pcs"),
-        ("Heirloom Tomato", "pcs"),
-        ("English Cucumber", "pcs"),
-        ("Persian Cucumber", "pcs"),
-        ("Kirby Cucumber", "pcs"),
-        ("Red Onion", "pcs"),
-        ("Yellow Onion", "pcs"),
-        ("White Onion", "pcs"),
-        ("Sweet Onion", "pcs"),
-        ("Baby Spinach", "g"),
-        ("Kale Leaves", "g"),
-        ("Arugula", "g"),
-        ("Butter Lettuce", "pcs"),
-        ("Iceberg Lettuce", "pcs"),
-        ("Romaine Lettuce", "pcs"),
-        ("Carrot", "pcs"),
-        ("Baby Carrot", "g"),
-        ("Russet Potato", "pcs"),
-        ("Yukon Gold Potato", "pcs"),
-        ("Sweet Potato", "pcs"),
-        ("Fingerling Potato", "pcs"),
-        ("Broccoli Florets", "g"),
-        ("Cauliflower Florets", "g"),
-        ("Red Bell Pepper", "pcs"),
-        ("Green Bell Pepper", "pcs"),
-        ("Yellow Bell Pepper", "pcs"),
-        ("Orange Bell Pepper", "pcs"),
-        ("Zucchini", "pcs"),
-        ("Yellow Squash", "pcs"),
-        ("Eggplant", "pcs"),
-        ("Butternut Squash", "pcs"),
-        ("Acorn Squash", "pcs"),
-        ("Jalapeno", "pcs"),
-        ("Serrano Pepper", "pcs"),
-        ("Poblano Pepper", "pcs"),
-        ("Fresno Chili", "pcs"),
-        ("Portobello Mushroom", "pcs"),
-        ("Cremini Mushroom", "pcs"),
-        ("Shiitake Mushroom", "pcs"),
-        ("Garlic Bulb", "pcs"),
-        ("Shallot", "pcs"),
-        ("Ginger Root", "g"),
-        ("Avocado", "pcs"),
-        ("Green Beans", "g"),
-        ("Asparagus Spears", "g"),
-        ("Brussels Sprouts", "g"),
-        ("Leek", "pcs"),
-        ("Fresh Basil", "g"),
-        ("Fresh Cilantro", "g"),
-        ("Fresh Parsley", "g"),
-        ("Fresh Mint", "g"),
-        ("Fresh Dill", "g"),
-        ("Fresh Rosemary", "g"),
-        ("Fresh Thyme", "g"),
-        ("Fresh Sage", "g"),
-        ("Green Onion", "pcs"),
-        ("Celery", "pcs"),
-        ("Lemon", "pcs"),
-        ("Lime", "pcs"),
-        ("Orange", "pcs"),
-        ("Grapefruit", "pcs"),
-        ("Granny Smith Apple", "pcs"),
-        ("Honeycrisp Apple", "pcs"),
-        ("Banana", "pcs"),
-        ("Pear", "pcs"),
-        ("Strawberries", "g"),
-        ("Blueberries", "g"),
-        ("Blackberries", "g"),
-        ("Raspberries", "g"),
-        ("Mango", "pcs"),
-        ("Pineapple", "pcs"),
-        ("Watermelon", "pcs"),
-        ("Cantaloupe", "pcs"),
-        ("Kiwi", "pcs"),
-        ("Navel Orange", "pcs"),
-        ("Coconut", "pcs"),
-        ("Fresh Turmeric", "g"),
-        ("Green Cabbage", "pcs"),
-        ("Red Cabbage", "pcs"),
-        ("Bok Choy", "pcs"),
-        ("Snow Peas", "g"),
-        ("Sugar Snap Peas", "g"),
-        ("Radish", "pcs"),
-        ("Beetroot", "pcs"),
-        ("Turnip", "pcs"),
-        ("Daikon", "pcs"),
-        ("Plantain", "pcs"),
-        ("Passion Fruit", "pcs"),
-        ("Dragon Fruit", "pcs"),
-        ("Starfruit", "pcs"),
-        ("Papaya", "pcs"),
-        ("Pomegranate", "pcs"),
-        ("Apricot", "pcs"),
-        ("Plum", "pcs"),
-        ("Peach", "pcs"),
-        ("Nectarine", "pcs"),
-        ("Cherries", "g"),
-        ("Cranberries", "g"),
-    ],
-    "Dairy & Eggs": [
-        ("Whole Milk", "ml"),
-        ("Skim Milk", "ml"),
-        ("Almond Milk", "ml"),
-        ("Oat Milk", "ml"),
-        ("Heavy Cream", "ml"),
-        ("Half and Half", "ml"),
-        ("Greek Yogurt", "g"),
-        ("Plain Yogurt", "g"),
-        ("Vanilla Yogurt", "g"),
-        ("Sour Cream", "g"),
-        ("Cottage Cheese", "g"),
-        ("Cheddar Cheese", "g"),
-        ("Mozzarella Cheese", "g"),
-        ("Parmesan Cheese", "g"),
-        ("Feta Cheese", "g"),
-        ("Goat Cheese", "g"),
-        ("Ricotta Cheese", "g"),
-        ("Cream Cheese", "g"),
-        ("Mascarpone Cheese", "g"),
-        ("Butter Unsalted", "g"),
-        ("Butter Salted", "g"),
-        ("Ghee", "g"),
-        ("Large Eggs", "pcs"),
-        ("Pastured Eggs", "pcs"),
-        ("Egg Whites", "ml"),
-        ("Egg Yolks", "pcs"),
-        ("Buttermilk", "ml"),
-    ],
-    "Proteins": [
-        ("Chicken Breast", "g"),
-        ("Chicken Thigh", "g"),
-        ("Ground Chicken", "g"),
-        ("Ground Turkey", "g"),
-        ("Ground Beef 80-20", "g"),
-        ("Ground Beef 90-10", "g"),
-        ("Sirloin Steak", "g"),
-        ("Pork Chops", "g"),
-        ("Pork Tenderloin", "g"),
-        ("Bacon Strips", "g"),
-        ("Prosciutto", "g"),
-        ("Smoked Salmon", "g"),
-        ("Cod Fillet", "g"),
-        ("Salmon Fillet", "g"),
-        ("Shrimp Large", "g"),
-        ("Scallops", "g"),
-        ("Tofu Firm", "g"),
-        ("Tofu Extra Firm", "g"),
-        ("Tempeh", "g"),
-        ("Black Beans Dried", "g"),
-        ("Chickpeas Dried", "g"),
-        ("Lentils Green", "g"),
-        ("Lentils Red", "g"),
-        ("Cannellini Beans Dry", "g"),
-        ("Kidney Beans Dry", "g"),
-        ("Edamame Shelled", "g"),
-        ("Quinoa Raw", "g"),
-        ("Seitan", "g"),
-        ("Turkey Sausage", "g"),
-        ("Italian Sausage", "g"),
-        ("Chorizo", "g"),
-        ("Ham Slices", "g"),
-        ("Salami", "g"),
-    ],
-    "Pantry Staples": [
-        ("All-Purpose Flour", "g"),
-        ("Whole Wheat Flour", "g"),
-        ("Bread Flour", "g"),
-        ("Almond Flour", "g"),
-        ("Cornmeal", "g"),
-        ("White Sugar", "g"),
-        ("Brown Sugar", "g"),
-        ("Powdered Sugar", "g"),
-        ("Baking Powder", "g"),
-        ("Baking Soda", "g"),
-        ("Active Dry Yeast", "g"),
-        ("Instant Yeast", "g"),
-        ("Panko Breadcrumbs", "g"),
-        ("Italian Breadcrumbs", "g"),
-        ("Rolled Oats", "g"),
-        ("Steel-Cut Oats", "g"),
-        ("Old-Fashioned Oats", "g"),
-        ("Cocoa Powder", "g"),
-        ("Chocolate Chips Dark", "g"),
-        ("Chocolate Chips Milk", "g"),
-        ("Peanut Butter Creamy", "g"),
-        ("Peanut Butter Crunchy", "g"),
-        ("Almond Butter", "g"),
-        ("Cashew Butter", "g"),
-        ("Tahini", "g"),
-        ("Sunflower Seed Butter", "g"),
-        ("Maple Syrup", "ml"),
-        ("Honey", "ml"),
-        ("Molasses", "ml"),
-        ("Agave Syrup", "ml"),
-        ("Vanilla Extract", "ml"),
-        ("Chia Seeds", "g"),
-        ("Flax Seeds", "g"),
-        ("Pumpkin Seeds", "g"),
-        ("Walnuts", "g"),
-        ("Almonds", "g"),
-        ("Pecans", "g"),
-        ("Hazelnuts", "g"),
-        ("Macadamia Nuts", "g"),
-        ("Pistachios", "g"),
-    ],
-    "Grains & Pasta": [
-        ("Spaghetti Pasta", "g"),
-        ("Penne Pasta", "g"),
-        ("Rigatoni Pasta", "g"),
-        ("Fusilli Pasta", "g"),
-        ("Farfalle Pasta", "g"),
-        ("Orzo Pasta", "g"),
-        ("Lasagna Sheets", "g"),
-        ("Linguine Pasta", "g"),
-        ("Angel Hair Pasta", "g"),
-        ("Rice Basmati", "g"),
-        ("Rice Jasmine", "g"),
-        ("Rice Arborio", "g"),
-        ("Brown Rice", "g"),
-        ("Wild Rice Blend", "g"),
-        ("Quinoa Tri-Color", "g"),
-        ("Couscous Pearl", "g"),
-        ("Bulgur Wheat", "g"),
-        ("Farro", "g"),
-        ("Barley Pearled", "g"),
-        ("Polenta", "g"),
-        ("Udon Noodles", "g"),
-        ("Soba Noodles", "g"),
-        ("Rice Vermicelli", "g"),
-        ("Ramen Noodles", "g"),
-        ("Tortillas Flour", "pcs"),
-        ("Tortillas Corn", "pcs"),
-        ("Pita Bread", "pcs"),
-        ("Naan Bread", "pcs"),
-        ("Sourdough Bread", "pcs"),
-    ],
-    "Spices & Herbs": [
-        ("Kosher Salt", "g"),
-        ("Sea Salt Flakes", "g"),
-        ("Black Peppercorns", "g"),
-        ("Ground Black Pepper", "g"),
-        ("White Pepper", "g"),
-        ("Smoked Paprika", "g"),
-        ("Sweet Paprika", "g"),
-        ("Ground Cumin", "g"),
-        ("Ground Coriander", "g"),
-        ("Turmeric Powder", "g"),
-        ("Curry Powder", "g"),
-        ("Chili Powder", "g"),
-        ("Garam Masala", "g"),
-        ("Italian Seasoning", "g"),
-        ("Dried Basil", "g"),
-        ("Dried Oregano", "g"),
-        ("Dried Thyme", "g"),
-        ("Dried Rosemary", "g"),
-        ("Dried Sage", "g"),
-        ("Crushed Red Pepper", "g"),
-        ("Chinese Five Spice", "g"),
-        ("Cayenne Pepper", "g"),
-        ("Ground Ginger", "g"),
-        ("Ground Cinnamon", "g"),
-        ("Cinnamon Sticks", "g"),
-        ("Ground Nutmeg", "g"),
-        ("Ground Cloves", "g"),
-        ("Cardamom Pods", "g"),
-        ("Bay Leaves", "g"),
-        ("Ground Allspice", "g"),
-        ("Sesame Seeds", "g"),
-    ],
-    "Canned & Jarred": [
-        ("Crushed Tomatoes", "g"),
-        ("Diced Tomatoes", "g"),
-        ("Tomato Sauce", "ml"),
-        ("Tomato Paste", "g"),
-        ("Fire Roasted Tomatoes", "g"),
-        ("Coconut Milk", "ml"),
-        ("Light Coconut Milk", "ml"),
-        ("Evaporated Milk", "ml"),
-        ("Sweetened Condensed Milk", "ml"),
-        ("Pumpkin Puree", "g"),
-        ("Black Beans Canned", "g"),
-        ("Kidney Beans Canned", "g"),
-        ("Chickpeas Canned", "g"),
-        ("Cannellini Beans Canned", "g"),
-        ("Corn Kernels", "g"),
-        ("Green Peas Canned", "g"),
-        ("Artichoke Hearts", "g"),
-        ("Hearts of Palm", "g"),
-        ("Roasted Red Peppers", "g"),
-        ("Olives Kalamata", "g"),
-        ("Olives Castelvetrano", "g"),
-        ("Pickled Jalapenos", "g"),
-        ("Salsa Verde Jar", "ml"),
-        ("Marinara Sauce", "ml"),
-        ("Arrabbiata Sauce", "ml"),
-        ("Pesto Sauce", "g"),
-        ("Sun-Dried Tomatoes", "g"),
-        ("Capers", "g"),
-        ("Anchovy Fillets", "g"),
-        ("Chicken Broth", "ml"),
-        ("Vegetable Broth", "ml"),
-        ("Beef Broth", "ml"),
-    ],
-    "Frozen": [
-        ("Frozen Peas", "g"),
-        ("Frozen Corn", "g"),
-        ("Frozen Spinach", "g"),
-        ("Frozen Broccoli", "g"),
-        ("Frozen Cauliflower Rice", "g"),
-        ("Frozen Mixed Berries", "g"),
-        ("Frozen Mango Chunks", "g"),
-        ("Frozen Pineapple", "g"),
-        ("Frozen Strawberries", "g"),
-        ("Frozen Blueberries", "g"),
-        ("Frozen Waffles", "pcs"),
-        ("Frozen Fries", "g"),
-        ("Frozen Edamame", "g"),
-        ("Frozen Meatballs", "g"),
-        ("Frozen Chicken Nuggets", "g"),
-        ("Frozen Pizza Dough", "g"),
-        ("Frozen Puff Pastry", "g"),
-        ("Frozen Pie Crust", "g"),
-        ("Frozen Shrimp", "g"),
-        ("Frozen Fish Sticks", "g"),
-    ],
-    "Condiments & Oils": [
-        ("Extra Virgin Olive Oil", "ml"),
-        ("Avocado Oil", "ml"),
-        ("Canola Oil", "ml"),
-        ("Sesame Oil", "ml"),
-        ("Vegetable Oil", "ml"),
-        ("Grapeseed Oil", "ml"),
-        ("Balsamic Vinegar", "ml"),
-        ("Apple Cider Vinegar", "ml"),
-        ("Rice Vinegar", "ml"),
-        ("Red Wine Vinegar", "ml"),
-        ("White Wine Vinegar", "ml"),
-        ("Soy Sauce", "ml"),
-        ("Tamari Sauce", "ml"),
-        ("Fish Sauce", "ml"),
-        ("Worcestershire Sauce", "ml"),
-        ("Dijon Mustard", "g"),
-        ("Whole Grain Mustard", "g"),
-        ("Ketchup", "g"),
-        ("Mayonnaise", "g"),
-        ("Sriracha", "g"),
-        ("Barbecue Sauce", "g"),
-        ("Hot Sauce", "g"),
-        ("Hoisin Sauce", "g"),
-        ("Teriyaki Sauce", "ml"),
-        ("Mirin", "ml"),
-        ("White Miso Paste", "g"),
-        ("Harissa Paste", "g"),
-        ("Chili Crisp", "g"),
-        ("Pomegranate Molasses", "ml"),
-        ("Tahini Sauce", "g"),
-    ],
-}
-
-
-def flatten_ingredients() -> List[dict]:
-    rows: List[dict] = []
-    idx = 1
-    for category, items in INGREDIENTS_BY_CATEGORY.items():
-        for name, unit in items:
-            rows.append(
-                {
-                    "id": idx,
-                    "name": name,
-                    "default_unit": unit,
-                    "category": category,
-                }
-            )
-            idx += 1
-    return rows
-
-
-INGREDIENTS = flatten_ingredients()
-
-
-# Recipes --------------------------------------------------------------------
-recipes_data = [
-    {
-        "name": "Classic Margherita Pizza",
-        "description": "Chewy crust topped with garlicky marinara, mozzarella, and fresh basil.",
-        "instructions": "Preheat oven to 250°C. Stretch dough, spread sauce, top with cheese and basil, bake 10 minutes until blistered.",
-        "cuisine": "Italian",
-        "favorite": True,
-        "ingredients": [
-            ("Frozen Pizza Dough", 350, "g", False),
-            ("Marinara Sauce", 120, "ml", False),
-            ("Mozzarella Cheese", 180, "g", False),
-            ("Parmesan Cheese", 20, "g", False),
-            ("Fresh Basil", 15, "g", False),
-            ("Extra Virgin Olive Oil", 10, "ml", False),
-            ("Garlic Bulb", 1, "pcs", True),
-        ],
-    },
-    {
-        "name": "Creamy Mushroom Risotto",
-        "description": "Arborio rice slowly cooked with broth, white wine, and sautéed mushrooms.",
-        "instructions": "Sauté mushrooms, toast rice with aromatics, ladle warm broth while stirring until creamy, finish with butter and cheese.",
-        "cuisine": "Italian",
-        "favorite": True,
-        "ingredients": [
-            ("Rice Arborio", 320, "g", False),
-            ("Chicken Broth", 900, "ml", False),
-            ("White Onion", 0.5, "pcs", False),
-            ("Garlic Bulb", 2, "pcs", False),
-            ("Cremini Mushroom", 200, "g", False),
-            ("Shiitake Mushroom", 120, "g", False),
-            ("Butter Unsalted", 40, "g", False),
-            ("Parmesan Cheese", 40, "g", False),
-            ("Extra Virgin Olive Oil", 15, "ml", False),
-            ("White Wine Vinegar", 15, "ml", True),
-            ("Fresh Parsley", 10, "g", True),
-        ],
-    },
-    {
-        "name": "Spicy Chickpea Stew",
-        "description": "Hearty tomato-based stew with chickpeas, greens, and warming spices.",
-        "instructions": "Bloom spices in oil, add aromatics, tomatoes, coconut milk, and chickpeas. Simmer 20 minutes, fold in greens.",
-        "cuisine": "Middle Eastern",
-        "favorite": False,
-        "ingredients": [
-            ("Chickpeas Canned", 480, "g", False),
-            ("Crushed Tomatoes", 400, "g", False),
-            ("Coconut Milk", 200, "ml", False),
-            ("Red Onion", 0.5, "pcs", False),
-            ("Garlic Bulb", 3, "pcs", False),
-            ("Ginger Root", 20, "g", False),
-            ("Smoked Paprika", 5, "g", False),
-            ("Ground Cumin", 6, "g", False),
-            ("Turmeric Powder", 4, "g", False),
-            ("Baby Spinach", 100, "g", False),
-            ("Fresh Cilantro", 10, "g", True),
-            ("Lemon", 0.5, "pcs", True),
-        ],
-    },
-    {
-        "name": "Lemon Herb Roast Chicken",
-        "description": "Bone-in chicken roasted with lemon, garlic, and rosemary over potatoes.",
-        "instructions": "Marinate chicken with oil, lemon, garlic, and herbs. Roast atop potatoes until skin is crisp and meat juicy.",
-        "cuisine": "Mediterranean",
-        "favorite": True,
-        "ingredients": [
-            ("Chicken Thigh", 800, "g", False),
-            ("Yukon Gold Potato", 4, "pcs", False),
-            ("Garlic Bulb", 4, "pcs", False),
-            ("Lemon", 1, "pcs", False),
-            ("Fresh Rosemary", 5, "g", False),
-            ("Fresh Thyme", 5, "g", False),
-            ("Extra Virgin Olive Oil", 30, "ml", False),
-            ("Kosher Salt", 6, "g", False),
-            ("Ground Black Pepper", 4, "g", False),
-        ],
-    },
-    {
-        "name": "Veggie Stir Fry",
-        "description": "Colorful vegetables seared hot and tossed with a ginger garlic sauce.",
-        "instructions": "Stir fry vegetables in batches, whisk sauce with soy, ginger, and garlic, toss together and serve over rice.",
-        "cuisine": "Asian",
-        "favorite": False,
-        "ingredients": [
-            ("Broccoli Florets", 150, "g", False),
-            ("Red Bell Pepper", 1, "pcs", False),
-            ("Carrot", 1, "pcs", False),
-            ("Sugar Snap Peas", 120, "g", False),
-        ],
-    },
-    {
-        "name": "Avocado Kale Salad",
-        "description": "Massaged kale tossed with creamy avocado, crunchy seeds, and lemon mustard dressing.",
-        "instructions": "Massage kale with lemon and oil, fold in vegetables, avocado, seeds, and drizzle honey mustard vinaigrette.",
-        "cuisine": "American",
-        "favorite": False,
-        "ingredients": [
-            ("Kale Leaves", 120, "g", False),
-            ("Avocado", 1, "pcs", False),
-            ("Cherry Tomato", 8, "pcs", False),
-            ("English Cucumber", 0.5, "pcs", False),
-            ("Pumpkin Seeds", 20, "g", False),
-            ("Fresh Parsley", 8, "g", True),
-            ("Extra Virgin Olive Oil", 20, "ml", False),
-            ("Lemon", 0.5, "pcs", False),
-            ("Dijon Mustard", 8, "g", False),
-            ("Honey", 10, "ml", False),
-        ],
-    },
-    {
-        "name": "Weeknight Beef Tacos",
-        "description": "Seasoned ground beef tucked into warm tortillas with crisp toppings.",
-        "instructions": "Brown beef with spices and aromatics, warm tortillas, assemble with toppings and serve immediately.",
-        "cuisine": "Mexican",
-        "favorite": True,
-        "ingredients": [
-            ("Ground Beef 80-20", 450, "g", False),
-            ("Yellow Onion", 0.5, "pcs", False),
-            ("Garlic Bulb", 3, "pcs", False),
-            ("Chili Powder", 8, "g", False),
-            ("Ground Cumin", 6, "g", False),
-            ("Smoked Paprika", 4, "g", False),
-            ("Tortillas Corn", 8, "pcs", False),
-            ("Cheddar Cheese", 100, "g", False),
-            ("Romaine Lettuce", 0.25, "pcs", True),
-            ("Salsa Verde Jar", 60, "ml", False),
-            ("Sour Cream", 60, "g", True),
-            ("Lime", 1, "pcs", True),
-        ],
-    },
-    {
-        "name": "Thai Coconut Veggie Curry",
-        "description": "Velvety coconut curry loaded with chicken, colorful vegetables, and herbs.",
-        "instructions": "Sauté aromatics, add curry spices, simmer coconut milk with vegetables and chicken until tender, finish with lime.",
-        "cuisine": "Thai",
-        "favorite": False,
-        "ingredients": [
-            ("Chicken Breast", 400, "g", False),
-            ("Red Bell Pepper", 1, "pcs", False),
-            ("Carrot", 1, "pcs", False),
-            ("Broccoli Florets", 120, "g", False),
-            ("Coconut Milk", 400, "ml", False),
-            ("Red Onion", 0.5, "pcs", False),
-            ("Garlic Bulb", 3, "pcs", False),
-            ("Ginger Root", 15, "g", False),
-            ("Curry Powder", 8, "g", False),
-            ("Fish Sauce", 10, "ml", False),
-            ("Lime", 1, "pcs", False),
-            ("Fresh Cilantro", 10, "g", True),
-            ("Rice Jasmine", 200, "g", False),
-        ],
-    },
-    {
-        "name": "Garlic Butter Shrimp Pasta",
-        "description": "Tender spaghetti coated in garlicky butter sauce with juicy shrimp.",
-        "instructions": "Cook pasta, sear shrimp with butter and garlic, toss together with lemon juice and parsley.",
-        "cuisine": "Italian",
-        "favorite": True,
-        "ingredients": [
-            ("Spaghetti Pasta", 300, "g", False),
-            ("Shrimp Large", 300, "g", False),
-            ("Butter Unsalted", 60, "g", False),
-            ("Garlic Bulb", 4, "pcs", False),
-            ("Lemon", 1, "pcs", False),
-            ("Fresh Parsley", 12, "g", False),
-            ("Parmesan Cheese", 30, "g", False),
-            ("Crushed Red Pepper", 2, "g", True),
-        ],
-    },
-    {
-        "name": "Quinoa Buddha Bowl",
-        "description": "Roasted vegetables, crispy chickpeas, and greens over fluffy quinoa.",
-        "instructions": "Roast sweet potatoes and broccoli, crisp chickpeas, assemble bowl with quinoa, greens, and tahini drizzle.",
-        "cuisine": "Fusion",
-        "favorite": False,
-        "ingredients": [
-            ("Quinoa Tri-Color", 200, "g", False),
-            ("Chickpeas Canned", 240, "g", False),
-            ("Sweet Potato", 1, "pcs", False),
-            ("Broccoli Florets", 120, "g", False),
-            ("Baby Spinach", 80, "g", False),
-            ("Avocado", 1, "pcs", False),
-            ("Tahini Sauce", 40, "g", False),
-            ("Lemon", 0.5, "pcs", False),
-            ("Smoked Paprika", 3, "g", True),
-        ],
-    },
-    {
-        "name": "Banana Oat Pancakes",
-        "description": "Naturally sweet pancakes blended from oats, banana, and almond milk.",
-        "instructions": "Blend batter until smooth, cook on greased skillet until golden, serve with maple syrup.",
-        "cuisine": "Breakfast",
-        "favorite": False,
-        "ingredients": [
-            ("Banana", 2, "pcs", False),
-            ("Rolled Oats", 140, "g", False),
-            ("Almond Milk", 240, "ml", False),
-            ("Large Eggs", 2, "pcs", False),
-            ("Baking Powder", 6, "g", False),
-            ("Maple Syrup", 40, "ml", True),
-            ("Vanilla Extract", 5, "ml", False),
-            ("Cinnamon Sticks", 2, "g", True),
-        ],
-    },
-    {
-        "name": "Caprese Pasta Salad",
-        "description": "Chilled fusilli with tomatoes, mozzarella, basil, and balsamic glaze.",
-        "instructions": "Cook pasta al dente, toss with tomatoes, cheese, greens, and vinaigrette, chill before serving.",
-        "cuisine": "Italian",
-        "favorite": False,
-        "ingredients": [
-            ("Fusilli Pasta", 250, "g", False),
-            ("Cherry Tomato", 12, "pcs", False),
-            ("Mozzarella Cheese", 150, "g", False),
-            ("Fresh Basil", 15, "g", False),
-            ("Baby Spinach", 50, "g", True),
-            ("Extra Virgin Olive Oil", 30, "ml", False),
-            ("Balsamic Vinegar", 15, "ml", False),
-            ("Kosher Salt", 4, "g", False),
-        ],
-    },
-    {
-        "name": "Mediterranean Farro Bowl",
-        "description": "Nutty farro tossed with crunchy vegetables, feta, and lemon dressing.",
-        "instructions": "Simmer farro until tender, fold in chopped vegetables and vinaigrette, top with feta.",
-        "cuisine": "Mediterranean",
-        "favorite": False,
-        "ingredients": [
-            ("Farro", 220, "g", False),
-            ("English Cucumber", 0.5, "pcs", False),
-            ("Cherry Tomato", 10, "pcs", False),
-            ("Olives Kalamata", 60, "g", False),
-            ("Feta Cheese", 80, "g", False),
-            ("Red Onion", 0.25, "pcs", False),
-            ("Fresh Parsley", 10, "g", False),
-            ("Lemon", 0.5, "pcs", False),
-            ("Extra Virgin Olive Oil", 25, "ml", False),
-        ],
-    },
-    {
-        "name": "Hearty Lentil Soup",
-        "description": "Comforting bowl of lentils simmered with vegetables and herbs.",
-        "instructions": "Sweat aromatics, add lentils and tomatoes, cover with broth and simmer until tender.",
-        "cuisine": "Middle Eastern",
-        "favorite": True,
-        "ingredients": [
-            ("Lentils Green", 220, "g", False),
-            ("Carrot", 1, "pcs", False),
-            ("Celery", 1, "pcs", False),
-            ("Yellow Onion", 0.5, "pcs", False),
-            ("Garlic Bulb", 3, "pcs", False),
-            ("Crushed Tomatoes", 200, "g", False),
-            ("Vegetable Broth", 900, "ml", False),
-            ("Fresh Thyme", 5, "g", False),
-            ("Bay Leaves", 2, "g", False),
-            ("Kosher Salt", 5, "g", False),
-            ("Extra Virgin Olive Oil", 20, "ml", False),
-        ],
-    },
-    {
-        "name": "Shakshuka",
-        "description": "Eggs poached in spicy tomato pepper sauce.",
-        "instructions": "Cook peppers with onions and spices, add tomatoes, simmer, crack eggs and bake until set.",
-        "cuisine": "Middle Eastern",
-        "favorite": True,
-        "ingredients": [
-            ("Diced Tomatoes", 400, "g", False),
-            ("Red Bell Pepper", 1, "pcs", False),
-            ("Yellow Onion", 0.5, "pcs", False),
-            ("Garlic Bulb", 3, "pcs", False),
-            ("Smoked Paprika", 6, "g", False),
-            ("Ground Cumin", 5, "g", False),
-            ("Cayenne Pepper", 2, "g", True),
-            ("Extra Virgin Olive Oil", 20, "ml", False),
-            ("Large Eggs", 4, "pcs", False),
-            ("Fresh Cilantro", 8, "g", True),
-        ],
-    },
-    {
-        "name": "BBQ Pulled Chicken Sandwiches",
-        "description": "Slow-simmered chicken mixed with tangy barbecue sauce on toasted bread.",
-        "instructions": "Cook chicken with sauce and aromatics until shreddable, pile onto butter-toasted sourdough.",
-        "cuisine": "American",
-        "favorite": False,
-        "ingredients": [
-            ("Chicken Breast", 500, "g", False),
-            ("Barbecue Sauce", 200, "g", False),
-            ("Yellow Onion", 0.5, "pcs", False),
-            ("Garlic Bulb", 3, "pcs", False),
-            ("Brown Sugar", 20, "g", False),
-            ("Apple Cider Vinegar", 20, "ml", False),
-            ("Butter Salted", 20, "g", False),
-            ("Sourdough Bread", 4, "pcs", False),
-        ],
-    },
-    {
-        "name": "Teriyaki Salmon Rice Bowl",
-        "description": "Glazed salmon served over jasmine rice with broccoli and sesame.",
-        "instructions": "Reduce teriyaki sauce, roast salmon, steam rice and broccoli, assemble with sesame garnish.",
-        "cuisine": "Japanese",
-        "favorite": True,
-        "ingredients": [
-            ("Salmon Fillet", 400, "g", False),
-            ("Soy Sauce", 60, "ml", False),
-            ("Honey", 30, "ml", False),
-            ("Garlic Bulb", 2, "pcs", False),
-            ("Ginger Root", 15, "g", False),
-            ("Sesame Oil", 15, "ml", False),
-            ("Rice Jasmine", 220, "g", False),
-            ("Broccoli Florets", 150, "g", False),
-            ("Sesame Seeds", 8, "g", False),
-        ],
-    },
-    {
-        "name": "Pesto Zoodle Bowl",
-        "description": "Light zucchini noodles tossed with pesto and burst tomatoes.",
-        "instructions": "Spiralize zucchini, quickly sauté, toss with pesto and warm tomatoes, garnish with basil.",
-        "cuisine": "Italian",
-        "favorite": False,
-        "ingredients": [
-            ("Zucchini", 2, "pcs", False),
-            ("Pesto Sauce", 90, "g", False),
-            ("Cherry Tomato", 10, "pcs", False),
-            ("Parmesan Cheese", 25, "g", False),
-            ("Fresh Basil", 10, "g", False),
-            ("Extra Virgin Olive Oil", 15, "ml", False),
-            ("Garlic Bulb", 2, "pcs", False),
-        ],
-    },
-    {
-        "name": "Garden Veggie Omelette",
-        "description": "Fluffy omelette packed with spinach, peppers, mushrooms, and cheddar.",
-        "instructions": "Sauté vegetables, whisk eggs with milk, cook gently, fold with cheese.",
-        "cuisine": "Breakfast",
-        "favorite": False,
-        "ingredients": [
-            ("Large Eggs", 3, "pcs", False),
-            ("Whole Milk", 40, "ml", False),
-            ("Baby Spinach", 40, "g", False),
-            ("Cremini Mushroom", 80, "g", False),
-            ("Red Bell Pepper", 0.5, "pcs", False),
-            ("Cheddar Cheese", 60, "g", False),
-            ("Green Onion", 1, "pcs", False),
-            ("Butter Unsalted", 10, "g", False),
-        ],
-    },
-    {
-        "name": "Falafel Pita Wrap",
-        "description": "Crispy baked falafel tucked into warm pita with tahini sauce.",
-        "instructions": "Soak chickpeas, blend with herbs and aromatics, bake or fry, assemble wrap with veggies.",
-        "cuisine": "Middle Eastern",
-        "favorite": True,
-        "ingredients": [
-            ("Chickpeas Dried", 200, "g", False),
-            ("Fresh Parsley", 15, "g", False),
-            ("Fresh Cilantro", 15, "g", False),
-            ("Garlic Bulb", 4, "pcs", False),
-            ("Ground Cumin", 6, "g", False),
-            ("Ground Coriander", 5, "g", False),
-            ("Baking Powder", 4, "g", False),
-            ("Tahini Sauce", 50, "g", False),
-            ("Lemon", 1, "pcs", False),
-            ("Pita Bread", 4, "pcs", False),
-            ("Romaine Lettuce", 0.25, "pcs", True),
-        ],
-    },
-    {
-        "name": "Butternut Squash Bisque",
-        "description": "Silky roasted squash soup finished with coconut milk and herbs.",
-        "instructions": "Roast squash with aromatics, simmer with broth and coconut milk, blend until smooth.",
-        "cuisine": "American",
-        "favorite": False,
-        "ingredients": [
-            ("Butternut Squash", 1, "pcs", False),
-            ("Carrot", 1, "pcs", False),
-            ("Yellow Onion", 0.5, "pcs", False),
-            ("Garlic Bulb", 3, "pcs", False),
-            ("Vegetable Broth", 900, "ml", False),
-            ("Coconut Milk", 200, "ml", False),
-            ("Fresh Sage", 5, "g", False),
-            ("Fresh Thyme", 4, "g", False),
-            ("Extra Virgin Olive Oil", 20, "ml", False),
-        ],
-    },
-    {
-        "name": "Greek Yogurt Berry Parfait",
-        "description": "Layered yogurt, berries, nuts, and honey for a quick breakfast.",
-        "instructions": "Layer yogurt with thawed berries, drizzle honey, sprinkle nuts and seeds.",
-        "cuisine": "Breakfast",
-        "favorite": False,
-        "ingredients": [
-            ("Greek Yogurt", 200, "g", False),
-            ("Honey", 20, "ml", False),
-            ("Frozen Mixed Berries", 120, "g", False),
-            ("Walnuts", 25, "g", False),
-            ("Chia Seeds", 10, "g", False),
-            ("Vanilla Extract", 4, "ml", True),
-        ],
-    },
-    {
-        "name": "Tofu Miso Ramen",
-        "description": "Comforting ramen bowl with seared tofu, miso broth, and greens.",
-        "instructions": "Simmer broth with aromatics and miso, cook noodles, sear tofu, assemble bowls with toppings.",
-        "cuisine": "Japanese",
-        "favorite": False,
-        "ingredients": [
-            ("Ramen Noodles", 2, "pcs", False),
-            ("Tofu Firm", 300, "g", False),
-            ("Vegetable Broth", 900, "ml", False),
-            ("Soy Sauce", 40, "ml", False),
-            ("White Miso Paste", 40, "g", False),
-            ("Sesame Oil", 10, "ml", False),
-            ("Garlic Bulb", 3, "pcs", False),
-            ("Ginger Root", 15, "g", False),
-            ("Baby Spinach", 60, "g", False),
-            ("Green Onion", 2, "pcs", False),
-            ("Sesame Seeds", 6, "g", False),
-        ],
-    },
-    {
-        "name": "Chewy Chocolate Chip Cookies",
-        "description": "Bakery-style cookies with crisp edges and gooey centers.",
-        "instructions": "Cream butter with sugars, fold in dry ingredients, chill dough, bake until golden.",
-        "cuisine": "Dessert",
-        "favorite": True,
-        "ingredients": [
-            ("All-Purpose Flour", 260, "g", False),
-            ("Brown Sugar", 150, "g", False),
-            ("White Sugar", 100, "g", False),
-            ("Butter Unsalted", 150, "g", False),
-            ("Large Eggs", 2, "pcs", False),
-            ("Vanilla Extract", 10, "ml", False),
-            ("Baking Soda", 6, "g", False),
-            ("Chocolate Chips Dark", 200, "g", False),
-            ("Kosher Salt", 4, "g", False),
-        ],
-    },
-    {
-        "name": "Overnight Blueberry Oats",
-        "description": "No-cook oats soaked overnight with almond milk and blueberries.",
-        "instructions": "Combine oats with milk, seeds, sweetener, rest overnight, top with fruit in morning.",
-        "cuisine": "Breakfast",
-        "favorite": False,
-        "ingredients": [
-            ("Rolled Oats", 90, "g", False),
-            ("Almond Milk", 240, "ml", False),
-            ("Chia Seeds", 12, "g", False),
-            ("Maple Syrup", 20, "ml", False),
-            ("Blueberries", 80, "g", False),
-            ("Vanilla Extract", 4, "ml", True),
-            ("Greek Yogurt", 60, "g", True),
-        ],
-    },
-    {
-        "name": "Stuffed Bell Peppers",
-        "description": "Peppers filled with flavorful turkey, rice, beans, and cheese.",
-        "instructions": "Par-bake peppers, cook filling with turkey and rice, stuff, top with cheese, bake until bubbly.",
-        "cuisine": "American",
-        "favorite": False,
-        "ingredients": [
-            ("Red Bell Pepper", 4, "pcs", False),
-            ("Ground Turkey", 400, "g", False),
-            ("Rice Basmati", 150, "g", False),
-            ("Diced Tomatoes", 200, "g", False),
-            ("Black Beans Canned", 200, "g", False),
-            ("Corn Kernels", 100, "g", False),
-            ("Yellow Onion", 0.5, "pcs", False),
-            ("Garlic Bulb", 3, "pcs", False),
-            ("Cheddar Cheese", 120, "g", False),
-            ("Ground Cumin", 5, "g", False),
-            ("Smoked Paprika", 4, "g", False),
-        ],
-    },
-    {
-        "name": "Eggplant Parmesan Bake",
-        "description": "Layered breaded eggplant with marinara, basil, and melted cheese.",
-        "instructions": "Bread eggplant slices, fry or bake, layer with sauce and cheese, bake until bubbling.",
-        "cuisine": "Italian",
-        "favorite": True,
-        "ingredients": [
-            ("Eggplant", 2, "pcs", False),
-            ("All-Purpose Flour", 80, "g", False),
-            ("Large Eggs", 2, "pcs", False),
-            ("Panko Breadcrumbs", 120, "g", False),
-            ("Marinara Sauce", 300, "ml", False),
-            ("Mozzarella Cheese", 200, "g", False),
-            ("Parmesan Cheese", 60, "g", False),
-            ("Extra Virgin Olive Oil", 40, "ml", False),
-            ("Fresh Basil", 12, "g", False),
-        ],
-    },
-    {
-        "name": "Baja Shrimp Tacos",
-        "description": "Spiced shrimp with crunchy slaw, avocado, and creamy sauce.",
-        "instructions": "Season and sear shrimp, build tacos with slaw, avocado, crema, and pickled jalapeños.",
-        "cuisine": "Mexican",
-        "favorite": True,
-        "ingredients": [
-            ("Shrimp Large", 320, "g", False),
-            ("Chili Powder", 6, "g", False),
-            ("Smoked Paprika", 4, "g", False),
-            ("Garlic Bulb", 2, "pcs", False),
-            ("Lime", 1, "pcs", False),
-            ("Tortillas Corn", 8, "pcs", False),
-            ("Red Cabbage", 0.5, "pcs", False),
-            ("Avocado", 1, "pcs", False),
-            ("Sour Cream", 80, "g", False),
-            ("Pickled Jalapenos", 20, "g", True),
-        ],
-    }
-]
-
+PERISHABLE_CATEGORIES = {"Produce", "Dairy & Eggs", "Proteins"}
+# "text" is docs/db-schema.sql as written; "compact" dictionary-encodes units,
+# categories and statuses (see compact_layout.py).
+LAYOUTS = ("text", "compact")
 
-random.seed(42)
-NOW = dt.datetime.now()
 
-INGREDIENT_LOOKUP = {row["name"]: row for row in INGREDIENTS}
-PERISHABLE_CATEGORIES = {"Produce", "Dairy & Eggs", "Proteins"}
+def __getattr__(name: str):
+    # Catalog constants kept for older callers; resolved on first access only.
+    if name == "INGREDIENTS":
+        return catalog.default().ingredients
+    if name == "INGREDIENT_LOOKUP":
+        return catalog.default().lookup
+    if name == "INGREDIENTS_BY_CATEGORY":
+        return catalog.default().by_category
+    if name == "recipes_data":
+        return catalog.default().recipes
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def iso(ts: dt.datetime) -> str:
@@ -960,37 +90,56 @@ def build_insert(table: str, columns: List[str], rows: List[dict]) -> List[str]:
     return lines
 
 
-def choose_quantity(unit: str) -> float:
+def choose_quantity(rng: random.Random, unit: str) -> float:
     if unit == "pcs":
-        return random.randint(1, 12)
+        return rng.randint(1, 12)
     if unit == "ml":
-        return round(random.uniform(100, 1500), 1)
-    return round(random.uniform(50, 1200), 1)
+        return round(rng.uniform(100, 1500), 1)
+    return round(rng.uniform(50, 1200), 1)
+
+
+TABLE_COLUMNS: Dict[str, List[str]] = {
+    "Ingredients": ["id", "name", "default_unit", "category"],
+    "Inventory": ["ingredient_id", "quantity", "unit", "expires_at", "updated_at"],
+    "ShoppingItems": ["id", "ingredient_id", "quantity", "unit", "status", "notes", "created_at"],
+    "Recipes": ["id", "name", "description", "instructions", "cuisine", "created_at", "favorite"],
+    "RecipeIngredients": ["recipe_id", "ingredient_id", "quantity", "unit", "optional"],
+    "MealPlans": ["id", "recipe_id", "scheduled_for", "servings"],
+    "MealPlanRules": meal_calendar.RULE_COLUMNS,
+    "CookHistory": ["id", "recipe_id", "cooked_at", "notes"],
+    "InventoryEvents": inventory_log.EVENT_COLUMNS,
+    "InventoryCheckpoints": ["id", "taken_at", "last_event_id", "is_base"],
+    "InventoryCheckpointRows": ["checkpoint_id", "ingredient_id", "quantity", "unit", "expires_at"],
+}
 
 
-def generate_inventory_rows(count: int = 95) -> List[dict]:
-    sample = random.sample(INGREDIENTS, count)
+def generate_inventory_rows(
+    rng: random.Random, now: dt.datetime, count: int = 95, ingredients: List[dict] | None = None
+) -> List[dict]:
+    sample = rng.sample(catalog.default().ingredients if ingredients is None else ingredients, count)
     rows = []
     for item in sample:
         expires = (
-            iso_date(NOW + dt.timedelta(days=random.randint(2, 30)))
+            iso_date(now + dt.timedelta(days=rng.randint(2, 30)))
             if item["category"] in PERISHABLE_CATEGORIES
             else None
         )
         rows.append(
             {
                 "ingredient_id": item["id"],
-                "quantity": choose_quantity(item["default_unit"]),
+                "quantity": choose_quantity(rng, item["default_unit"]),
                 "unit": item["default_unit"],
                 "expires_at": expires,
-                "updated_at": iso(NOW - dt.timedelta(days=random.randint(0, 7))),
+                "updated_at": iso(now - dt.timedelta(days=rng.randint(0, 7))),
             }
         )
     return rows
 
 
-def generate_shopping_rows(count: int = 28) -> List[dict]:
-    sample = random.sample(INGREDIENTS, count)
+def generate_shopping_rows(
+    rng: random.Random, now: dt.datetime, count: int = 28, ingredients: List[dict] | None = None
+) -> List[dict]:
+    sample = rng.sample(catalog.default().ingredients if ingredients is None else ingredients, count)
     statuses = ["pending", "pending", "pending", "bought", "skipped"]
     notes_pool = [
         "Organic preferred",
@@ -1001,25 +150,33 @@ def generate_shopping_rows(count: int = 28) -> List[dict]:
     ]
     rows = []
     for idx, item in enumerate(sample, start=1):
-        note = random.choice(notes_pool) if random.random() < 0.5 else None
+        note = rng.choice(notes_pool) if rng.random() < 0.5 else None
         rows.append(
             {
                 "id": idx,
                 "ingredient_id": item["id"],
-                "quantity": choose_quantity(item["default_unit"]),
+                "quantity": choose_quantity(rng, item["default_unit"]),
                 "unit": item["default_unit"],
-                "status": random.choice(statuses),
+                "status": rng.choice(statuses),
                 "notes": note,
-                "created_at": iso(NOW - dt.timedelta(days=random.randint(0, 7))),
+                "created_at": iso(now - dt.timedelta(days=rng.randint(0, 7))),
             }
         )
     return rows
 
 
-def generate_recipe_rows() -> tuple[List[dict], List[dict]]:
+def generate_recipe_rows(
+    rng: random.Random,
+    now: dt.datetime,
+    recipes: List[dict] | None = None,
+    lookup: Dict[str, dict] | None = None,
+) -> tuple[List[dict], List[dict]]:
+    recipes = catalog.default().recipes if recipes is None else recipes
+    lookup = catalog.default().lookup if lookup is None else lookup
     recipe_rows: List[dict] = []
     link_rows: List[dict] = []
-    for idx, recipe in enumerate(recipes_data, start=1):
+    unknown: List[str] = []
+    for idx, recipe in enumerate(recipes, start=1):
         recipe_rows.append(
             {
                 "id": idx,
@@ -1027,146 +184,426 @@ def generate_recipe_rows() -> tuple[List[dict], List[dict]]:
                 "description": recipe["description"],
                 "instructions": recipe["instructions"],
                 "cuisine": recipe["cuisine"],
-                "created_at": iso(NOW - dt.timedelta(days=random.randint(20, 200))),
+                "created_at": iso(now - dt.timedelta(days=rng.randint(20, 200))),
                 "favorite": 1 if recipe["favorite"] else 0,
             }
         )
         for ingredient_name, quantity, unit, optional in recipe["ingredients"]:
-            try:
-                ingredient_id = INGREDIENT_LOOKUP[ingredient_name]["id"]
-            except KeyError as exc:
-                raise KeyError(f"Unknown ingredient '{ingredient_name}' in recipe {recipe['name']}") from exc
+            item = lookup.get(ingredient_name)
+            if item is None:
+                unknown.append(f"'{ingredient_name}' in recipe {recipe['name']}")
+                continue
             link_rows.append(
                 {
                     "recipe_id": idx,
-                    "ingredient_id": ingredient_id,
+                    "ingredient_id": item["id"],
                     "quantity": quantity,
                     "unit": unit,
                     "optional": 1 if optional else 0,
                 }
             )
+    if unknown:
+        raise KeyError(f"Unknown ingredients ({len(unknown)}): " + "; ".join(unknown))
     return recipe_rows, link_rows
 
 
-def generate_meal_plans(recipe_ids: List[int], count: int = 10) -> List[dict]:
+def generate_meal_plans(rng: random.Random, now: dt.datetime, recipe_ids: List[int], count: int = 10) -> List[dict]:
     rows = []
     for idx in range(1, count + 1):
         rows.append(
             {
                 "id": idx,
-                "recipe_id": random.choice(recipe_ids),
-                "scheduled_for": iso(NOW + dt.timedelta(days=random.randint(1, 14))),
-                "servings": random.randint(2, 6),
+                "recipe_id": rng.choice(recipe_ids),
+                "scheduled_for": iso(now + dt.timedelta(days=rng.randint(1, 14))),
+                "servings": rng.randint(2, 6),
             }
         )
     return rows
 
 
-def generate_cook_history(recipe_ids: List[int], count: int = 14) -> List[dict]:
-    comments = [
-        "Family favorite",
-        "Add more spice next time",
-        "Double batch worked great",
-        "Kids loved it",
-        "Serve with salad",
-        "Try whole wheat pasta next time",
-    ]
+PLAN_TIMES = ("08:00:00", "12:30:00", "18:30:00", "19:30:00")
+
+
+def generate_meal_plan_rules(
+    rng: random.Random, now: dt.datetime, recipe_ids: List[int], count: int = 10
+) -> List[dict]:
+    """Recurring plans started over the two years before ``now``; mostly weekly, about a third open-ended."""
     rows = []
     for idx in range(1, count + 1):
+        starts = now + dt.timedelta(days=rng.randint(-730, 60))
+        kind = rng.random()
+        if kind < 0.6:
+            freq, every = "weekly", rng.choice((1, 1, 1, 2, 2, 3))
+            weekdays = sum(1 << day for day in rng.sample(range(7), rng.choice((1, 1, 1, 2, 3))))
+        elif kind < 0.85:
+            freq, every, weekdays = "monthly", rng.choice((1, 1, 2, 3)), 0
+        else:
+            freq, every, weekdays = "daily", rng.randint(3, 14), 0
+        ends = None if rng.random() < 0.35 else starts + dt.timedelta(days=rng.randint(28, 540))
         rows.append(
             {
                 "id": idx,
-                "recipe_id": random.choice(recipe_ids),
-                "cooked_at": iso(NOW - dt.timedelta(days=random.randint(1, 45))),
-                "notes": random.choice(comments),
+                "recipe_id": rng.choice(recipe_ids),
+                "starts_on": iso_date(starts),
+                "ends_on": iso_date(ends) if ends else None,
+                "freq": freq,
+                "every": every,
+                "weekdays": weekdays,
+                "time_of_day": rng.choice(PLAN_TIMES),
+                "servings": rng.randint(2, 6),
             }
         )
     return rows
 
 
-def write_sql():
-    inventory_rows = generate_inventory_rows()
-    shopping_rows = generate_shopping_rows()
-    recipe_rows, recipe_ingredients = generate_recipe_rows()
+COOK_COMMENTS = [
+    "Family favorite",
+    "Add more spice next time",
+    "Double batch worked great",
+    "Kids loved it",
+    "Serve with salad",
+    "Try whole wheat pasta next time",
+]
+
+
+def generate_cook_history(rng: random.Random, now: dt.datetime, recipe_ids: List[int], count: int = 14) -> List[dict]:
+    comments = COOK_COMMENTS
+    rows = []
+    for idx in range(1, count + 1):
+        rows.append(
+            {
+                "id": idx,
+                "recipe_id": rng.choice(recipe_ids),
+                "cooked_at": iso(now - dt.timedelta(days=rng.randint(1, 45))),
+                "notes": rng.choice(comments),
+            }
+        )
+    return rows
+
+
+def poisson(rng: random.Random, mean: float) -> int:
+    # Knuth's method; fine for the small per-day means used here.
+    limit, count, product = math.exp(-mean), 0, rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def generate_seasonal_cook_history(
+    rng: random.Random, now: dt.datetime, recipe_ids: List[int], years: int, cooks_per_day: float = 1.5
+) -> List[dict]:
+    """Multi-year cook log with popularity skew, per-recipe seasons and busier weekends."""
+    # Each recipe gets a Zipf-like popularity, a peak month and how strongly it
+    # follows the season (soups in winter, salads in summer, staples all year).
+    ranked = rng.sample(recipe_ids, len(recipe_ids))
+    popularity = {recipe_id: 1.0 / rank ** 0.8 for rank, recipe_id in enumerate(ranked, start=1)}
+    peaks = {recipe_id: (rng.randrange(12), rng.uniform(0.0, 0.9)) for recipe_id in recipe_ids}
+    cum_weights = []
+    for month in range(12):
+        total, weights = 0.0, []
+        for recipe_id in recipe_ids:
+            peak, amplitude = peaks[recipe_id]
+            total += popularity[recipe_id] * (1 + amplitude * math.cos(2 * math.pi * (month - peak) / 12))
+            weights.append(total)
+        cum_weights.append(weights)
+
+    rows = []
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    for offset in range(365 * years, 0, -1):
+        day = today - dt.timedelta(days=offset)
+        mean = cooks_per_day * (1.3 if day.weekday() >= 4 else 1.0)
+        count = poisson(rng, mean)
+        if not count:
+            continue
+        picks = rng.choices(recipe_ids, cum_weights=cum_weights[day.month - 1], k=count)
+        for recipe_id in picks:
+            rows.append(
+                {
+                    "recipe_id": recipe_id,
+                    "cooked_at": iso(day + dt.timedelta(minutes=rng.randint(11 * 60, 21 * 60))),
+                    "notes": rng.choice(COOK_COMMENTS) if rng.random() < 0.2 else None,
+                }
+            )
+    rows.sort(key=lambda row: row["cooked_at"])
+    for idx, row in enumerate(rows, start=1):
+        row["id"] = idx
+    return rows
+
+
+def generate_inventory_events(
+    rng: random.Random, inventory_rows: List[dict], history_days: int = 45
+) -> List[dict]:
+    """Restock-then-use history per pantry row, ending exactly at its current quantity and updated_at."""
+    events = []
+    for item in inventory_rows:
+        unit = item["unit"]
+        end = dt.datetime.strptime(item["updated_at"], "%Y-%m-%d %H:%M:%S")
+        start = end - dt.timedelta(days=rng.randint(3, history_days), seconds=rng.randint(0, 86_399))
+        if unit == "pcs":
+            uses = [rng.randint(1, 3) for _ in range(rng.randint(1, 5))]
+        else:
+            uses = [round(rng.uniform(0.05, 0.3) * max(item["quantity"], 50), 1) for _ in range(rng.randint(1, 5))]
+        times = sorted(rng.uniform(0, (end - start).total_seconds()) for _ in range(len(uses) - 1))
+        quantity = round(item["quantity"] + sum(uses), 1)
+        history = [(start, "restock", quantity, quantity)]
+        for use, offset in zip(uses, times + [None]):
+            at = end if offset is None else start + dt.timedelta(seconds=int(offset))
+            after = item["quantity"] if offset is None else round(quantity - use, 1)
+            history.append((at, "use", round(after - quantity, 1), after))
+            quantity = after
+        for at, kind, delta, after in history:
+            events.append(
+                {
+                    "ingredient_id": item["ingredient_id"],
+                    "occurred_at": iso(at),
+                    "kind": kind,
+                    "delta": delta,
+                    "quantity": after,
+                    "unit": unit,
+                    "expires_at": item["expires_at"],
+                }
+            )
+    # The log is appended in time order, so ids follow occurred_at.
+    events.sort(key=lambda event: event["occurred_at"])
+    for idx, event in enumerate(events, start=1):
+        event["id"] = idx
+    return events
+
+
+# Scaled datasets -------------------------------------------------------------
+# Copy N of a catalog entry is named "<name> #N"; copy 1 keeps the original name,
+# so scale=1 reproduces the regular seed data exactly.
+def variant_name(name: str, copy: int) -> str:
+    return name if copy == 1 else f"{name} #{copy}"
+
+
+def scale_ingredients(scale: int) -> List[dict]:
+    base = catalog.default().ingredients
+    if scale <= 1:
+        return base
+    rows: List[dict] = []
+    for copy in range(1, scale + 1):
+        for item in base:
+            rows.append(
+                {
+                    "id": len(rows) + 1,
+                    "name": variant_name(item["name"], copy),
+                    "default_unit": item["default_unit"],
+                    "category": item["category"],
+                }
+            )
+    return rows
+
+
+def popular_copy(rng: random.Random, scale: int) -> int:
+    # Heavy-tailed pick: low-numbered copies are shared by many recipes, like
+    # staple ingredients are in a real catalog.
+    return min(int(rng.paretovariate(1.2)), scale)
+
+
+def scale_recipes(rng: random.Random, scale: int) -> List[dict]:
+    base = catalog.default().recipes
+    if scale <= 1:
+        return base
+    recipes: List[dict] = []
+    for copy in range(1, scale + 1):
+        for recipe in base:
+            ingredients = [
+                (variant_name(name, popular_copy(rng, scale)), quantity, unit, optional)
+                for name, quantity, unit, optional in recipe["ingredients"]
+            ]
+            recipes.append({**recipe, "name": variant_name(recipe["name"], copy), "ingredients": ingredients})
+    return recipes
+
+
+def generate_dataset(
+    scale: int = 1,
+    rng: random.Random | None = None,
+    now: dt.datetime | None = None,
+    history_years: int = 0,
+    plan_rules: int = 0,
+) -> Dict[str, List[dict]]:
+    """Build every table's rows; pass ``rng``/``now`` for reproducible output (defaults: seed 42, current time).
+
+    ``history_years`` > 0 replaces the few weeks of cook history with a seasonal multi-year log.
+    ``plan_rules`` recurring meal-plan rules are drawn last, so they leave every other table unchanged.
+    """
+    rng = rng or random.Random(42)
+    now = now or dt.datetime.now()
+    ingredients = scale_ingredients(scale)
+    lookup = catalog.default().lookup if scale <= 1 else {row["name"]: row for row in ingredients}
+    inventory_rows = generate_inventory_rows(rng, now, 95 * scale, ingredients)
+    shopping_rows = generate_shopping_rows(rng, now, 28 * scale, ingredients)
+    recipe_rows, recipe_ingredients = generate_recipe_rows(rng, now, scale_recipes(rng, scale), lookup)
     recipe_ids = [row["id"] for row in recipe_rows]
-    meal_plan_rows = generate_meal_plans(recipe_ids)
-    cook_history_rows = generate_cook_history(recipe_ids)
+    meal_plans = generate_meal_plans(rng, now, recipe_ids, 10 * scale)
+    if history_years > 0:
+        cook_history = generate_seasonal_cook_history(rng, now, recipe_ids, history_years, 1.5 * scale)
+    else:
+        cook_history = generate_cook_history(rng, now, recipe_ids, 14 * scale)
+    events = generate_inventory_events(rng, inventory_rows)
+    checkpoints, checkpoint_rows = inventory_log.build_checkpoints(events)
+    rules = generate_meal_plan_rules(rng, now, recipe_ids, plan_rules) if plan_rules > 0 else []
+    return {
+        "Ingredients": ingredients,
+        "Inventory": inventory_rows,
+        "ShoppingItems": shopping_rows,
+        "Recipes": recipe_rows,
+        "RecipeIngredients": recipe_ingredients,
+        "MealPlans": meal_plans,
+        "MealPlanRules": rules,
+        "CookHistory": cook_history,
+        "InventoryEvents": events,
+        "InventoryCheckpoints": checkpoints,
+        "InventoryCheckpointRows": checkpoint_rows,
+    }
 
-    OUTPUT.parent.mkdir(parents=True, exist_ok=True)
+
+def schema_sql(layout: str = "text") -> str:
+    if layout == "compact":
+        import compact_layout
+
+        return compact_layout.compact_schema(SCHEMA.read_text())
+    return SCHEMA.read_text()
+
+
+def layout_tables(dataset: Dict[str, List[dict]], layout: str = "text") -> Dict[str, tuple]:
+    """(columns, rows) per table in load order for ``layout``."""
+    if layout == "compact":
+        import compact_layout
+
+        return compact_layout.encode(dataset)
+    return {table: (columns, dataset[table]) for table, columns in TABLE_COLUMNS.items()}
+
+
+def write_db(path: Path, dataset: Dict[str, List[dict]], layout: str = "text") -> None:
+    """Create a fresh SQLite database at ``path`` from the schema plus ``dataset``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(schema_sql(layout))
+        # Rollups are aggregated once after the load instead of row by row.
+        with conn, cook_rollups.bulk_load(conn):
+            for table, (columns, rows) in layout_tables(dataset, layout).items():
+                placeholders = ", ".join("?" for _ in columns)
+                conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                    (tuple(row[col] for col in columns) for row in rows),
+                )
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+
+def write_sql(
+    dataset: Dict[str, List[dict]] | None = None,
+    output: Path = OUTPUT,
+    now: dt.datetime | None = None,
+    layout: str = "text",
+):
+    now = now or dt.datetime.now()
+    if dataset is None:
+        dataset = generate_dataset(now=now)
+    tables = layout_tables(dataset, layout)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
     lines: List[str] = []
     lines.append("-- Auto-generated seed data for Moonyam pantry app")
-    lines.append(f"-- Generated on {iso(NOW)}")
+    lines.append(f"-- Generated on {iso(now)}")
     lines.append("PRAGMA foreign_keys = OFF;")
     lines.append("BEGIN TRANSACTION;")
-    for table in [
-        "CookHistory",
-        "MealPlans",
-        "RecipeIngredients",
-        "Recipes",
-        "ShoppingItems",
-        "Inventory",
-        "Ingredients",
-    ]:
+    for table in reversed(tables):
         lines.append(f"DELETE FROM {table};")
     lines.append("")
 
-    lines.extend(build_insert("Ingredients", ["id", "name", "default_unit", "category"], INGREDIENTS))
-    lines.append("")
-    lines.extend(
-        build_insert(
-            "Inventory",
-            ["ingredient_id", "quantity", "unit", "expires_at", "updated_at"],
-            inventory_rows,
-        )
+    for idx, (table, (columns, rows)) in enumerate(tables.items()):
+        if idx:
+            lines.append("")
+        lines.extend(build_insert(table, columns, rows))
+    lines.append("COMMIT;")
+
+    output.write_text("\n".join(lines) + "\n")
+    print(
+        f"Wrote seed data with {len(dataset['Ingredients'])} ingredients, "
+        f"{len(dataset['Recipes'])} recipes."
     )
-    lines.append("")
-    lines.extend(
-        build_insert(
-            "ShoppingItems",
-            ["id", "ingredient_id", "quantity", "unit", "status", "notes", "created_at"],
-            shopping_rows,
-        )
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1, help="multiply catalog and per-user tables (default: 1)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    parser.add_argument(
+        "--now",
+        type=dt.datetime.fromisoformat,
+        help="reference timestamp for generated dates (default: current time); pin it for reproducible refreshes",
     )
-    lines.append("")
-    lines.extend(
-        build_insert(
-            "Recipes",
-            ["id", "name", "description", "instructions", "cuisine", "created_at", "favorite"],
-            recipe_rows,
-        )
+    parser.add_argument(
+        "--history-years",
+        type=int,
+        default=0,
+        help="generate a seasonal multi-year cook history instead of the last few weeks (default: 0)",
     )
-    lines.append("")
-    lines.extend(
-        build_insert(
-            "RecipeIngredients",
-            ["recipe_id", "ingredient_id", "quantity", "unit", "optional"],
-            recipe_ingredients,
-        )
+    parser.add_argument(
+        "--plan-rules",
+        type=int,
+        default=0,
+        help="also generate this many recurring meal-plan rules (default: 0)",
     )
-    lines.append("")
-    lines.extend(
-        build_insert(
-            "MealPlans",
-            ["id", "recipe_id", "scheduled_for", "servings"],
-            meal_plan_rows,
-        )
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default="text",
+        help="table layout for --output/--db: regular TEXT columns or dictionary-encoded (default: text)",
     )
-    lines.append("")
-    lines.extend(
-        build_insert(
-            "CookHistory",
-            ["id", "recipe_id", "cooked_at", "notes"],
-            cook_history_rows,
-        )
+    parser.add_argument("--output", type=Path, default=OUTPUT, help="seed SQL destination")
+    parser.add_argument("--db", type=Path, help="also build a ready-to-use SQLite database at this path")
+    parser.add_argument(
+        "--sync",
+        type=Path,
+        help="apply the dataset to this existing database as a delta (upserts/deletes) instead of rebuilding it",
     )
-    lines.append("COMMIT;")
-
-    OUTPUT.write_text("\n".join(lines) + "\n")
-    print(f"Wrote seed data with {len(INGREDIENTS)} ingredients, {len(recipe_rows)} recipes.")
-
-
-def main():
-    write_sql()
+    parser.add_argument("--no-sql", action="store_true", help="skip writing the seed SQL file")
+    parser.add_argument(
+        "--skip-validation", action="store_true", help="write without checking keys, units and statuses first"
+    )
+    parser.add_argument("--trace", type=Path, help="write a per-statement SQLite timing report (JSON) here")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.sync and args.layout != "text":
+        print("--sync only supports the text layout", file=sys.stderr)
+        raise SystemExit(2)
+    if args.trace or os.environ.get("MOONYAM_SQLTRACE"):
+        import sqltrace
+
+        sqltrace.install(args.trace, label="generate_seed_data")
+    now = args.now or dt.datetime.now()
+    dataset = generate_dataset(args.scale, random.Random(args.seed), now, args.history_years, args.plan_rules)
+    if not args.skip_validation:
+        import validate_dataset
+
+        report = validate_dataset.validate(dataset)
+        if not report.ok:
+            report.print(sys.stderr)
+            raise SystemExit(1)
+    if not args.no_sql:
+        write_sql(dataset, args.output, now, args.layout)
+    if args.db:
+        write_db(args.db, dataset, args.layout)
+        print(f"Built {args.db}")
+    if args.sync:
+        import delta_sync
+
+        stats = delta_sync.sync_database(args.sync, dataset)
+        print(f"Synced {args.sync}:")
+        delta_sync.print_stats(stats)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Ingredient autocomplete index for the Moonyam pantry app.
+
+Ingredients.name only has a UNIQUE index, so "chees" or "parm" lookups would
+scan the table. This module keeps two in-memory structures instead:
+
+  * a prefix trie over the words of every ingredient name, where each node
+    caches the best-ranked ingredient ids below it (one trie for the whole
+    catalog plus one per category, so category filters stay O(len(prefix)));
+  * a trigram index over the distinct words, used as a typo-tolerant fallback
+    ("chese" -> "Cheese") when the prefix search returns too few results.
+
+Ranking puts ingredients used by more recipes first, then shorter names. The
+index can be built from the Ingredients table or, at seed time, straight from
+INGREDIENTS_BY_CATEGORY.
+
+Usage:
+    python scripts/ingredient_search.py parm
+    python scripts/ingredient_search.py "chees" --category "Dairy & Eggs"
+    python scripts/ingredient_search.py bench --scale 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import re
+import sqlite3
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+TOP_K = 16
+MAX_FUZZY_WORDS = 20
+MIN_FUZZY_SIMILARITY = 0.3
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def words(text: str) -> List[str]:
+    return WORD_RE.findall(normalize(text))
+
+
+def trigrams(word: str) -> set:
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def merge_top(current: List[int], incoming: Sequence[int], k: int) -> List[int]:
+    """Merge two ascending rank lists, dropping duplicates, keeping the first ``k``."""
+    merged: List[int] = []
+    i = j = 0
+    while len(merged) < k and (i < len(current) or j < len(incoming)):
+        if j >= len(incoming) or (i < len(current) and current[i] <= incoming[j]):
+            value = current[i]
+            i += 1
+        else:
+            value = incoming[j]
+            j += 1
+        if not merged or merged[-1] != value:
+            merged.append(value)
+    return merged
+
+
+class _Node:
+    __slots__ = ("children", "top", "count", "word")
+
+    def __init__(self):
+        self.children: Dict[str, _Node] = {}
+        self.top: List[int] = []
+        self.count = 0
+        self.word: str | None = None
+
+
+class IngredientIndex:
+    def __init__(self, ingredients: Iterable[dict], popularity: Dict[int, int] | None = None, top_k: int = TOP_K):
+        popularity = popularity or {}
+        rows = list(ingredients)
+        rows.sort(key=lambda row: (-popularity.get(row["id"], 0), len(row["name"]), row["name"]))
+        self.top_k = top_k
+        self.rows = rows
+        self.row_words: List[Tuple[str, ...]] = [tuple(words(row["name"])) for row in rows]
+
+        # word -> ascending ranks, globally and per category
+        postings: Dict[str | None, Dict[str, List[int]]] = {None: {}}
+        for rank, (row, row_words) in enumerate(zip(rows, self.row_words)):
+            scopes = (None, row["category"])
+            for word in set(row_words):
+                for scope in scopes:
+                    postings.setdefault(scope, {}).setdefault(word, []).append(rank)
+        self._postings = postings
+        self._tries = {scope: self._build_trie(words_map) for scope, words_map in postings.items()}
+
+        self._word_trigrams: Dict[str, List[str]] = {}
+        self._word_gram_count: Dict[str, int] = {}
+        for word in postings[None]:
+            grams = trigrams(word)
+            self._word_gram_count[word] = len(grams)
+            for gram in grams:
+                self._word_trigrams.setdefault(gram, []).append(word)
+
+    @classmethod
+    def from_db(cls, conn: sqlite3.Connection, **kwargs) -> "IngredientIndex":
+        rows = [
+            {"id": row[0], "name": row[1], "default_unit": row[2], "category": row[3]}
+            for row in conn.execute("SELECT id, name, default_unit, category FROM Ingredients")
+        ]
+        popularity = dict(
+            conn.execute("SELECT ingredient_id, COUNT(*) FROM RecipeIngredients GROUP BY ingredient_id")
+        )
+        return cls(rows, popularity, **kwargs)
+
+    @classmethod
+    def from_catalog(cls, data: "catalog.Catalog | None" = None, **kwargs) -> "IngredientIndex":
+        import catalog
+
+        data = data or catalog.default()
+        ingredients = data.ingredients
+        ids = {row["name"]: row["id"] for row in ingredients}
+        popularity: Dict[int, int] = {}
+        for recipe in data.recipes:
+            for name, *_ in recipe["ingredients"]:
+                if name in ids:
+                    popularity[ids[name]] = popularity.get(ids[name], 0) + 1
+        return cls(ingredients, popularity, **kwargs)
+
+    def _build_trie(self, postings: Dict[str, List[int]]) -> _Node:
+        root = _Node()
+        k = self.top_k
+        for word, ranks in postings.items():
+            head = ranks[:k]
+            node = root
+            node.top = merge_top(node.top, head, k)
+            node.count += len(ranks)
+            for ch in word:
+                child = node.children.get(ch)
+                if child is None:
+                    child = node.children[ch] = _Node()
+                node = child
+                node.top = merge_top(node.top, head, k)
+                node.count += len(ranks)
+            node.word = word
+        return root
+
+    def _find(self, prefix: str, category: str | None) -> _Node | None:
+        node = self._tries.get(category)
+        for ch in prefix:
+            if node is None:
+                return None
+            node = node.children.get(ch)
+        return node
+
+    def _subtree_ranks(self, node: _Node, category: str | None) -> Iterable[int]:
+        """Yield every rank below ``node`` once, in ascending order."""
+        postings = self._postings[category]
+        lists = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.word is not None:
+                lists.append(postings[current.word])
+            stack.extend(current.children.values())
+        previous = -1
+        for rank in heapq.merge(*lists):
+            if rank != previous:
+                yield rank
+                previous = rank
+
+    # Queries ------------------------------------------------------------------
+    def prefix_search(self, text: str, limit: int = 10, category: str | None = None) -> List[int]:
+        query = words(text)
+        if not query or category not in self._tries:
+            return []
+        if len(query) == 1:
+            node = self._find(query[0], category)
+            if node is None:
+                return []
+            if limit <= self.top_k:
+                return node.top[:limit]
+            return list(itertools.islice(self._subtree_ranks(node, category), limit))
+        # Multi-word: walk the most selective word in rank order, check the others.
+        nodes = [self._find(word, category) for word in query]
+        if any(node is None for node in nodes):
+            return []
+        anchor = min(range(len(query)), key=lambda pos: nodes[pos].count)
+        others = [word for pos, word in enumerate(query) if pos != anchor]
+        matches = (
+            rank
+            for rank in self._subtree_ranks(nodes[anchor], category)
+            if all(any(w.startswith(other) for w in self.row_words[rank]) for other in others)
+        )
+        return list(itertools.islice(matches, limit))
+
+    def fuzzy_search(self, text: str, limit: int = 10, category: str | None = None) -> List[int]:
+        query = words(text)
+        # With one query word the best ``limit`` ranks per similar word are
+        # enough for an exact answer; with several, keep a wider margin.
+        per_word = limit if len(query) == 1 else limit * 8
+        postings = self._postings.get(category, {})
+        scores: Dict[int, float] = {}
+        for query_word in query:
+            grams = trigrams(query_word)
+            overlap: Dict[str, int] = {}
+            for gram in grams:
+                for word in self._word_trigrams.get(gram, ()):
+                    overlap[word] = overlap.get(word, 0) + 1
+            similar = heapq.nlargest(
+                MAX_FUZZY_WORDS,
+                (
+                    (shared / (len(grams) + self._word_gram_count[word] - shared), word)
+                    for word, shared in overlap.items()
+                ),
+            )
+            best: Dict[int, float] = {}
+            for similarity, word in similar:
+                if similarity < MIN_FUZZY_SIMILARITY:
+                    break
+                for rank in postings.get(word, ())[:per_word]:
+                    if similarity > best.get(rank, 0.0):
+                        best[rank] = similarity
+            for rank, similarity in best.items():
+                scores[rank] = scores.get(rank, 0.0) + similarity
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [rank for rank, _ in ranked[:limit]]
+
+    def complete(self, text: str, limit: int = 10, category: str | None = None) -> List[dict]:
+        ranks = self.prefix_search(text, limit, category)
+        results = [{**self.rows[rank], "match": "prefix"} for rank in ranks]
+        if len(ranks) < limit:
+            seen = set(ranks)
+            for rank in self.fuzzy_search(text, limit, category):
+                if rank not in seen and len(results) < limit:
+                    results.append({**self.rows[rank], "match": "fuzzy"})
+        return results
+
+
+BENCH_QUERIES = ["chees", "parm", "parmesan ch", "tomat", "olive oil", "chese", "cumn"]
+
+
+def run_benchmark(scale: int, repeat: int) -> None:
+    import time
+
+    import benchlib
+
+    conn = sqlite3.connect(benchlib.scaled_database(scale))
+    try:
+        start = time.perf_counter()
+        index = IngredientIndex.from_db(conn)
+        build_s = time.perf_counter() - start
+        results = {}
+        for query in BENCH_QUERIES:
+            results[f"index '{query}'"] = benchlib.measure(lambda: index.complete(query, 10), repeat)
+            results[f"index '{query}' [Dairy & Eggs]"] = benchlib.measure(
+                lambda: index.complete(query, 10, "Dairy & Eggs"), repeat
+            )
+        for query in ["chees", "parm"]:
+            results[f"SQL LIKE '%{query}%'"] = benchlib.measure(
+                lambda: conn.execute(
+                    "SELECT id FROM Ingredients WHERE name LIKE ? ORDER BY length(name) LIMIT 10",
+                    (f"%{query}%",),
+                ).fetchall(),
+                max(repeat // 10, 3),
+            )
+    finally:
+        conn.close()
+    benchlib.print_results(
+        f"ingredient autocomplete, {len(index.rows)} ingredients (index built in {build_s:.2f}s)", results
+    )
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("query", help='text to complete, or "bench"')
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--catalog", action="store_true", help="index INGREDIENTS_BY_CATEGORY instead of the DB")
+    parser.add_argument("--category", help="only return ingredients from this category")
+    parser.add_argument("-n", "--limit", type=int, default=10)
+    parser.add_argument("--scale", type=int, default=300, help="bench: dataset scale factor")
+    parser.add_argument("--repeat", type=int, default=200, help="bench: timed repetitions per query")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.query == "bench":
+        run_benchmark(args.scale, args.repeat)
+        return
+    if args.catalog:
+        index = IngredientIndex.from_catalog()
+    else:
+        if not args.db.exists():
+            print(f"Database not found at {args.db}", file=sys.stderr)
+            raise SystemExit(1)
+        conn = sqlite3.connect(args.db)
+        try:
+            index = IngredientIndex.from_db(conn)
+        finally:
+            conn.close()
+    for row in index.complete(args.query, args.limit, args.category):
+        print(f"#{row['id']:<6} {row['name']:<32} {row['category'] or '':<20} ({row['match']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Database inspector: where space and time go in a Moonyam SQLite file.
+
+Reports, in one pass over ``dbstat``:
+  * file header numbers: page size, page count, freelist pages/bytes, journal mode;
+  * per table and index: rows (entries), b-tree pages, on-disk bytes, share of the
+    file, leaf fill and overflow pages;
+  * sqlite_stat1 freshness: the row count ANALYZE recorded against the real one
+    (stat1 has no timestamp, so drift is the usable signal);
+  * index selectivity from sqlite_stat1: average rows per distinct key prefix;
+  * a few random rows per table, picked by probing random rowids between
+    MIN(rowid) and MAX(rowid) (one b-tree descent per sample instead of the
+    full scan and sort behind ORDER BY RANDOM()).
+
+Without the dbstat virtual table (it is a compile-time option) row counts
+fall back to COUNT(*) and per-object sizes are omitted.
+
+Usage:
+    python scripts/inspect_db.py --db path/to/moonyam.db
+    python scripts/inspect_db.py --samples 0                    # sizes and stats only
+    python scripts/inspect_db.py --table Recipes --table CookHistory --samples 5
+    python scripts/inspect_db.py --analyze                      # refresh sqlite_stat1 first
+    python scripts/inspect_db.py bench --scale 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+# stat1 row counts further than this from the real count are reported as stale.
+STALE_DRIFT = 0.10
+
+
+@dataclass
+class BTree:
+    name: str
+    table: str
+    kind: str  # 'table', 'index' or 'without rowid'
+    rows: int = 0
+    pages: int = 0
+    bytes: int = 0
+    payload: int = 0
+    unused: int = 0
+    overflow_pages: int = 0
+    columns: List[str] = field(default_factory=list)
+    stat: str | None = None  # raw sqlite_stat1 'stat' column
+    analyzed_rows: int | None = None  # table row count when ANALYZE last ran
+
+
+@dataclass
+class Report:
+    path: Path
+    page_size: int
+    page_count: int
+    freelist_count: int
+    journal_mode: str
+    auto_vacuum: int
+    has_dbstat: bool
+    has_stat1: bool
+    trees: Dict[str, BTree]
+    samples: Dict[str, Tuple[List[str], List[tuple]]]
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _objects(conn: sqlite3.Connection, tables: Sequence[str] = ()) -> Dict[str, BTree]:
+    """Every table and index b-tree, including UNIQUE/PRIMARY KEY autoindexes and sqlite_stat1."""
+    trees: Dict[str, BTree] = {}
+    rows = conn.execute(
+        "SELECT type, name, tbl_name, sql FROM sqlite_master "
+        "WHERE type IN ('table', 'index') "
+        "AND (name NOT LIKE 'sqlite_%' OR name = 'sqlite_stat1' OR name LIKE 'sqlite_autoindex_%') "
+        "ORDER BY tbl_name, type DESC, name"
+    ).fetchall()
+    for kind, name, table, sql in rows:
+        if tables and table not in tables:
+            continue
+        if kind == "table":
+            if sql and sql.upper().startswith("CREATE VIRTUAL"):
+                continue
+            without_rowid = bool(sql) and "WITHOUT ROWID" in " ".join(sql.upper().split())
+            trees[name] = BTree(name, table, "without rowid" if without_rowid else "table")
+        else:
+            columns = [row[2] or "<expr>" for row in conn.execute(f"PRAGMA index_info({_quote(name)})")]
+            trees[name] = BTree(name, table, "index", columns=columns)
+    return trees
+
+
+def _fill_from_dbstat(conn: sqlite3.Connection, trees: Dict[str, BTree]) -> bool:
+    try:
+        cursor = conn.execute(
+            "SELECT name, pagetype, COUNT(*), SUM(pgsize), SUM(ncell), SUM(payload), SUM(unused) "
+            "FROM dbstat GROUP BY name, pagetype"
+        )
+    except sqlite3.OperationalError:
+        return False
+    for name, pagetype, pages, size, cells, payload, unused in cursor:
+        tree = trees.get(name)
+        if tree is None:
+            continue
+        tree.pages += pages
+        tree.bytes += size
+        tree.payload += payload
+        tree.unused += unused
+        if pagetype == "overflow":
+            tree.overflow_pages += pages
+        # Rowid tables keep rows on leaves only; index b-trees (and WITHOUT ROWID
+        # tables) also store entries in interior cells.
+        elif pagetype == "leaf" or tree.kind != "table":
+            tree.rows += cells
+    return True
+
+
+def _fill_from_count(conn: sqlite3.Connection, trees: Dict[str, BTree]) -> None:
+    counts: Dict[str, int] = {}
+    for tree in trees.values():
+        if tree.table not in counts:
+            counts[tree.table] = conn.execute(f"SELECT COUNT(*) FROM {_quote(tree.table)}").fetchone()[0]
+        tree.rows = counts[tree.table]
+
+
+def _fill_stat1(conn: sqlite3.Connection, trees: Dict[str, BTree]) -> bool:
+    try:
+        rows = conn.execute("SELECT tbl, idx, stat FROM sqlite_stat1").fetchall()
+    except sqlite3.OperationalError:
+        return False
+    for table, index, stat in rows:
+        tree = trees.get(index or table)
+        if tree is not None:
+            tree.stat = stat
+        # Every stat1 entry of a table (one per index) starts with the table's row count.
+        if table in trees and stat:
+            trees[table].analyzed_rows = int(stat.split()[0])
+    return True
+
+
+def sample_rows(conn: sqlite3.Connection, table: str, k: int, rng: random.Random) -> Tuple[List[str], List[tuple]]:
+    """Up to ``k`` distinct rows of ``table`` picked by random rowid probes (first rows for WITHOUT ROWID)."""
+    quoted = _quote(table)
+    try:
+        # Separate statements: SQLite only answers a lone MIN() or MAX() from the b-tree edge.
+        low = conn.execute(f"SELECT MIN(rowid) FROM {quoted}").fetchone()[0]
+        high = conn.execute(f"SELECT MAX(rowid) FROM {quoted}").fetchone()[0]
+    except sqlite3.OperationalError:
+        cursor = conn.execute(f"SELECT * FROM {quoted} LIMIT ?", (k,))
+        return [col[0] for col in cursor.description], cursor.fetchall()
+    cursor = conn.execute(f"SELECT rowid, * FROM {quoted} LIMIT 0")
+    columns = [col[0] for col in cursor.description][1:]
+    if low is None:
+        return columns, []
+    picked: Dict[int, tuple] = {}
+    # Gaps in the rowid space make some probes land on the same row; cap the retries.
+    for _ in range(k * 4):
+        if len(picked) >= k:
+            break
+        row = conn.execute(
+            f"SELECT rowid, * FROM {quoted} WHERE rowid >= ? ORDER BY rowid LIMIT 1", (rng.randint(low, high),)
+        ).fetchone()
+        if row is not None:
+            picked[row[0]] = row[1:]
+    return columns, [picked[rowid] for rowid in sorted(picked)]
+
+
+def inspect(
+    conn: sqlite3.Connection,
+    path: Path,
+    tables: Sequence[str] = (),
+    samples: int = 3,
+    seed_value: int | None = None,
+) -> Report:
+    trees = _objects(conn, tables)
+    has_dbstat = _fill_from_dbstat(conn, trees)
+    if not has_dbstat:
+        _fill_from_count(conn, trees)
+    has_stat1 = _fill_stat1(conn, trees)
+    rng = random.Random(seed_value)
+    sampled = {}
+    if samples > 0:
+        for tree in trees.values():
+            if tree.kind != "index" and tree.name != "sqlite_stat1":
+                sampled[tree.name] = sample_rows(conn, tree.name, samples, rng)
+    return Report(
+        path=path,
+        page_size=conn.execute("PRAGMA page_size").fetchone()[0],
+        page_count=conn.execute("PRAGMA page_count").fetchone()[0],
+        freelist_count=conn.execute("PRAGMA freelist_count").fetchone()[0],
+        journal_mode=conn.execute("PRAGMA journal_mode").fetchone()[0],
+        auto_vacuum=conn.execute("PRAGMA auto_vacuum").fetchone()[0],
+        has_dbstat=has_dbstat,
+        has_stat1=has_stat1,
+        trees=trees,
+        samples=sampled,
+    )
+
+
+def selectivity(stat: str | None) -> List[int]:
+    """Average rows per distinct value of each leading-column prefix, from an index's stat1 entry."""
+    if not stat:
+        return []
+    return [int(part) for part in stat.split()[1:] if part.isdigit()]
+
+
+def freshness(tree: BTree) -> str:
+    if tree.name == "sqlite_stat1":
+        return "-"
+    recorded = tree.analyzed_rows
+    if recorded is None:
+        return "no stat1"
+    drift = abs(tree.rows - recorded) / max(tree.rows, 1)
+    verdict = "stale" if drift > STALE_DRIFT else "fresh"
+    return f"{verdict} ({recorded} rows at ANALYZE, {drift:+.0%} drift)" if drift else verdict
+
+
+def _size(n: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def print_report(report: Report, width: int = 24) -> None:
+    file_bytes = report.page_size * report.page_count
+    free_bytes = report.page_size * report.freelist_count
+    print(f"{report.path}")
+    print(
+        f"  {_size(file_bytes)} in {report.page_count} pages of {report.page_size} B, "
+        f"freelist {report.freelist_count} pages ({_size(free_bytes)}, {free_bytes / max(file_bytes, 1):.1%}), "
+        f"journal_mode={report.journal_mode}, auto_vacuum={report.auto_vacuum}"
+    )
+    if not report.has_dbstat:
+        print("  (dbstat unavailable: row counts from COUNT(*), no per-object sizes)")
+    if not report.has_stat1:
+        print("  (no sqlite_stat1: run ANALYZE or pass --analyze for selectivity and freshness)")
+
+    tables = sorted((t for t in report.trees.values() if t.kind != "index"), key=lambda t: (-t.bytes, t.name))
+    print(f"\n  {'table':<{width}} {'rows':>10} {'pages':>8} {'size':>10} {'file':>6} {'fill':>5} {'ovfl':>5}  stat1")
+    for tree in tables:
+        fill = 1 - tree.unused / tree.bytes if tree.bytes else 0.0
+        print(
+            f"  {tree.name:<{width}} {tree.rows:>10} {tree.pages:>8} {_size(tree.bytes):>10} "
+            f"{tree.bytes / max(file_bytes, 1):>6.1%} {fill:>5.0%} {tree.overflow_pages:>5}  {freshness(tree)}"
+        )
+
+    indexes = sorted((t for t in report.trees.values() if t.kind == "index"), key=lambda t: (-t.bytes, t.name))
+    if indexes:
+        print(f"\n  {'index':<{width + 12}} {'entries':>10} {'pages':>8} {'size':>10} {'file':>6}  rows/key  columns")
+        for tree in indexes:
+            per_key = selectivity(tree.stat)
+            print(
+                f"  {tree.name:<{width + 12}} {tree.rows:>10} {tree.pages:>8} {_size(tree.bytes):>10} "
+                f"{tree.bytes / max(file_bytes, 1):>6.1%}  {' '.join(map(str, per_key)) or '-':<8}  "
+                f"{tree.table}({', '.join(tree.columns)})"
+            )
+
+    for table, (columns, rows) in report.samples.items():
+        print(f"\n  {table}: {len(rows)} random rows")
+        print("    " + " | ".join(columns))
+        for row in rows:
+            print("    " + " | ".join("" if value is None else str(value)[:40] for value in row))
+
+
+# Benchmark ---------------------------------------------------------------------
+def naive_inspect(conn: sqlite3.Connection, samples: int) -> Dict[str, object]:
+    """Baseline: COUNT(*) per table and index plus ORDER BY RANDOM() samples, as a shell session would do it."""
+    out: Dict[str, object] = {}
+    for kind, name, table in conn.execute(
+        "SELECT type, name, tbl_name FROM sqlite_master WHERE type IN ('table', 'index') AND name NOT LIKE 'sqlite_%'"
+    ).fetchall():
+        if kind == "table":
+            out[name] = conn.execute(f"SELECT COUNT(*) FROM {_quote(name)}").fetchone()[0]
+            out[name + ":samples"] = conn.execute(
+                f"SELECT * FROM {_quote(name)} ORDER BY RANDOM() LIMIT ?", (samples,)
+            ).fetchall()
+        else:
+            out[name] = conn.execute(f"SELECT COUNT(*) FROM {_quote(table)} INDEXED BY {_quote(name)}").fetchone()[0]
+    return out
+
+
+def run_benchmark(scale: int, samples: int, repeat: int) -> None:
+    import benchlib
+
+    path = benchlib.scaled_database(scale)
+    conn = sqlite3.connect(path)
+    try:
+        report = inspect(conn, path, samples=0)
+        naive = naive_inspect(conn, samples)
+        # Partial indexes hold fewer entries than their table, so only tables are cross-checked.
+        for tree in report.trees.values():
+            if tree.kind != "index" and tree.name in naive and naive[tree.name] != tree.rows:
+                raise SystemExit(f"dbstat row count for {tree.name} is {tree.rows}, COUNT(*) says {naive[tree.name]}")
+        rng = random.Random(1)
+        biggest = max((t for t in report.trees.values() if t.kind == "table"), key=lambda t: t.rows).name
+        results = {
+            "COUNT(*) + ORDER BY RANDOM()": benchlib.measure(lambda: naive_inspect(conn, samples), repeat),
+            "dbstat pass + rowid samples": benchlib.measure(
+                lambda: inspect(conn, path, samples=samples, seed_value=1), repeat
+            ),
+            f"{samples} samples of {biggest}: RANDOM()": benchlib.measure(
+                lambda: conn.execute(f"SELECT * FROM {biggest} ORDER BY RANDOM() LIMIT ?", (samples,)).fetchall(),
+                repeat,
+            ),
+            f"{samples} samples of {biggest}: rowid": benchlib.measure(
+                lambda: sample_rows(conn, biggest, samples, rng), repeat
+            ),
+        }
+        file_size = _size(report.page_size * report.page_count)
+    finally:
+        conn.close()
+    benchlib.print_results(f"database inspection, scale x{scale} ({file_size})", results)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["inspect", "bench"], default="inspect")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--table", action="append", default=[], help="limit to these tables (repeatable)")
+    parser.add_argument("--samples", type=int, default=3, help="random rows shown per table")
+    parser.add_argument("--seed", type=int, help="seed for the row sampler")
+    parser.add_argument("--analyze", action="store_true", help="run ANALYZE before reporting (writes sqlite_stat1)")
+    parser.add_argument("--scale", type=int, default=200, help="bench: dataset scale factor")
+    parser.add_argument("--repeat", type=int, default=5, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.scale, max(args.samples, 1), args.repeat)
+        return
+    if not args.db.exists():
+        print(f"Database not found at {args.db}", file=sys.stderr)
+        raise SystemExit(1)
+    if args.analyze:
+        conn = sqlite3.connect(args.db)
+    else:
+        conn = sqlite3.connect(f"{args.db.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        if args.analyze:
+            with conn:
+                conn.execute("ANALYZE")
+        print_report(inspect(conn, args.db, args.table, args.samples, args.seed))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Append-only inventory event log with checkpoints and point-in-time queries.
+
+Pantry changes are appended to InventoryEvents with the ingredient's state
+after the change, so replaying is "last event per ingredient wins". Every
+``CHECKPOINT_EVERY`` events the whole pantry is snapshotted into
+InventoryCheckpoints/InventoryCheckpointRows. ``pantry_at(conn, T)`` then
+costs one checkpoint read plus at most one interval of events:
+
+  1. newest checkpoint with taken_at <= T            (index seek)
+  2. last event with occurred_at <= T                (index seek)
+  3. events strictly between the two event ids       (rowid range scan)
+
+``compact`` keeps the newest N checkpoints and drops older events and
+checkpoints, so the log stays bounded; the oldest kept checkpoint becomes the
+base and queries before it are refused.
+
+Writers: the seed generator (bulk history + ``build_checkpoints``), ``record``
+for live single changes, ``log_changes`` for writers that update Inventory
+themselves (shopping_checkout.py), and the ``replay`` driver that simulates
+weeks of cooking and shopping against an existing database through the DAO
+layer (scripts/dao).
+
+Not every Inventory writer goes through the log: the generic DAO writes
+(``InventoryDao.upsert``/``adjust``/``delete``), the Kotlin app, and
+delta_sync.py (which syncs Inventory and the log from the same dataset) write
+the table directly. Events carry the full row state rather than only a delta,
+so such a change is not lost. It is absorbed into the log at the ingredient's
+next logged event; until then the log shows the ingredient's previous state.
+Checkpoints are folded from the log itself, never copied from Inventory, so
+they stay consistent with replaying the events.
+
+Usage:
+    python scripts/inventory_log.py at "2025-01-01 12:00:00" --db path/to/moonyam.db
+    python scripts/inventory_log.py replay --days 90 --db path/to/moonyam.db
+    python scripts/inventory_log.py compact --keep 4 --db path/to/moonyam.db
+    python scripts/inventory_log.py bench --scale 20 --days 180
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import os
+import random
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from dao import (
+    WAL_PRAGMAS,
+    Database,
+    InventoryCheckpointEntity,
+    InventoryCheckpointRowEntity,
+    InventoryEntity,
+    InventoryEventEntity,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+CHECKPOINT_EVERY = 500
+EVENT_KINDS = ("restock", "use", "adjust", "remove")
+EVENT_COLUMNS = ["id", "ingredient_id", "occurred_at", "kind", "delta", "quantity", "unit", "expires_at"]
+
+# ingredient_id -> (quantity, unit, expires_at)
+PantryState = Dict[int, Tuple[float, str, str | None]]
+
+INSERT_EVENT_SQL = (
+    "INSERT INTO InventoryEvents (ingredient_id, occurred_at, kind, delta, quantity, unit, expires_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+UPSERT_INVENTORY_SQL = (
+    "INSERT INTO Inventory (ingredient_id, quantity, unit, expires_at, updated_at) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (ingredient_id) DO UPDATE SET quantity = excluded.quantity, unit = excluded.unit, "
+    "expires_at = excluded.expires_at, updated_at = excluded.updated_at"
+)
+
+
+def apply_event(state: PantryState, ingredient_id: int, kind: str, quantity: float, unit: str, expires_at) -> None:
+    if kind == "remove":
+        state.pop(ingredient_id, None)
+    else:
+        state[ingredient_id] = (quantity, unit, expires_at)
+
+
+# Bulk construction -------------------------------------------------------------
+def build_checkpoints(
+    events: Iterable[dict], every: int = CHECKPOINT_EVERY, first_id: int = 1
+) -> Tuple[List[dict], List[dict]]:
+    """Fold id-ordered event rows into checkpoint rows, one checkpoint per ``every`` events."""
+    state: PantryState = {}
+    checkpoints: List[dict] = []
+    rows: List[dict] = []
+    for count, event in enumerate(events, start=1):
+        apply_event(state, event["ingredient_id"], event["kind"], event["quantity"], event["unit"], event["expires_at"])
+        if count % every == 0:
+            checkpoint_id = first_id + len(checkpoints)
+            checkpoints.append(
+                {"id": checkpoint_id, "taken_at": event["occurred_at"], "last_event_id": event["id"], "is_base": 0}
+            )
+            rows.extend(
+                {"checkpoint_id": checkpoint_id, "ingredient_id": ingredient_id, "quantity": quantity,
+                 "unit": unit, "expires_at": expires_at}
+                for ingredient_id, (quantity, unit, expires_at) in sorted(state.items())
+            )
+    return checkpoints, rows
+
+
+def rebuild_checkpoints(conn: sqlite3.Connection, every: int = CHECKPOINT_EVERY) -> int:
+    """Recompute every checkpoint from the log (e.g. after copying a subset of events)."""
+    cursor = conn.execute(f"SELECT {', '.join(EVENT_COLUMNS)} FROM InventoryEvents ORDER BY id")
+    events = (dict(zip(EVENT_COLUMNS, row)) for row in cursor)
+    checkpoints, rows = build_checkpoints(events, every)
+    # A savepoint is atomic whether or not the connection is in autocommit mode.
+    conn.execute("SAVEPOINT rebuild_checkpoints")
+    try:
+        conn.execute("DELETE FROM InventoryCheckpointRows")
+        conn.execute("DELETE FROM InventoryCheckpoints")
+        _insert_checkpoints(conn, checkpoints, rows)
+    except BaseException:
+        conn.execute("ROLLBACK TO rebuild_checkpoints")
+        conn.execute("RELEASE rebuild_checkpoints")
+        raise
+    conn.execute("RELEASE rebuild_checkpoints")
+    return len(checkpoints)
+
+
+def _insert_checkpoints(conn: sqlite3.Connection, checkpoints: List[dict], rows: List[dict]) -> None:
+    conn.executemany(
+        "INSERT INTO InventoryCheckpoints (id, taken_at, last_event_id, is_base) "
+        "VALUES (:id, :taken_at, :last_event_id, :is_base)",
+        checkpoints,
+    )
+    conn.executemany(
+        "INSERT INTO InventoryCheckpointRows (checkpoint_id, ingredient_id, quantity, unit, expires_at) "
+        "VALUES (:checkpoint_id, :ingredient_id, :quantity, :unit, :expires_at)",
+        rows,
+    )
+
+
+# Live writes -------------------------------------------------------------------
+def _next_state(kind: str, amount: float, current: Tuple[float, str, str | None] | None, unit, expires_at):
+    if kind not in EVENT_KINDS:
+        raise ValueError(f"kind must be one of {EVENT_KINDS}, got {kind!r}")
+    if current is None and kind in ("use", "remove"):
+        raise ValueError(f"cannot {kind} an ingredient that is not in the pantry")
+    quantity, current_unit, current_expiry = current or (0.0, unit, None)
+    if unit is not None and current is not None and unit != current_unit:
+        raise ValueError(f"unit {unit!r} does not match stored unit {current_unit!r}")
+    unit = unit or current_unit
+    if unit is None:
+        raise ValueError("unit is required for an ingredient that is not in the pantry")
+    if kind == "restock":
+        new_quantity = round(quantity + amount, 4)
+        expires_at = expires_at or current_expiry
+    elif kind == "use":
+        new_quantity = round(max(quantity - amount, 0.0), 4)
+        expires_at = current_expiry
+    elif kind == "adjust":
+        new_quantity = amount
+        expires_at = expires_at or current_expiry
+    else:
+        new_quantity, expires_at = 0.0, None
+    return new_quantity, round(new_quantity - quantity, 4), unit, expires_at
+
+
+def record(
+    conn: sqlite3.Connection,
+    ingredient_id: int,
+    kind: str,
+    amount: float,
+    occurred_at: str,
+    unit: str | None = None,
+    expires_at: str | None = None,
+    checkpoint_every: int = CHECKPOINT_EVERY,
+) -> int:
+    """Apply one change to Inventory and append it to the log atomically; returns the event id.
+
+    Runs in a savepoint, so it is atomic on autocommit (``isolation_level=None``)
+    connections too and nests inside a transaction the caller already has open.
+    """
+    conn.execute("SAVEPOINT record_event")
+    try:
+        row = conn.execute(
+            "SELECT quantity, unit, expires_at FROM Inventory WHERE ingredient_id = ?", (ingredient_id,)
+        ).fetchone()
+        quantity, delta, unit, expires_at = _next_state(kind, amount, row, unit, expires_at)
+        if kind == "remove":
+            conn.execute("DELETE FROM Inventory WHERE ingredient_id = ?", (ingredient_id,))
+        else:
+            conn.execute(UPSERT_INVENTORY_SQL, (ingredient_id, quantity, unit, expires_at, occurred_at))
+        event_id = conn.execute(
+            INSERT_EVENT_SQL, (ingredient_id, occurred_at, kind, delta, quantity, unit, expires_at)
+        ).lastrowid
+        _checkpoint_if_due(conn, checkpoint_every)
+    except BaseException:
+        conn.execute("ROLLBACK TO record_event")
+        conn.execute("RELEASE record_event")
+        raise
+    conn.execute("RELEASE record_event")
+    return event_id
+
+
+def log_changes(
+    conn: sqlite3.Connection,
+    deltas: Dict[int, float],
+    occurred_at: str,
+    kind: str = "restock",
+    checkpoint_every: int = CHECKPOINT_EVERY,
+) -> int:
+    """Log changes another writer already applied to Inventory, one event per ingredient (caller owns the transaction).
+
+    Each event stores the ingredient's Inventory row as it is now. Databases
+    built before the log existed have no InventoryEvents table; nothing is
+    logged there. Returns the number of events appended.
+    """
+    if kind not in EVENT_KINDS:
+        raise ValueError(f"kind must be one of {EVENT_KINDS}, got {kind!r}")
+    if not has_event_log(conn):
+        return 0
+    appended = conn.executemany(
+        "INSERT INTO InventoryEvents (ingredient_id, occurred_at, kind, delta, quantity, unit, expires_at) "
+        "SELECT ingredient_id, ?, ?, ?, quantity, unit, expires_at FROM Inventory WHERE ingredient_id = ?",
+        [(occurred_at, kind, round(delta, 4), ingredient_id) for ingredient_id, delta in sorted(deltas.items())],
+    ).rowcount
+    _checkpoint_if_due(conn, checkpoint_every)
+    return appended
+
+
+def has_event_log(conn: sqlite3.Connection) -> bool:
+    """False for databases built before the log existed."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'InventoryEvents'").fetchone()
+    return row is not None
+
+
+def _checkpoint_if_due(conn: sqlite3.Connection, every: int) -> None:
+    if _events_since_checkpoint(conn) >= every:
+        checkpoint(conn)
+
+
+def _events_since_checkpoint(conn: sqlite3.Connection) -> int:
+    last = conn.execute("SELECT last_event_id FROM InventoryCheckpoints ORDER BY id DESC LIMIT 1").fetchone()
+    return conn.execute("SELECT COUNT(*) FROM InventoryEvents WHERE id > ?", (last[0] if last else 0,)).fetchone()[0]
+
+
+def checkpoint(conn: sqlite3.Connection) -> int | None:
+    """Checkpoint the log as of its newest event (caller owns the transaction).
+
+    The snapshot is the previous checkpoint with the events since folded in,
+    not a copy of Inventory, so it always agrees with replaying the log.
+    """
+    last = conn.execute("SELECT id, occurred_at FROM InventoryEvents ORDER BY id DESC LIMIT 1").fetchone()
+    if last is None:
+        return None
+    state = _fold(conn, last[0])
+    checkpoint_id = conn.execute(
+        "INSERT INTO InventoryCheckpoints (taken_at, last_event_id) VALUES (?, ?)", (last[1], last[0])
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO InventoryCheckpointRows (checkpoint_id, ingredient_id, quantity, unit, expires_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        ((checkpoint_id, ingredient_id, *values) for ingredient_id, values in sorted(state.items())),
+    )
+    return checkpoint_id
+
+
+def _fold(conn: sqlite3.Connection, through: int) -> PantryState:
+    """Pantry state after event ``through``: the newest checkpoint before it plus the events in between."""
+    base = conn.execute(
+        "SELECT id, last_event_id FROM InventoryCheckpoints WHERE last_event_id <= ? ORDER BY id DESC LIMIT 1",
+        (through,),
+    ).fetchone()
+    state: PantryState = {}
+    after = 0
+    if base is not None:
+        state = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT ingredient_id, quantity, unit, expires_at FROM InventoryCheckpointRows WHERE checkpoint_id = ?",
+                (base[0],),
+            )
+        }
+        after = base[1]
+    for ingredient_id, kind, quantity, unit, expires_at in conn.execute(
+        "SELECT ingredient_id, kind, quantity, unit, expires_at FROM InventoryEvents "
+        "WHERE id > ? AND id <= ? ORDER BY id",
+        (after, through),
+    ):
+        apply_event(state, ingredient_id, kind, quantity, unit, expires_at)
+    return state
+
+
+# Reads -------------------------------------------------------------------------
+def pantry_at(conn: sqlite3.Connection, at: str) -> PantryState:
+    """Pantry contents as of ``at`` (inclusive): newest checkpoint at or before it plus the events since."""
+    base = conn.execute(
+        "SELECT id, last_event_id FROM InventoryCheckpoints WHERE taken_at <= ? "
+        "ORDER BY taken_at DESC, id DESC LIMIT 1",
+        (at,),
+    ).fetchone()
+    if base is None:
+        compacted = conn.execute("SELECT taken_at FROM InventoryCheckpoints WHERE is_base = 1").fetchone()
+        if compacted is not None:
+            raise ValueError(f"history before {compacted[0]} has been compacted away")
+        state: PantryState = {}
+        after = 0
+    else:
+        state = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT ingredient_id, quantity, unit, expires_at FROM InventoryCheckpointRows WHERE checkpoint_id = ?",
+                (base[0],),
+            )
+        }
+        after = base[1]
+    upper = conn.execute(
+        "SELECT id FROM InventoryEvents WHERE occurred_at <= ? ORDER BY occurred_at DESC, id DESC LIMIT 1", (at,)
+    ).fetchone()
+    if upper is not None and upper[0] > after:
+        for ingredient_id, kind, quantity, unit, expires_at in conn.execute(
+            "SELECT ingredient_id, kind, quantity, unit, expires_at FROM InventoryEvents "
+            "WHERE id > ? AND id <= ? ORDER BY id",
+            (after, upper[0]),
+        ):
+            apply_event(state, ingredient_id, kind, quantity, unit, expires_at)
+    return state
+
+
+def pantry_at_full_scan(conn: sqlite3.Connection, at: str) -> PantryState:
+    """Baseline: latest event per ingredient over the whole log."""
+    return {
+        row[0]: row[1:]
+        for row in conn.execute(
+            """
+            SELECT ingredient_id, quantity, unit, expires_at
+            FROM (
+                SELECT ingredient_id, kind, quantity, unit, expires_at,
+                       ROW_NUMBER() OVER (PARTITION BY ingredient_id ORDER BY id DESC) AS rn
+                FROM InventoryEvents
+                WHERE occurred_at <= ?
+            )
+            WHERE rn = 1 AND kind != 'remove'
+            """,
+            (at,),
+        )
+    }
+
+
+def compact(conn: sqlite3.Connection, keep: int = 4) -> Dict[str, int]:
+    """Keep the newest ``keep`` checkpoints; drop older checkpoints and the events they cover."""
+    kept = conn.execute(
+        "SELECT id, last_event_id FROM InventoryCheckpoints ORDER BY id DESC LIMIT 1 OFFSET ?", (max(keep, 1) - 1,)
+    ).fetchone()
+    if kept is None:
+        return {"events": 0, "checkpoints": 0}
+    base_id, base_event = kept
+    with conn:
+        events = conn.execute("DELETE FROM InventoryEvents WHERE id <= ?", (base_event,)).rowcount
+        conn.execute("DELETE FROM InventoryCheckpointRows WHERE checkpoint_id < ?", (base_id,))
+        checkpoints = conn.execute("DELETE FROM InventoryCheckpoints WHERE id < ?", (base_id,)).rowcount
+        conn.execute("UPDATE InventoryCheckpoints SET is_base = (id = ?)", (base_id,))
+    return {"events": events, "checkpoints": checkpoints}
+
+
+# Replay driver -----------------------------------------------------------------
+def replay(
+    db: Database,
+    days: int,
+    rng: random.Random,
+    uses_per_day: int = 12,
+    checkpoint_every: int = CHECKPOINT_EVERY,
+) -> int:
+    """Simulate ``days`` of cooking (uses) and shopping (restocks) after the newest logged event.
+
+    State is kept in memory and written through the DAO layer in one
+    transaction: events, checkpoints every ``checkpoint_every`` events, and the
+    final Inventory rows.
+    """
+    state: PantryState = {row.ingredient_id: tuple(row[1:4]) for row in db.inventory.get_all()}
+    if not state:
+        return 0
+    latest = db.inventory_events.get_latest()
+    start = dt.datetime.fromisoformat(latest.occurred_at) if latest else dt.datetime.now().replace(microsecond=0)
+    next_event = (latest.id if latest else 0) + 1
+    base = db.inventory_events.get_latest_checkpoint()
+    next_checkpoint = (base.id if base else 0) + 1
+    since_checkpoint = db.inventory_events.count_after(base.last_event_id if base else 0)
+    initial = {ingredient_id: values[0] for ingredient_id, values in state.items()}
+    ingredient_ids = sorted(state)
+
+    events: List[InventoryEventEntity] = []
+    checkpoints: List[InventoryCheckpointEntity] = []
+    checkpoint_rows: List[InventoryCheckpointRowEntity] = []
+    touched: Dict[int, str] = {}
+    for day in range(days):
+        offsets = sorted(rng.randint(1, 86_399) for _ in range(uses_per_day))
+        for offset in offsets:
+            at = (start + dt.timedelta(days=day, seconds=offset)).strftime("%Y-%m-%d %H:%M:%S")
+            ingredient_id = rng.choice(ingredient_ids)
+            quantity, unit, expires_at = state[ingredient_id]
+            if quantity <= initial[ingredient_id] * 0.2:
+                kind, amount = "restock", initial[ingredient_id]
+            else:
+                kind = "use"
+                amount = rng.randint(1, 2) if unit == "pcs" else round(quantity * rng.uniform(0.1, 0.4), 1)
+            new_quantity, delta, unit, expires_at = _next_state(kind, amount, state[ingredient_id], unit, expires_at)
+            state[ingredient_id] = (new_quantity, unit, expires_at)
+            touched[ingredient_id] = at
+            events.append(
+                InventoryEventEntity(next_event, ingredient_id, at, kind, delta, new_quantity, unit, expires_at)
+            )
+            since_checkpoint += 1
+            if since_checkpoint >= checkpoint_every:
+                checkpoints.append(InventoryCheckpointEntity(next_checkpoint, at, next_event))
+                checkpoint_rows.extend(
+                    InventoryCheckpointRowEntity(next_checkpoint, i, q, u, e) for i, (q, u, e) in sorted(state.items())
+                )
+                next_checkpoint += 1
+                since_checkpoint = 0
+            next_event += 1
+
+    with db.transaction():
+        db.inventory_events.insert_many(events)
+        db.inventory_events.insert_checkpoints(checkpoints, checkpoint_rows)
+        db.inventory.upsert_many(InventoryEntity(i, *state[i], updated_at) for i, updated_at in touched.items())
+    return len(events)
+
+
+# Benchmark ---------------------------------------------------------------------
+def run_benchmark(scale: int, days: int, queries: int, repeat: int) -> None:
+    import shutil
+
+    import benchlib
+
+    pristine = benchlib.scaled_database(scale)
+    path = pristine.with_name("inventory-log.db")
+    shutil.copyfile(pristine, path)
+    with Database(path, pragmas=WAL_PRAGMAS) as db:
+        replay(db, days, random.Random(7), uses_per_day=20 * scale)
+    conn = sqlite3.connect(path)
+    try:
+        first, last = conn.execute("SELECT MIN(occurred_at), MAX(occurred_at) FROM InventoryEvents").fetchone()
+        total = conn.execute("SELECT COUNT(*) FROM InventoryEvents").fetchone()[0]
+        span = (dt.datetime.fromisoformat(last) - dt.datetime.fromisoformat(first)).total_seconds()
+        rng = random.Random(3)
+        times = [
+            (dt.datetime.fromisoformat(first) + dt.timedelta(seconds=rng.uniform(0, span))).strftime("%Y-%m-%d %H:%M:%S")
+            for _ in range(queries)
+        ]
+        for at in times[:5]:
+            if pantry_at(conn, at) != pantry_at_full_scan(conn, at):
+                raise SystemExit(f"checkpoint replay disagrees with the full scan at {at}")
+        results = {
+            f"{queries} queries, full log scan": benchlib.measure(
+                lambda: [pantry_at_full_scan(conn, at) for at in times], repeat
+            ),
+            f"{queries} queries, checkpoint + tail": benchlib.measure(
+                lambda: [pantry_at(conn, at) for at in times], repeat
+            ),
+        }
+        removed = compact(conn, keep=4)
+        remaining = conn.execute("SELECT COUNT(*) FROM InventoryEvents").fetchone()[0]
+    finally:
+        conn.close()
+    benchlib.print_results(f"point-in-time pantry, scale x{scale}, {total} events over {days}+ days", results)
+    print(f"  compact(keep=4): removed {removed['events']} events, {remaining} left")
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["at", "replay", "compact", "checkpoints", "bench"])
+    parser.add_argument("when", nargs="?", help="at: timestamp, e.g. '2025-01-01 12:00:00'")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--days", type=int, default=30, help="replay/bench: simulated days")
+    parser.add_argument("--uses-per-day", type=int, default=12, help="replay: pantry changes per day")
+    parser.add_argument("--every", type=int, default=CHECKPOINT_EVERY, help="events per checkpoint")
+    parser.add_argument("--keep", type=int, default=4, help="compact: checkpoints to keep")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scale", type=int, default=20, help="bench: dataset scale factor")
+    parser.add_argument("--queries", type=int, default=50, help="bench: point-in-time queries per case")
+    parser.add_argument("--repeat", type=int, default=3, help="bench: timed repetitions per case")
+    parser.add_argument("--trace", type=Path, help="write a per-statement SQLite timing report (JSON) here")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.trace or os.environ.get("MOONYAM_SQLTRACE"):
+        import sqltrace
+
+        sqltrace.install(args.trace, label=f"inventory_log {args.command}")
+    if args.command == "bench":
+        run_benchmark(args.scale, args.days, args.queries, args.repeat)
+        return
+    if not args.db.exists():
+        print(f"Database not found at {args.db}", file=sys.stderr)
+        raise SystemExit(1)
+    conn = sqlite3.connect(args.db)
+    if not has_event_log(conn):
+        conn.close()
+        print(
+            f"Database at {args.db} has no InventoryEvents table; rebuild it with generate_seed_data.py",
+            file=sys.stderr,
+        )
+        raise SystemExit(1)
+    if args.command == "replay":
+        conn.close()
+        with Database(args.db) as db:
+            count = replay(db, args.days, random.Random(args.seed), args.uses_per_day, args.every)
+        print(f"Appended {count} events")
+        return
+    try:
+        if args.command == "at":
+            if not args.when:
+                print("a timestamp is required", file=sys.stderr)
+                raise SystemExit(2)
+            try:
+                state = pantry_at(conn, args.when)
+            except ValueError as exc:
+                print(exc, file=sys.stderr)
+                raise SystemExit(1)
+            for ingredient_id, (quantity, unit, expires_at) in sorted(state.items()):
+                print(f"  #{ingredient_id:<7} {quantity:>10g} {unit:<4} {expires_at or ''}")
+        elif args.command == "compact":
+            removed = compact(conn, args.keep)
+            print(f"Removed {removed['events']} events and {removed['checkpoints']} checkpoints")
+        else:
+            print(f"Rebuilt {rebuild_checkpoints(conn, args.every)} checkpoints")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
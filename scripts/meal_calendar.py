@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Meal-plan calendar: one-off MealPlans plus recurring MealPlanRules, per date window.
+
+Rules ("every Friday", "every other week on Mon+Thu", "the 15th of every
+month", "every 10 days") are never materialized. ``calendar`` reads the
+window's one-off plans through idx_mealplans_scheduled and only the rules
+that can fire inside it through idx_mealplanrules_active (see
+docs/db-schema.sql), then expands each rule arithmetically: it jumps
+straight to the first period at or after the window start instead of
+stepping forward from the rule's anchor, so a window costs
+O(rules overlapping it + occurrences in it), however old the rules are.
+
+Windows are half-open date ranges [start, end). Databases created before
+MealPlanRules existed have no table to read; they are treated as having no
+rules.
+
+Usage:
+    python scripts/meal_calendar.py show --db path/to/moonyam.db              # next 14 days
+    python scripts/meal_calendar.py show --start 2025-03-01 --days 31 --recipe 12
+    python scripts/meal_calendar.py bench --scale 20 --rules 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import calendar as _calendar
+import datetime as dt
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+FREQUENCIES = ("daily", "weekly", "monthly")
+RULE_COLUMNS = ["id", "recipe_id", "starts_on", "ends_on", "freq", "every", "weekdays", "time_of_day", "servings"]
+ONE_DAY = dt.timedelta(days=1)
+RULE_SELECT = f"SELECT {', '.join(RULE_COLUMNS)} FROM MealPlanRules"
+
+
+class Rule(NamedTuple):
+    id: int
+    recipe_id: int
+    starts_on: dt.date
+    ends_on: dt.date | None
+    freq: str
+    every: int
+    weekdays: int
+    time_of_day: str
+    servings: int
+
+    @classmethod
+    def from_row(cls, row: Iterable) -> "Rule":
+        rule_id, recipe_id, starts_on, ends_on, freq, every, weekdays, time_of_day, servings = row
+        return cls(
+            rule_id,
+            recipe_id,
+            dt.date.fromisoformat(starts_on),
+            dt.date.fromisoformat(ends_on) if ends_on else None,
+            freq,
+            every,
+            weekdays,
+            time_of_day,
+            servings,
+        )
+
+
+class Occurrence(NamedTuple):
+    scheduled_for: str  # 'YYYY-MM-DD HH:MM:SS', as in MealPlans
+    recipe_id: int
+    servings: int
+    rule_id: int | None  # set for rule occurrences
+    plan_id: int | None  # set for one-off MealPlans rows
+
+
+def _order(occ: Occurrence) -> tuple:
+    # rule_id / plan_id are None for the other kind; keep ties comparable.
+    return occ.scheduled_for, occ.recipe_id, occ.rule_id or 0, occ.plan_id or 0
+
+
+def _bounds(rule: Rule, start: dt.date, end: dt.date) -> tuple:
+    """The part of [start, end) the rule is live in, as [lo, hi)."""
+    lo = max(start, rule.starts_on)
+    hi = end if rule.ends_on is None else min(end, rule.ends_on + ONE_DAY)
+    return lo, hi
+
+
+def _month_day(anchor: dt.date, months: int) -> dt.date:
+    """``anchor``'s day of the month, ``months`` later, clamped to that month's last day."""
+    year, month = divmod(anchor.month - 1 + months, 12)
+    year += anchor.year
+    return dt.date(year, month + 1, min(anchor.day, _calendar.monthrange(year, month + 1)[1]))
+
+
+def _weekday_mask(rule: Rule) -> int:
+    return rule.weekdays or 1 << rule.starts_on.weekday()
+
+
+def occurrence_dates(rule: Rule, start: dt.date, end: dt.date) -> Iterator[dt.date]:
+    """Days in [start, end) on which ``rule`` fires, in order."""
+    lo, hi = _bounds(rule, start, end)
+    if lo >= hi:
+        return
+    anchor, every = rule.starts_on, rule.every
+    if rule.freq == "daily":
+        day = anchor + dt.timedelta(days=-(-(lo - anchor).days // every) * every)
+        step = dt.timedelta(days=every)
+        while day < hi:
+            yield day
+            day += step
+    elif rule.freq == "weekly":
+        mask = _weekday_mask(rule)
+        offsets = [dt.timedelta(days=wd) for wd in range(7) if mask >> wd & 1]
+        anchor_monday = anchor - dt.timedelta(days=anchor.weekday())
+        weeks = (lo - anchor_monday).days // 7
+        # lo's own week may still hold matching days, so start from the period containing it.
+        monday = anchor_monday + dt.timedelta(weeks=weeks - weeks % every)
+        step = dt.timedelta(weeks=every)
+        while monday < hi:
+            for offset in offsets:
+                day = monday + offset
+                if lo <= day < hi:
+                    yield day
+            monday += step
+    elif rule.freq == "monthly":
+        months = (lo.year - anchor.year) * 12 + lo.month - anchor.month
+        months -= months % every
+        while True:
+            day = _month_day(anchor, months)
+            if day >= hi:
+                return
+            if day >= lo:
+                yield day
+            months += every
+    else:
+        raise ValueError(f"rule {rule.id}: freq {rule.freq!r} is not one of {FREQUENCIES}")
+
+
+def fires_on(rule: Rule, day: dt.date) -> bool:
+    """Whether ``rule`` has an occurrence on ``day`` (the per-day definition ``occurrence_dates`` must match)."""
+    if day < rule.starts_on or (rule.ends_on is not None and day > rule.ends_on):
+        return False
+    anchor = rule.starts_on
+    if rule.freq == "daily":
+        return (day - anchor).days % rule.every == 0
+    if rule.freq == "weekly":
+        anchor_monday = anchor - dt.timedelta(days=anchor.weekday())
+        weeks = (day - dt.timedelta(days=day.weekday()) - anchor_monday).days // 7
+        return bool(_weekday_mask(rule) >> day.weekday() & 1) and weeks % rule.every == 0
+    months = (day.year - anchor.year) * 12 + day.month - anchor.month
+    return months % rule.every == 0 and day == _month_day(anchor, months)
+
+
+def expand(rules: Iterable[Rule], start: dt.date, end: dt.date) -> List[Occurrence]:
+    occurrences = [
+        Occurrence(f"{day} {rule.time_of_day}", rule.recipe_id, rule.servings, rule.id, None)
+        for rule in rules
+        for day in occurrence_dates(rule, start, end)
+    ]
+    occurrences.sort(key=_order)
+    return occurrences
+
+
+def has_rules_table(conn: sqlite3.Connection) -> bool:
+    """False for databases created before MealPlanRules was added to the schema."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'MealPlanRules'").fetchone()
+    return row is not None
+
+
+def active_rules(conn: sqlite3.Connection, start: dt.date, end: dt.date, recipe_id: int | None = None) -> List[Rule]:
+    """Rules whose [starts_on, ends_on] overlaps [start, end), read as two idx_mealplanrules_active ranges."""
+    if not has_rules_table(conn):
+        return []
+    recipe = " AND recipe_id = :recipe" if recipe_id is not None else ""
+    params = {"start": str(start), "end": str(end), "recipe": recipe_id}
+    rows = conn.execute(
+        f"{RULE_SELECT} WHERE ends_on IS NULL AND starts_on < :end{recipe} "
+        f"UNION ALL {RULE_SELECT} WHERE ends_on >= :start AND starts_on < :end{recipe}",
+        params,
+    ).fetchall()
+    return [Rule.from_row(row) for row in rows]
+
+
+def one_off_plans(
+    conn: sqlite3.Connection, start: dt.date, end: dt.date, recipe_id: int | None = None
+) -> List[Occurrence]:
+    recipe = " AND recipe_id = ?" if recipe_id is not None else ""
+    params = [str(start), str(end)] + ([recipe_id] if recipe_id is not None else [])
+    return [
+        Occurrence(scheduled_for, plan_recipe, servings, None, plan_id)
+        for plan_id, plan_recipe, scheduled_for, servings in conn.execute(
+            "SELECT id, recipe_id, scheduled_for, servings FROM MealPlans "
+            f"WHERE scheduled_for >= ? AND scheduled_for < ?{recipe}",
+            params,
+        )
+    ]
+
+
+def calendar(
+    conn: sqlite3.Connection, start: dt.date, end: dt.date, recipe_id: int | None = None
+) -> List[Occurrence]:
+    """Everything planned in [start, end), one-off and recurring, ordered by time."""
+    occurrences = one_off_plans(conn, start, end, recipe_id)
+    occurrences.extend(expand(active_rules(conn, start, end, recipe_id), start, end))
+    occurrences.sort(key=_order)
+    return occurrences
+
+
+def calendar_scan(conn: sqlite3.Connection, start: dt.date, end: dt.date) -> List[Occurrence]:
+    """Baseline for ``calendar``: read every rule and test each day from its anchor with ``fires_on``."""
+    occurrences = one_off_plans(conn, start, end)
+    for row in conn.execute(RULE_SELECT) if has_rules_table(conn) else ():
+        rule = Rule.from_row(row)
+        day = rule.starts_on
+        last = end if rule.ends_on is None else min(end, rule.ends_on + ONE_DAY)
+        while day < last:
+            if day >= start and fires_on(rule, day):
+                occurrences.append(
+                    Occurrence(f"{day} {rule.time_of_day}", rule.recipe_id, rule.servings, rule.id, None)
+                )
+            day += ONE_DAY
+    occurrences.sort(key=_order)
+    return occurrences
+
+
+def print_calendar(conn: sqlite3.Connection, occurrences: List[Occurrence]) -> None:
+    names = dict(conn.execute("SELECT id, name FROM Recipes"))
+    current_day = None
+    for occ in occurrences:
+        day, time_of_day = occ.scheduled_for.split(" ", 1)
+        if day != current_day:
+            current_day = day
+            print(f"{day} {dt.date.fromisoformat(day):%a}")
+        source = f"rule #{occ.rule_id}" if occ.rule_id is not None else f"plan #{occ.plan_id}"
+        print(f"  {time_of_day[:5]}  {names.get(occ.recipe_id, '?')} x{occ.servings}  ({source})")
+
+
+# Benchmark ---------------------------------------------------------------------
+def run_benchmark(scale: int, rules: int, repeat: int) -> None:
+    import benchlib
+
+    path = benchlib.scaled_database(scale, plan_rules=rules)
+    conn = sqlite3.connect(path)
+    try:
+        today = dt.date.today()
+        windows = {
+            "next 7 days": (today, today + dt.timedelta(days=7)),
+            "next 31 days": (today, today + dt.timedelta(days=31)),
+            "next 90 days": (today, today + dt.timedelta(days=90)),
+            "31 days a year ago": (today - dt.timedelta(days=365), today - dt.timedelta(days=334)),
+        }
+        results = {}
+        for label, (start, end) in windows.items():
+            if calendar(conn, start, end) != calendar_scan(conn, start, end):
+                raise SystemExit(f"lazy expansion disagrees with the per-day scan for {label}")
+            results[f"{label}: scan + step days"] = benchlib.measure(lambda: calendar_scan(conn, start, end), repeat)
+            results[f"{label}: index + expand"] = benchlib.measure(lambda: calendar(conn, start, end), repeat)
+        year = calendar(conn, today, today + dt.timedelta(days=365))
+        recipe_id = conn.execute("SELECT recipe_id FROM MealPlanRules GROUP BY 1 ORDER BY COUNT(*) DESC").fetchone()[0]
+        results["one recipe, next 365 days"] = benchlib.measure(
+            lambda: calendar(conn, today, today + dt.timedelta(days=365), recipe_id), repeat
+        )
+        live = len(active_rules(conn, today, today + dt.timedelta(days=31)))
+    finally:
+        conn.close()
+    benchlib.print_results(
+        f"meal calendar, scale x{scale}, {rules} rules ({live} live this month, {len(year)} plans in the next year)",
+        results,
+    )
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["show", "bench"], default="show")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--start", type=dt.date.fromisoformat, help="first day (default: today)")
+    parser.add_argument("--days", type=int, default=14, help="window length in days")
+    parser.add_argument("--recipe", type=int, help="only this recipe")
+    parser.add_argument("--scale", type=int, default=20, help="bench: dataset scale factor")
+    parser.add_argument("--rules", type=int, default=20000, help="bench: recurring rules to generate")
+    parser.add_argument("--repeat", type=int, default=5, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.scale, args.rules, args.repeat)
+        return
+    if not args.db.exists():
+        print(f"Database not found at {args.db}", file=sys.stderr)
+        raise SystemExit(1)
+    start = args.start or dt.date.today()
+    conn = sqlite3.connect(args.db)
+    try:
+        print_calendar(conn, calendar(conn, start, start + dt.timedelta(days=args.days), args.recipe))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
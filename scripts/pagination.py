@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Keyset pagination for the Moonyam list screens.
+
+OFFSET paging makes SQLite step over every skipped row, so page 100,000 costs
+100,000 pages of work. Keyset paging instead remembers the sort key of the last
+row shown and asks for rows strictly after it, which the supporting index turns
+into a single seek regardless of depth.
+
+Each listing declares its sort key; the key always ends with the table's
+primary key so it is unique and pages never overlap or skip rows. Cursors are
+opaque URL-safe strings so UI code does not depend on their shape.
+
+Usage:
+    python scripts/pagination.py recipes_recent --page-size 5
+    python scripts/pagination.py shopping_by_status --status pending --after <cursor>
+    python scripts/pagination.py bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+
+class Listing(NamedTuple):
+    table: str
+    columns: Sequence[str]
+    key: Sequence[str]
+    descending: bool = False
+    filters: Sequence[str] = ()
+
+
+# Each key is backed by an index in docs/db-schema.sql (rowid is implicitly the
+# last column of every index, so "id" never has to be listed).
+LISTINGS: Dict[str, Listing] = {
+    "recipes_recent": Listing(
+        "Recipes", ["id", "name", "cuisine", "created_at", "favorite"], ["created_at", "id"], True
+    ),
+    "recipes_favorite": Listing(
+        "Recipes", ["id", "name", "cuisine", "created_at", "favorite"], ["favorite", "created_at", "id"], True
+    ),
+    "shopping_by_status": Listing(
+        "ShoppingItems", ["id", "ingredient_id", "quantity", "unit", "status", "created_at"], ["id"],
+        filters=["status"],
+    ),
+    "cook_history": Listing("CookHistory", ["id", "recipe_id", "cooked_at", "notes"], ["cooked_at", "id"], True),
+}
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return tuple(json.loads(base64.urlsafe_b64decode(padded)))
+
+
+def _base_query(listing: Listing, filters: Dict[str, object]) -> Tuple[str, List[str], List[object], str]:
+    missing = [name for name in listing.filters if name not in filters]
+    if missing:
+        raise ValueError(f"listing on {listing.table} needs filter(s): {', '.join(missing)}")
+    conditions = [f"{name} = ?" for name in listing.filters]
+    params = [filters[name] for name in listing.filters]
+    direction = "DESC" if listing.descending else "ASC"
+    order = ", ".join(f"{column} {direction}" for column in listing.key)
+    select = f"SELECT {', '.join(listing.columns)} FROM {listing.table}"
+    return select, conditions, params, order
+
+
+def _rows(cursor: sqlite3.Cursor) -> List[dict]:
+    names = [description[0] for description in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
+
+
+def fetch_page(
+    conn: sqlite3.Connection,
+    listing: Listing,
+    page_size: int = 20,
+    after: str | None = None,
+    **filters,
+) -> Tuple[List[dict], str | None]:
+    """Return one page plus the cursor for the next one (None on the last page)."""
+    select, conditions, params, order = _base_query(listing, filters)
+    if after is not None:
+        comparison = "<" if listing.descending else ">"
+        placeholders = ", ".join("?" for _ in listing.key)
+        conditions.append(f"({', '.join(listing.key)}) {comparison} ({placeholders})")
+        params.extend(decode_cursor(after))
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = _rows(conn.execute(f"{select}{where} ORDER BY {order} LIMIT ?", params + [page_size]))
+    next_cursor = None
+    if len(rows) == page_size:
+        next_cursor = encode_cursor([rows[-1][column] for column in listing.key])
+    return rows, next_cursor
+
+
+def fetch_offset_page(
+    conn: sqlite3.Connection,
+    listing: Listing,
+    page: int,
+    page_size: int = 20,
+    **filters,
+) -> List[dict]:
+    """OFFSET-based reference implementation; ``page`` is 1-based."""
+    select, conditions, params, order = _base_query(listing, filters)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"{select}{where} ORDER BY {order} LIMIT ? OFFSET ?"
+    return _rows(conn.execute(query, params + [page_size, (page - 1) * page_size]))
+
+
+def cursor_before_page(
+    conn: sqlite3.Connection, listing: Listing, page: int, page_size: int, **filters
+) -> str | None:
+    """Cursor that makes ``fetch_page`` return ``page`` (used to jump straight into a listing)."""
+    if page <= 1:
+        return None
+    previous = fetch_offset_page(conn, listing, page - 1, page_size, **filters)
+    return encode_cursor([previous[-1][column] for column in listing.key])
+
+
+# Benchmark --------------------------------------------------------------------
+GROW_SQL = {
+    "Recipes": """
+        INSERT INTO Recipes (name, cuisine, created_at, favorite)
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        SELECT 'Bench Recipe ' || i, 'Bench',
+               datetime('2020-01-01', '+' || (i * 7919 % 2000000) || ' minutes'), (i % 9 = 0)
+        FROM n
+    """,
+    "ShoppingItems": """
+        INSERT INTO ShoppingItems (ingredient_id, quantity, unit, status, created_at)
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        SELECT 1 + i % (SELECT COUNT(*) FROM Ingredients), 1, 'pcs', 'pending',
+               datetime('2020-01-01', '+' || i || ' minutes')
+        FROM n
+    """,
+    "CookHistory": """
+        INSERT INTO CookHistory (recipe_id, cooked_at)
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        SELECT 1 + i % 28, datetime('2020-01-01', '+' || (i * 7919 % 2000000) || ' minutes')
+        FROM n
+    """,
+}
+
+BENCH_FILTERS = {"shopping_by_status": {"status": "pending"}}
+
+
+def run_benchmark(pages: Sequence[int], page_size: int, repeat: int) -> None:
+    import benchlib
+
+    rows_needed = max(pages) * page_size
+    conn = sqlite3.connect(benchlib.scaled_database(1))
+    try:
+        with conn:
+            for table, sql in GROW_SQL.items():
+                conn.execute(sql, (rows_needed,))
+        conn.execute("ANALYZE")
+        results = {}
+        for name, listing in LISTINGS.items():
+            filters = BENCH_FILTERS.get(name, {})
+            for page in pages:
+                after = cursor_before_page(conn, listing, page, page_size, **filters)
+                keyset_rows, _ = fetch_page(conn, listing, page_size, after, **filters)
+                if keyset_rows != fetch_offset_page(conn, listing, page, page_size, **filters):
+                    raise SystemExit(f"{name}: keyset page {page} differs from OFFSET page")
+                runs = repeat if page < 10_000 else max(repeat // 5, 3)
+                results[f"{name} p{page} OFFSET"] = benchlib.measure(
+                    lambda: fetch_offset_page(conn, listing, page, page_size, **filters), runs
+                )
+                results[f"{name} p{page} keyset"] = benchlib.measure(
+                    lambda: fetch_page(conn, listing, page_size, after, **filters), runs
+                )
+    finally:
+        conn.close()
+    benchlib.print_results(f"OFFSET vs keyset paging, {rows_needed}+ rows per table, page size {page_size}", results)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("listing", choices=sorted(LISTINGS) + ["bench"])
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--after", help="cursor printed by the previous page")
+    parser.add_argument("--status", default="pending", help="shopping_by_status: status to list")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 1_000, 100_000], help="bench: pages to fetch")
+    parser.add_argument("--repeat", type=int, default=20, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.listing == "bench":
+        run_benchmark(args.pages, args.page_size, args.repeat)
+        return
+    if not args.db.exists():
+        print(f"Database not found at {args.db}", file=sys.stderr)
+        raise SystemExit(1)
+    listing = LISTINGS[args.listing]
+    filters = {"status": args.status} if "status" in listing.filters else {}
+    conn = sqlite3.connect(args.db)
+    try:
+        rows, next_cursor = fetch_page(conn, listing, args.page_size, args.after, **filters)
+    finally:
+        conn.close()
+    for row in rows:
+        print("  ".join(f"{value}" for value in row.values()))
+    print(f"next: {next_cursor or '(end)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 #!/usr/bin/env bash
-# Quick helper: prints tables + sample rows from the local SQLite DB.
+# Quick helper: table/index sizes, stat1 freshness and sample rows from the local SQLite DB.
+# Thin wrapper around scripts/inspect_db.py; extra arguments are passed through.
 
 set -euo pipefail
 
@@ -10,22 +11,4 @@ if [[ ! -f "$DB_PATH" ]]; then
   exit 1
 fi
 
-sqlite3 "$DB_PATH" <<'SQL'
-.mode column
-.headers on
-
--- list tables
-.tables
-
--- schema for core tables
-.schema Ingredients Recipes RecipeIngredients Inventory ShoppingItems MealPlans CookHistory
-
--- sample rows
-SELECT * FROM Recipes LIMIT 5;
-SELECT * FROM Ingredients LIMIT 5;
-SELECT * FROM RecipeIngredients LIMIT 5;
-SELECT * FROM Inventory LIMIT 5;
-SELECT * FROM ShoppingItems LIMIT 5;
-SELECT * FROM MealPlans LIMIT 5;
-SELECT * FROM CookHistory LIMIT 5;
-SQL
+exec python3 "$(dirname "$0")/inspect_db.py" --db "$DB_PATH" "$@"
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Version-keyed result cache for "what can I cook" and "what do I need".
+
+Triggers in docs/db-schema.sql bump a counter in DataVersions whenever
+Inventory, Recipes/RecipeIngredients/Ingredients or MealPlans/MealPlanRules
+rows are written. Each cached query declares which counters it depends on; a
+cached answer is served as long as those counters are unchanged, so repeated
+screen loads cost one lookup of a three-row table. Entries are keyed by the
+database file as well, so one cache can serve several databases. Entries are
+bounded by an LRU, and hit/miss/eviction/invalidation counters are exposed for
+tuning.
+
+Shopping needs cover one-off MealPlans and the occurrences of recurring
+MealPlanRules in the window (expanded by meal_calendar.calendar).
+
+Usage:
+    python scripts/query_cache.py --db path/to/moonyam.db --days 14
+    python scripts/query_cache.py bench --scale 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import sqlite3
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, Sequence, Tuple
+
+import meal_calendar
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+# table -> DataVersions counter bumped by its triggers
+TRACKED_TABLES: Dict[str, str] = {
+    "Inventory": "inventory",
+    "Recipes": "recipes",
+    "RecipeIngredients": "recipes",
+    "Ingredients": "recipes",
+    "MealPlans": "plans",
+    "MealPlanRules": "plans",
+}
+
+COOKABLE_SQL = """
+SELECT r.id, r.name
+FROM Recipes AS r
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM RecipeIngredients AS ri
+    LEFT JOIN Inventory AS inv ON inv.ingredient_id = ri.ingredient_id
+    WHERE ri.recipe_id = r.id
+      AND ri.optional = 0
+      AND (inv.ingredient_id IS NULL
+           OR inv.quantity <= 0
+           OR (inv.unit = ri.unit AND inv.quantity < ri.quantity))
+)
+ORDER BY r.id
+"""
+
+MISSING_FOR_RECIPE_SQL = """
+SELECT ri.ingredient_id, i.name,
+       ri.quantity * ? - CASE WHEN inv.unit = ri.unit THEN inv.quantity ELSE 0 END AS short,
+       ri.unit
+FROM RecipeIngredients AS ri
+JOIN Ingredients AS i ON i.id = ri.ingredient_id
+LEFT JOIN Inventory AS inv ON inv.ingredient_id = ri.ingredient_id
+WHERE ri.recipe_id = ?
+  AND ri.optional = 0
+  AND (inv.ingredient_id IS NULL
+       OR inv.quantity <= 0
+       OR (inv.unit = ri.unit AND inv.quantity < ri.quantity * ?))
+ORDER BY ri.ingredient_id
+"""
+
+SHOPPING_NEEDS_SQL = """
+WITH planned AS (
+    SELECT json_extract(value, '$[0]') AS recipe_id, json_extract(value, '$[1]') AS servings
+    FROM json_each(?)
+),
+needed AS (
+    SELECT ri.ingredient_id, ri.unit, SUM(ri.quantity * p.servings) AS quantity
+    FROM planned AS p
+    JOIN RecipeIngredients AS ri ON ri.recipe_id = p.recipe_id AND ri.optional = 0
+    GROUP BY ri.ingredient_id, ri.unit
+)
+SELECT n.ingredient_id, i.name,
+       n.quantity - CASE WHEN inv.unit = n.unit THEN inv.quantity ELSE 0 END AS short,
+       n.unit
+FROM needed AS n
+JOIN Ingredients AS i ON i.id = n.ingredient_id
+LEFT JOIN Inventory AS inv ON inv.ingredient_id = n.ingredient_id
+WHERE inv.ingredient_id IS NULL
+   OR inv.quantity <= 0
+   OR (inv.unit = n.unit AND inv.quantity < n.quantity)
+ORDER BY n.ingredient_id
+"""
+
+
+def ensure_version_tracking(conn: sqlite3.Connection) -> None:
+    """Retrofit DataVersions and its triggers onto a database built from an older schema."""
+    present = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    counters = sorted(set(TRACKED_TABLES.values()))
+    statements = [
+        "CREATE TABLE IF NOT EXISTS DataVersions (name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0) "
+        "WITHOUT ROWID",
+        "INSERT OR IGNORE INTO DataVersions (name) VALUES " + ", ".join(f"('{name}')" for name in counters),
+    ]
+    for table, counter in TRACKED_TABLES.items():
+        if table not in present:
+            continue  # newer than the database's schema (e.g. MealPlanRules)
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table.lower()}_version_{event.lower()} "
+                f"AFTER {event} ON {table} "
+                f"BEGIN UPDATE DataVersions SET version = version + 1 WHERE name = '{counter}'; END"
+            )
+    with conn:
+        for statement in statements:
+            conn.execute(statement)
+
+
+def read_versions(conn: sqlite3.Connection) -> Dict[str, int]:
+    return dict(conn.execute("SELECT name, version FROM DataVersions"))
+
+
+def database_identity(conn: sqlite3.Connection) -> str:
+    """The main database file, or a per-connection name for in-memory databases."""
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == "main" and path:
+            return path
+    return f"memory:{id(conn)}"
+
+
+def planned_servings(conn: sqlite3.Connection, start: dt.date, end: dt.date) -> str:
+    """JSON ``[[recipe_id, servings], ...]`` for every plan and rule occurrence in ``[start, end)``."""
+    servings: Dict[int, int] = {}
+    for occ in meal_calendar.calendar(conn, start, end):
+        servings[occ.recipe_id] = servings.get(occ.recipe_id, 0) + occ.servings
+    return json.dumps(sorted(servings.items()))
+
+
+class QueryCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[int, ...], object]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get_or_compute(
+        self,
+        conn: sqlite3.Connection,
+        key: Hashable,
+        depends: Sequence[str],
+        compute: Callable[[], object],
+    ):
+        versions = read_versions(conn)
+        stamp = tuple(versions[name] for name in depends)
+        key = (database_identity(conn), key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            del self._entries[key]
+            self.stats["invalidations"] += 1
+        self.stats["misses"] += 1
+        value = compute()
+        self._entries[key] = (stamp, value)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PantryQueries:
+    """Cached pantry questions; results are tuples so callers cannot mutate cached values."""
+
+    def __init__(self, cache: QueryCache | None = None):
+        self.cache = cache or QueryCache()
+
+    def cookable(self, conn: sqlite3.Connection) -> Tuple[Tuple[int, str], ...]:
+        return self.cache.get_or_compute(
+            conn,
+            ("cookable",),
+            ("inventory", "recipes"),
+            lambda: tuple(conn.execute(COOKABLE_SQL)),
+        )
+
+    def missing_for_recipe(self, conn: sqlite3.Connection, recipe_id: int, servings: int = 1) -> Tuple[tuple, ...]:
+        return self.cache.get_or_compute(
+            conn,
+            ("missing", recipe_id, servings),
+            ("inventory", "recipes"),
+            lambda: tuple(conn.execute(MISSING_FOR_RECIPE_SQL, (servings, recipe_id, servings))),
+        )
+
+    def shopping_needs(self, conn: sqlite3.Connection, start: dt.date, end: dt.date) -> Tuple[tuple, ...]:
+        """Shortfall for every meal planned in ``[start, end)``, one-off or recurring."""
+        return self.cache.get_or_compute(
+            conn,
+            ("needs", str(start), str(end)),
+            ("inventory", "recipes", "plans"),
+            lambda: tuple(conn.execute(SHOPPING_NEEDS_SQL, (planned_servings(conn, start, end),))),
+        )
+
+
+def run_benchmark(scale: int, repeat: int) -> None:
+    import benchlib
+
+    conn = sqlite3.connect(benchlib.scaled_database(scale, plan_rules=scale * 10))
+    start = dt.date.today()
+    end = start + dt.timedelta(days=31)
+    queries = PantryQueries(QueryCache(max_entries=64))
+    try:
+        results = {
+            "cookable, uncached": benchlib.measure(lambda: tuple(conn.execute(COOKABLE_SQL)), repeat),
+            "cookable, cached": benchlib.measure(lambda: queries.cookable(conn), repeat),
+            "shopping needs, uncached": benchlib.measure(
+                lambda: tuple(conn.execute(SHOPPING_NEEDS_SQL, (planned_servings(conn, start, end),))), repeat
+            ),
+            "shopping needs, cached": benchlib.measure(lambda: queries.shopping_needs(conn, start, end), repeat),
+        }
+        ingredient_id = conn.execute("SELECT ingredient_id FROM Inventory LIMIT 1").fetchone()[0]
+
+        def write_then_read() -> None:
+            with conn:
+                conn.execute("UPDATE Inventory SET quantity = quantity + 1 WHERE ingredient_id = ?", (ingredient_id,))
+            queries.cookable(conn)
+
+        results["cookable after an inventory write"] = benchlib.measure(write_then_read, repeat)
+    finally:
+        conn.close()
+    benchlib.print_results(f"versioned query cache, scale x{scale} (cache stats: {queries.cache.stats})", results)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["show", "bench"], default="show")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--days", type=int, default=14, help="shopping needs for the next N days")
+    parser.add_argument("--scale", type=int, default=100, help="bench: dataset scale factor")
+    parser.add_argument("--repeat", type=int, default=20, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.scale, args.repeat)
+        return
+    if not args.db.exists():
+        print(f"Database not found at {args.db}", file=sys.stderr)
+        raise SystemExit(1)
+    conn = sqlite3.connect(args.db)
+    try:
+        ensure_version_tracking(conn)
+        queries = PantryQueries()
+        cookable = queries.cookable(conn)
+        print(f"Cookable now ({len(cookable)}):")
+        for recipe_id, name in cookable:
+            print(f"  #{recipe_id:<6} {name}")
+        today = dt.date.today()
+        needs = queries.shopping_needs(conn, today, today + dt.timedelta(days=args.days))
+        print(f"Needed for meals planned in the next {args.days} days ({len(needs)}):")
+        for ingredient_id, name, short, unit in needs:
+            print(f"  {name:<32} {short:>10.1f} {unit}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+MinHash/LSH similarity index over recipe ingredient sets.
+
+Backs "you might also like" suggestions without comparing every pair of
+recipes. Each recipe's RecipeIngredients set is reduced to a MinHash signature;
+signatures are split into bands and hashed into LSH buckets, so a lookup only
+scores the recipes sharing at least one bucket with the query.
+
+The index is persisted as a compact binary file (recipe ids, set fingerprints,
+32-bit signature values). ``refresh`` re-hashes only recipes whose ingredient
+set changed and drops deleted ones; buckets are rebuilt from the signatures on
+load, which is cheap compared to hashing. The default 16 bands x 4 rows put
+the LSH S-curve midpoint near a Jaccard similarity of 0.5.
+
+Usage:
+    python scripts/recipe_similarity.py build
+    python scripts/recipe_similarity.py similar 12 -n 5
+    python scripts/recipe_similarity.py refresh
+    python scripts/recipe_similarity.py recall --scale 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import struct
+import sys
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+DEFAULT_INDEX = ROOT / "build" / "recipe-similarity.idx"
+
+MAGIC = b"MYSIMIDX"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIIII")  # magic, version, num_perm, bands, hash seed, count
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = 0xFFFFFFFF
+
+
+def load_ingredient_sets(conn: sqlite3.Connection) -> Dict[int, FrozenSet[int]]:
+    groups: Dict[int, set] = {}
+    for recipe_id, ingredient_id in conn.execute(
+        "SELECT recipe_id, ingredient_id FROM RecipeIngredients ORDER BY recipe_id"
+    ):
+        groups.setdefault(recipe_id, set()).add(ingredient_id)
+    for (recipe_id,) in conn.execute("SELECT id FROM Recipes"):
+        groups.setdefault(recipe_id, set())
+    return {recipe_id: frozenset(ids) for recipe_id, ids in groups.items()}
+
+
+def fingerprint(ingredients: Iterable[int]) -> int:
+    return zlib.crc32(array("q", sorted(ingredients)).tobytes())
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class RecipeSimilarityIndex:
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.seed = seed
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+        self.signatures: Dict[int, Tuple[int, ...]] = {}
+        self.fingerprints: Dict[int, int] = {}
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+
+    # Signatures ---------------------------------------------------------------
+    def signature(self, ingredients: Iterable[int]) -> Tuple[int, ...]:
+        ids = list(ingredients)
+        if not ids:
+            return (MAX_HASH,) * self.num_perm
+        return tuple(min((a * x + b) % MERSENNE_PRIME for x in ids) & MAX_HASH for a, b in self._perms)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+        step = self.rows_per_band
+        for band in range(self.bands):
+            yield band, signature[band * step:(band + 1) * step]
+
+    def _rebuild_buckets(self) -> None:
+        self._buckets = [{} for _ in range(self.bands)]
+        for recipe_id, signature in self.signatures.items():
+            for band, key in self._band_keys(signature):
+                self._buckets[band].setdefault(key, []).append(recipe_id)
+
+    # Building -----------------------------------------------------------------
+    def update(self, ingredient_sets: Dict[int, FrozenSet[int]]) -> Dict[str, int]:
+        """Bring the index in line with ``ingredient_sets``, hashing only changed recipes."""
+        stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        for recipe_id in list(self.signatures):
+            if recipe_id not in ingredient_sets:
+                del self.signatures[recipe_id]
+                del self.fingerprints[recipe_id]
+                stats["removed"] += 1
+        for recipe_id, ingredients in ingredient_sets.items():
+            fp = fingerprint(ingredients)
+            previous = self.fingerprints.get(recipe_id)
+            if previous == fp:
+                stats["unchanged"] += 1
+                continue
+            stats["added" if previous is None else "changed"] += 1
+            self.signatures[recipe_id] = self.signature(ingredients)
+            self.fingerprints[recipe_id] = fp
+        self._rebuild_buckets()
+        return stats
+
+    @classmethod
+    def build(cls, conn: sqlite3.Connection, **kwargs) -> "RecipeSimilarityIndex":
+        index = cls(**kwargs)
+        index.update(load_ingredient_sets(conn))
+        return index
+
+    # Queries ------------------------------------------------------------------
+    def estimate(self, a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        return sum(1 for x, y in zip(a, b) if x == y) / self.num_perm
+
+    def candidates(self, signature: Tuple[int, ...]) -> set:
+        found = set()
+        for band, key in self._band_keys(signature):
+            found.update(self._buckets[band].get(key, ()))
+        return found
+
+    def query(self, ingredients: Iterable[int], n: int = 10, exclude: int | None = None) -> List[Tuple[int, float]]:
+        return self._rank(self.signature(ingredients), n, exclude)
+
+    def neighbours(self, recipe_id: int, n: int = 10) -> List[Tuple[int, float]]:
+        return self._rank(self.signatures[recipe_id], n, recipe_id)
+
+    def _rank(self, signature: Tuple[int, ...], n: int, exclude: int | None) -> List[Tuple[int, float]]:
+        scored = [
+            (other, self.estimate(signature, self.signatures[other]))
+            for other in self.candidates(signature)
+            if other != exclude
+        ]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:n]
+
+    # Persistence --------------------------------------------------------------
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        ids = sorted(self.signatures)
+        values = array("I")
+        for recipe_id in ids:
+            values.extend(self.signatures[recipe_id])
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.num_perm, self.bands, self.seed, len(ids)))
+            array("q", ids).tofile(fh)
+            array("I", (self.fingerprints[recipe_id] for recipe_id in ids)).tofile(fh)
+            values.tofile(fh)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "RecipeSimilarityIndex":
+        with open(path, "rb") as fh:
+            magic, version, num_perm, bands, seed, count = HEADER.unpack(fh.read(HEADER.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a version {FORMAT_VERSION} recipe similarity index")
+            index = cls(num_perm=num_perm, bands=bands, seed=seed)
+            ids = array("q")
+            ids.fromfile(fh, count)
+            fps = array("I")
+            fps.fromfile(fh, count)
+            values = array("I")
+            values.fromfile(fh, count * num_perm)
+        for pos, recipe_id in enumerate(ids):
+            index.signatures[recipe_id] = tuple(values[pos * num_perm:(pos + 1) * num_perm])
+            index.fingerprints[recipe_id] = fps[pos]
+        index._rebuild_buckets()
+        return index
+
+
+def measure_recall(
+    index: RecipeSimilarityIndex,
+    sets: Dict[int, FrozenSet[int]],
+    threshold: float = 0.5,
+    sample: int = 200,
+    seed: int = 7,
+) -> Dict[str, float]:
+    """Compare LSH candidates against brute-force Jaccard for a sample of recipes."""
+    rng = random.Random(seed)
+    ids = sorted(sets)
+    queries = rng.sample(ids, min(sample, len(ids)))
+    truth_total = found_total = 0
+    brute_time = lsh_time = 0.0
+    for recipe_id in queries:
+        start = time.perf_counter()
+        truth = {
+            other for other in ids
+            if other != recipe_id and jaccard(sets[recipe_id], sets[other]) >= threshold
+        }
+        brute_time += time.perf_counter() - start
+        start = time.perf_counter()
+        found = {other for other, _ in index.neighbours(recipe_id, n=len(ids))}
+        lsh_time += time.perf_counter() - start
+        truth_total += len(truth)
+        found_total += len(truth & found)
+    return {
+        "queries": len(queries),
+        "threshold": threshold,
+        "true_neighbours": truth_total,
+        "recall": found_total / truth_total if truth_total else 1.0,
+        "brute_force_ms_per_query": brute_time * 1000 / max(len(queries), 1),
+        "lsh_ms_per_query": lsh_time * 1000 / max(len(queries), 1),
+    }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["build", "refresh", "similar", "recall"])
+    parser.add_argument("recipe_id", nargs="?", type=int, help="similar: recipe to find neighbours for")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX)
+    parser.add_argument("-n", type=int, default=10, help="number of neighbours to return")
+    parser.add_argument("--num-perm", type=int, default=64)
+    parser.add_argument("--bands", type=int, default=16)
+    parser.add_argument("--threshold", type=float, default=0.5, help="recall: Jaccard cut-off for true neighbours")
+    parser.add_argument("--scale", type=int, help="recall: run against a synthesized database of this scale")
+    return parser.parse_args(argv)
+
+
+def _load_index(path: Path) -> RecipeSimilarityIndex:
+    if not path.exists():
+        print(f"Similarity index not found at {path} (run the build command first)", file=sys.stderr)
+        raise SystemExit(1)
+    try:
+        return RecipeSimilarityIndex.load(path)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        raise SystemExit(1)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "recall" and args.scale:
+        import benchlib
+
+        args.db = benchlib.scaled_database(args.scale)
+    if not args.db.exists():
+        print(f"Database not found at {args.db}", file=sys.stderr)
+        raise SystemExit(1)
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.command == "build":
+            start = time.perf_counter()
+            index = RecipeSimilarityIndex.build(conn, num_perm=args.num_perm, bands=args.bands)
+            index.save(args.index)
+            print(
+                f"Indexed {len(index.signatures)} recipes in {time.perf_counter() - start:.2f}s "
+                f"-> {args.index} ({args.index.stat().st_size} bytes)"
+            )
+        elif args.command == "refresh":
+            index = _load_index(args.index)
+            stats = index.update(load_ingredient_sets(conn))
+            index.save(args.index)
+            print(", ".join(f"{key}={value}" for key, value in stats.items()))
+        elif args.command == "similar":
+            if args.recipe_id is None:
+                raise SystemExit("similar needs a recipe_id")
+            index = _load_index(args.index)
+            if args.recipe_id not in index.signatures:
+                print(f"Recipe {args.recipe_id} is not in the similarity index at {args.index}", file=sys.stderr)
+                raise SystemExit(1)
+            start = time.perf_counter()
+            ranked = index.neighbours(args.recipe_id, args.n)
+            elapsed = (time.perf_counter() - start) * 1000
+            names = dict(conn.execute("SELECT id, name FROM Recipes"))
+            for other, score in ranked:
+                print(f"{score:>6.3f}  #{other:<6} {names.get(other)}")
+            print(f"({elapsed:.3f} ms)")
+        else:
+            index = RecipeSimilarityIndex.build(conn, num_perm=args.num_perm, bands=args.bands)
+            report = measure_recall(index, load_ingredient_sets(conn), args.threshold)
+            for key, value in report.items():
+                print(f"{key:>26}: {value:.4f}" if isinstance(value, float) else f"{key:>26}: {value}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
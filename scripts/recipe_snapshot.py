@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped binary snapshot of the recipe catalog.
+
+Workers that answer recipe queries normally rebuild Recipes/RecipeIngredients
+as Python dicts on startup, so every process pays the load time and keeps a
+private copy. ``export`` writes the catalog once as a flat binary file of
+typed arrays; ``RecipeSnapshot`` maps it read-only and exposes the arrays as
+``memoryview`` casts, so opening costs a header parse and every process on
+the machine shares the same page-cache pages.
+
+Layout (native byte order, recorded in the header; every section 8-byte
+aligned):
+
+  * header: magic, format version, byte order, section count, the
+    DataVersions 'recipes' counter at export time, then (offset, count) per
+    section;
+  * recipes (sorted by id): ids, flags (bit 0 = favorite), cuisine index, names;
+  * links in CSR form: ``link_offsets[i]:link_offsets[i + 1]`` are recipe i's
+    ingredient ids, quantities, unit indexes and optional flags;
+  * ingredients (sorted by id): ids, names, and the inverse CSR
+    (``usage_offsets`` / ``usage_recipes``) of recipe positions using each one;
+  * string tables (recipe names, cuisines, units, ingredient names) as an
+    offsets array plus one UTF-8 blob.
+
+The recorded 'recipes' counter (moved by Recipes, RecipeIngredients and
+Ingredients writes) lets a reader check ``is_current(conn)`` against the live
+database; re-export when it moved.
+
+Usage:
+    python scripts/recipe_snapshot.py export --db path/to/moonyam.db
+    python scripts/recipe_snapshot.py show 12
+    python scripts/recipe_snapshot.py bench --scale 200 --procs 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+DEFAULT_SNAPSHOT = ROOT / "build" / "recipe-catalog.snap"
+
+MAGIC = b"MYRCPSNP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIBxxxIq")  # magic, version, little-endian flag, section count, data version
+SECTION = struct.Struct("<QQ")  # byte offset, item count
+ALIGN = 8
+
+# (name, array typecode) in file order
+SECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("recipe_ids", "q"),
+    ("recipe_flags", "B"),
+    ("recipe_cuisine", "H"),
+    ("recipe_name_offsets", "I"),
+    ("recipe_names", "B"),
+    ("cuisine_offsets", "I"),
+    ("cuisines", "B"),
+    ("link_offsets", "I"),
+    ("link_ingredient", "q"),
+    ("link_quantity", "d"),
+    ("link_unit", "H"),
+    ("link_optional", "B"),
+    ("unit_offsets", "I"),
+    ("units", "B"),
+    ("ingredient_ids", "q"),
+    ("ingredient_name_offsets", "I"),
+    ("ingredient_names", "B"),
+    ("usage_offsets", "I"),
+    ("usage_recipes", "I"),
+)
+FAVORITE = 1
+
+Link = Tuple[int, float, str, bool]  # ingredient id, quantity, unit, optional
+
+
+# Export ------------------------------------------------------------------------
+def _string_table(values: Sequence[str]) -> Tuple[array, array]:
+    offsets, blob = array("I", [0]), bytearray()
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, array("B", blob)
+
+
+def _interned(values: Sequence[str]) -> Tuple[List[str], array]:
+    """Distinct values (first-seen order) and each value's index into them."""
+    table: Dict[str, int] = {}
+    codes = array("H", (table.setdefault(value, len(table)) for value in values))
+    return list(table), codes
+
+
+def data_version(conn: sqlite3.Connection) -> int:
+    """The DataVersions 'recipes' counter, or -1 when the database has no version triggers.
+
+    Databases whose triggers predate Ingredients tracking also report -1: an
+    ingredient rename would not move their counter (query_cache.ensure_version_tracking
+    adds the missing triggers).
+    """
+    try:
+        row = conn.execute(
+            "SELECT version FROM DataVersions WHERE name = 'recipes' AND EXISTS "
+            "(SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_ingredients_version_update')"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return -1
+    return row[0] if row else -1
+
+
+def export(conn: sqlite3.Connection, path: Path) -> Dict[str, int]:
+    """Write the catalog in ``conn`` to ``path`` (atomically); returns section sizes in bytes.
+
+    The counter and every table are read in one transaction, so the recorded
+    version matches the catalog written even while other connections write.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(RecipeIngredients)")}
+    # The compact layout (compact_layout.py) stores unit ids; its decode view has the text.
+    links_source = "RecipeIngredients" if "unit" in columns else "RecipeIngredientsText"
+
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN")
+    try:
+        version = data_version(conn)
+        recipes = conn.execute("SELECT id, name, COALESCE(cuisine, ''), favorite FROM Recipes ORDER BY id").fetchall()
+        links = conn.execute(
+            f"SELECT recipe_id, ingredient_id, quantity, unit, optional FROM {links_source} "
+            "ORDER BY recipe_id, ingredient_id"
+        ).fetchall()
+        ingredients = conn.execute("SELECT id, name FROM Ingredients ORDER BY id").fetchall()
+    finally:
+        if own_transaction:
+            conn.execute("COMMIT")
+
+    positions = {row[0]: pos for pos, row in enumerate(recipes)}
+    cuisines, cuisine_codes = _interned([row[2] for row in recipes])
+    link_offsets = array("I", [0] * (len(recipes) + 1))
+    link_ingredient, link_quantity, link_optional, link_units = array("q"), array("d"), array("B"), []
+    for recipe_id, ingredient_id, quantity, unit, optional in links:
+        if recipe_id not in positions:
+            continue
+        link_offsets[positions[recipe_id] + 1] += 1
+        link_ingredient.append(ingredient_id)
+        link_quantity.append(quantity)
+        link_units.append(unit)
+        link_optional.append(1 if optional else 0)
+    for pos in range(len(recipes)):
+        link_offsets[pos + 1] += link_offsets[pos]
+    units, link_unit = _interned(link_units)
+
+    ingredient_pos = {row[0]: pos for pos, row in enumerate(ingredients)}
+    users: List[List[int]] = [[] for _ in ingredients]
+    for pos in range(len(recipes)):
+        for link in range(link_offsets[pos], link_offsets[pos + 1]):
+            users[ingredient_pos[link_ingredient[link]]].append(pos)
+    usage_offsets, usage_recipes = array("I", [0]), array("I")
+    for recipe_positions in users:
+        usage_recipes.extend(recipe_positions)
+        usage_offsets.append(len(usage_recipes))
+
+    recipe_name_offsets, recipe_names = _string_table([row[1] for row in recipes])
+    cuisine_offsets, cuisine_blob = _string_table(cuisines)
+    unit_offsets, unit_blob = _string_table(units)
+    ingredient_name_offsets, ingredient_names = _string_table([row[1] for row in ingredients])
+    arrays = {
+        "recipe_ids": array("q", (row[0] for row in recipes)),
+        "recipe_flags": array("B", (FAVORITE if row[3] else 0 for row in recipes)),
+        "recipe_cuisine": cuisine_codes,
+        "recipe_name_offsets": recipe_name_offsets,
+        "recipe_names": recipe_names,
+        "cuisine_offsets": cuisine_offsets,
+        "cuisines": cuisine_blob,
+        "link_offsets": link_offsets,
+        "link_ingredient": link_ingredient,
+        "link_quantity": link_quantity,
+        "link_unit": link_unit,
+        "link_optional": link_optional,
+        "unit_offsets": unit_offsets,
+        "units": unit_blob,
+        "ingredient_ids": array("q", (row[0] for row in ingredients)),
+        "ingredient_name_offsets": ingredient_name_offsets,
+        "ingredient_names": ingredient_names,
+        "usage_offsets": usage_offsets,
+        "usage_recipes": usage_recipes,
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    offset = HEADER.size + SECTION.size * len(SECTIONS)
+    table, sizes = [], {}
+    for name, typecode in SECTIONS:
+        data = arrays[name]
+        assert data.typecode == typecode, name
+        offset += -offset % ALIGN
+        table.append((offset, len(data)))
+        sizes[name] = len(data) * data.itemsize
+        offset += sizes[name]
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(HEADER.pack(MAGIC, FORMAT_VERSION, sys.byteorder == "little", len(SECTIONS), version))
+        for entry in table:
+            fh.write(SECTION.pack(*entry))
+        for (name, _), (start, _) in zip(SECTIONS, table):
+            fh.write(b"\0" * (start - fh.tell()))
+            arrays[name].tofile(fh)
+    os.replace(tmp, path)
+    return sizes
+
+
+# Reader ------------------------------------------------------------------------
+class RecipeSnapshot:
+    """Read-only, zero-copy view of an exported catalog; section arrays are ``memoryview`` casts."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = []
+        try:
+            self._load()
+        except BaseException:
+            self.close()
+            raise
+
+    def _load(self) -> None:
+        buffer = memoryview(self._map)
+        self._views.append(buffer)
+        if len(buffer) < HEADER.size:
+            raise ValueError(f"{self.path} is not a recipe catalog snapshot")
+        magic, version, little, count, self.data_version = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != FORMAT_VERSION or count != len(SECTIONS):
+            raise ValueError(f"{self.path} is not a version {FORMAT_VERSION} recipe catalog snapshot")
+        if bool(little) != (sys.byteorder == "little"):
+            raise ValueError(f"{self.path} was exported on a machine with the other byte order")
+        for index, (name, typecode) in enumerate(SECTIONS):
+            start, items = SECTION.unpack_from(buffer, HEADER.size + index * SECTION.size)
+            view = buffer[start:start + items * struct.calcsize(typecode)].cast(typecode)
+            self._views.append(view)
+            setattr(self, name, view)
+        # A handful of distinct units; decoding them once keeps ``links`` to C-level slicing.
+        self._units = [self._string(self.unit_offsets, self.units, code) for code in range(len(self.unit_offsets) - 1)]
+
+    def close(self) -> None:
+        # The mmap refuses to close while views into it are alive.
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._map.close()
+
+    def __enter__(self) -> "RecipeSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.recipe_ids)
+
+    def __contains__(self, recipe_id: int) -> bool:
+        return self._find(self.recipe_ids, recipe_id) is not None
+
+    @staticmethod
+    def _find(ids: memoryview, key: int) -> int | None:
+        pos = bisect.bisect_left(ids, key)
+        return pos if pos < len(ids) and ids[pos] == key else None
+
+    def _position(self, recipe_id: int) -> int:
+        pos = self._find(self.recipe_ids, recipe_id)
+        if pos is None:
+            raise KeyError(recipe_id)
+        return pos
+
+    @staticmethod
+    def _string(offsets: memoryview, blob: memoryview, index: int) -> str:
+        return str(blob[offsets[index]:offsets[index + 1]], "utf-8")
+
+    def is_current(self, conn: sqlite3.Connection) -> bool:
+        """False when the database's recipes counter moved since export (or it has none)."""
+        return self.data_version >= 0 and data_version(conn) == self.data_version
+
+    def name(self, recipe_id: int) -> str:
+        return self._string(self.recipe_name_offsets, self.recipe_names, self._position(recipe_id))
+
+    def cuisine(self, recipe_id: int) -> str | None:
+        code = self.recipe_cuisine[self._position(recipe_id)]
+        return self._string(self.cuisine_offsets, self.cuisines, code) or None
+
+    def favorite(self, recipe_id: int) -> bool:
+        return bool(self.recipe_flags[self._position(recipe_id)] & FAVORITE)
+
+    def ingredients_of(self, recipe_id: int) -> memoryview:
+        """The recipe's ingredient ids (ascending), as a slice of the mapped file."""
+        pos = self._position(recipe_id)
+        return self.link_ingredient[self.link_offsets[pos]:self.link_offsets[pos + 1]]
+
+    def links(self, recipe_id: int) -> List[Link]:
+        pos = self._position(recipe_id)
+        start, end = self.link_offsets[pos], self.link_offsets[pos + 1]
+        return list(
+            zip(
+                self.link_ingredient[start:end].tolist(),
+                self.link_quantity[start:end].tolist(),
+                map(self._units.__getitem__, self.link_unit[start:end]),
+                map(bool, self.link_optional[start:end]),
+            )
+        )
+
+    def ingredient_name(self, ingredient_id: int) -> str:
+        pos = self._find(self.ingredient_ids, ingredient_id)
+        if pos is None:
+            raise KeyError(ingredient_id)
+        return self._string(self.ingredient_name_offsets, self.ingredient_names, pos)
+
+    def recipes_using(self, ingredient_id: int) -> List[int]:
+        pos = self._find(self.ingredient_ids, ingredient_id)
+        if pos is None:
+            return []
+        users = self.usage_recipes[self.usage_offsets[pos]:self.usage_offsets[pos + 1]]
+        return [self.recipe_ids[recipe] for recipe in users]
+
+
+def load_dicts(conn: sqlite3.Connection) -> Tuple[Dict[int, dict], Dict[int, List[Link]]]:
+    """Baseline: what a worker builds per process today (recipes and their links as Python objects)."""
+    recipes = {
+        row[0]: {"name": row[1], "cuisine": row[2], "favorite": bool(row[3])}
+        for row in conn.execute("SELECT id, name, cuisine, favorite FROM Recipes")
+    }
+    links: Dict[int, List[Link]] = {}
+    for recipe_id, ingredient_id, quantity, unit, optional in conn.execute(
+        "SELECT recipe_id, ingredient_id, quantity, unit, optional FROM RecipeIngredients "
+        "ORDER BY recipe_id, ingredient_id"
+    ):
+        links.setdefault(recipe_id, []).append((ingredient_id, quantity, unit, bool(optional)))
+    return recipes, links
+
+
+# Benchmark ---------------------------------------------------------------------
+def _private_kb() -> int | None:
+    """Anonymous (process-private) resident memory; None where /proc is unavailable."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _worker_footprint(task: Tuple[str, str, str]) -> Tuple[float, int | None]:
+    """In a fresh process: load the catalog one way, touch every link, report (load ms, private KiB added)."""
+    import time
+
+    mode, db_path, snapshot_path = task
+    before = _private_kb()
+    start = time.perf_counter()
+    if mode == "sqlite":
+        conn = sqlite3.connect(db_path)
+        _, links = load_dicts(conn)
+        conn.close()
+        elapsed = (time.perf_counter() - start) * 1000.0
+        touched = sum(quantity for rows in links.values() for _, quantity, _, _ in rows)
+    else:
+        snapshot = RecipeSnapshot(Path(snapshot_path))
+        elapsed = (time.perf_counter() - start) * 1000.0
+        touched = sum(snapshot.link_quantity)
+    after = _private_kb()
+    assert touched >= 0
+    return elapsed, None if before is None or after is None else after - before
+
+
+def run_benchmark(scale: int, procs: int, lookups: int, repeat: int) -> None:
+    import concurrent.futures
+    import multiprocessing
+    import random
+    import statistics
+
+    import benchlib
+
+    db_path = benchlib.scaled_database(scale)
+    snapshot_path = db_path.with_suffix(".snap")
+    conn = sqlite3.connect(db_path)
+    try:
+        export(conn, snapshot_path)
+        recipes, links = load_dicts(conn)
+        rng = random.Random(3)
+        sample = rng.choices(sorted(recipes), k=lookups)
+        with RecipeSnapshot(snapshot_path) as snapshot:
+            for recipe_id in sample[:50]:
+                if snapshot.links(recipe_id) != links.get(recipe_id, []):
+                    raise SystemExit(f"snapshot disagrees with RecipeIngredients for recipe {recipe_id}")
+            results = {
+                "startup: load dicts from SQLite": benchlib.measure(lambda: load_dicts(conn), repeat),
+                "startup: export snapshot": benchlib.measure(lambda: export(conn, snapshot_path), repeat),
+                "startup: open snapshot": benchlib.measure(lambda: RecipeSnapshot(snapshot_path).close(), repeat),
+                f"{lookups} recipe lookups: dict.get": benchlib.measure(
+                    lambda: [links.get(recipe_id) for recipe_id in sample], repeat
+                ),
+                f"{lookups} recipe lookups: snapshot": benchlib.measure(
+                    lambda: [snapshot.links(recipe_id) for recipe_id in sample], repeat
+                ),
+                f"{lookups} ingredient-id slices: snapshot": benchlib.measure(
+                    lambda: [snapshot.ingredients_of(recipe_id) for recipe_id in sample], repeat
+                ),
+            }
+            size = snapshot_path.stat().st_size
+            link_count = len(snapshot.link_ingredient)
+    finally:
+        conn.close()
+    benchlib.print_results(
+        f"recipe catalog snapshot, scale x{scale} ({len(recipes)} recipes, {link_count} links, {size} bytes)", results
+    )
+
+    context = multiprocessing.get_context("spawn")
+    print(f"\n  fresh worker processes ({procs} each): load ms / private memory added")
+    with concurrent.futures.ProcessPoolExecutor(procs, mp_context=context, max_tasks_per_child=1) as pool:
+        for mode in ("sqlite", "snapshot"):
+            tasks = [(mode, str(db_path), str(snapshot_path))] * procs
+            footprints = list(pool.map(_worker_footprint, tasks))
+            load_ms = statistics.median(ms for ms, _ in footprints)
+            private = [kb for _, kb in footprints if kb is not None]
+            memory = f"{statistics.median(private):>8.0f} KiB" if private else "       n/a"
+            print(f"  {mode:<10} {load_ms:>10.2f} ms {memory}")
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["export", "show", "bench"])
+    parser.add_argument("recipe_id", nargs="?", type=int, help="show: recipe to print")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--snapshot", type=Path, default=DEFAULT_SNAPSHOT)
+    parser.add_argument("--scale", type=int, default=200, help="bench: dataset scale factor")
+    parser.add_argument("--procs", type=int, default=4, help="bench: worker processes per mode")
+    parser.add_argument("--lookups", type=int, default=1000, help="bench: random recipe lookups per case")
+    parser.add_argument("--repeat", type=int, default=5, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.scale, args.procs, args.lookups, args.repeat)
+        return
+    if args.command == "export":
+        if not args.db.exists():
+            print(f"Database not found at {args.db}", file=sys.stderr)
+            raise SystemExit(1)
+        conn = sqlite3.connect(args.db)
+        try:
+            sizes = export(conn, args.snapshot)
+        finally:
+            conn.close()
+        print(f"Wrote {args.snapshot} ({args.snapshot.stat().st_size} bytes)")
+        for name, size in sizes.items():
+            print(f"  {name:<26} {size:>10}")
+        return
+    if not args.snapshot.exists():
+        print(f"Snapshot not found at {args.snapshot} (run export first)", file=sys.stderr)
+        raise SystemExit(1)
+    with RecipeSnapshot(args.snapshot) as snapshot:
+        if args.recipe_id is None:
+            print(f"{len(snapshot)} recipes, {len(snapshot.link_ingredient)} links, "
+                  f"{len(snapshot.ingredient_ids)} ingredients (recipes version {snapshot.data_version})")
+            return
+        if args.recipe_id not in snapshot:
+            print(f"Recipe {args.recipe_id} is not in {args.snapshot}", file=sys.stderr)
+            raise SystemExit(1)
+        flags = " (favorite)" if snapshot.favorite(args.recipe_id) else ""
+        print(f"#{args.recipe_id} {snapshot.name(args.recipe_id)} [{snapshot.cuisine(args.recipe_id) or '-'}]{flags}")
+        for ingredient_id, quantity, unit, optional in snapshot.links(args.recipe_id):
+            suffix = " (optional)" if optional else ""
+            print(f"  {quantity:g} {unit} {snapshot.ingredient_name(ingredient_id)}{suffix}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Bulk shopping checkout: move bought ShoppingItems into Inventory.
+
+Marking N items as bought used to mean N status updates plus N Inventory
+upserts, each reconciling units on its own. ``checkout_items`` applies the
+whole batch with a handful of set-based statements inside one transaction:
+
+  1. stage the pending items, converted into the target unit, in a temp table;
+  2. upsert one summed row per ingredient into Inventory (refreshing
+     updated_at);
+  3. flip the staged items to 'bought';
+  4. append one 'restock' event per ingredient to the inventory log
+     (inventory_log.py), when the database has one.
+
+Both paths go through the DAO layer (scripts/dao): the bulk statements run on
+the pooled connection of one ``Database.transaction``; the row-by-row
+reference path uses the table DAOs item by item.
+
+Quantities land in the unit already used by the Inventory row, or in the
+ingredient's default unit for new rows. Mass and volume units convert within
+their family (g/kg, ml/l); an item whose unit cannot be converted (say, "pcs"
+of something stocked in grams) is left pending and reported as skipped, as
+are ids that are unknown or no longer pending.
+
+Usage:
+    python scripts/shopping_checkout.py --db path/to/moonyam.db 3 7 12
+    python scripts/shopping_checkout.py --db path/to/moonyam.db --all-pending
+    python scripts/shopping_checkout.py bench --scale 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime as dt
+import json
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import inventory_log
+from dao import WAL_PRAGMAS, Database, InventoryEntity
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+# unit -> (family, factor to the family's base unit)
+UNIT_FACTORS: Dict[str, Tuple[str, float]] = {
+    "g": ("mass", 1.0),
+    "kg": ("mass", 1000.0),
+    "ml": ("volume", 1.0),
+    "l": ("volume", 1000.0),
+    "pcs": ("count", 1.0),
+}
+
+UNIT_FACTORS_CTE = "unit_factors(unit, family, factor) AS (VALUES {})".format(
+    ", ".join(f"('{unit}', '{family}', {factor!r})" for unit, (family, factor) in UNIT_FACTORS.items())
+)
+
+CREATE_BATCH_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS checkout_batch (
+    item_id INTEGER PRIMARY KEY,
+    ingredient_id INTEGER NOT NULL,
+    quantity REAL NOT NULL,
+    unit TEXT NOT NULL
+)
+"""
+
+STAGE_SQL = f"""
+INSERT INTO temp.checkout_batch (item_id, ingredient_id, quantity, unit)
+WITH {UNIT_FACTORS_CTE}
+SELECT s.id,
+       s.ingredient_id,
+       CASE WHEN s.unit = target.unit THEN s.quantity
+            ELSE s.quantity * src.factor / dst.factor END,
+       target.unit
+FROM (SELECT DISTINCT value FROM json_each(?)) AS picked
+CROSS JOIN ShoppingItems AS s ON s.id = picked.value
+JOIN (
+    SELECT i.id AS ingredient_id, COALESCE(inv.unit, i.default_unit) AS unit
+    FROM Ingredients AS i
+    LEFT JOIN Inventory AS inv ON inv.ingredient_id = i.id
+) AS target ON target.ingredient_id = s.ingredient_id
+LEFT JOIN unit_factors AS src ON src.unit = s.unit
+LEFT JOIN unit_factors AS dst ON dst.unit = target.unit
+WHERE s.status = 'pending'
+  AND (s.unit = target.unit OR src.family = dst.family)
+"""
+
+UPSERT_SQL = """
+INSERT INTO Inventory (ingredient_id, quantity, unit, updated_at)
+SELECT ingredient_id, SUM(quantity), unit, ?
+FROM temp.checkout_batch
+GROUP BY ingredient_id
+ON CONFLICT (ingredient_id) DO UPDATE SET
+    quantity = Inventory.quantity + excluded.quantity,
+    updated_at = excluded.updated_at
+"""
+
+MARK_BOUGHT_SQL = """
+UPDATE ShoppingItems SET status = 'bought'
+WHERE id IN (SELECT item_id FROM temp.checkout_batch)
+"""
+
+
+def _timestamp(now: dt.datetime | None) -> str:
+    return (now or dt.datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def convert(quantity: float, unit: str, target: str) -> float | None:
+    if unit == target:
+        return quantity
+    src, dst = UNIT_FACTORS.get(unit), UNIT_FACTORS.get(target)
+    if src is None or dst is None or src[0] != dst[0]:
+        return None
+    return quantity * src[1] / dst[1]
+
+
+def checkout_items(db: Database, item_ids: Sequence[int], now: dt.datetime | None = None) -> Dict[str, object]:
+    """Mark ``item_ids`` as bought and add them to Inventory in one transaction."""
+    ids_json = json.dumps(list(item_ids))
+    stamp = _timestamp(now)
+    # The temp table lives on the pooled connection the transaction holds.
+    with db.transaction() as conn:
+        conn.execute(CREATE_BATCH_SQL)
+        conn.execute("DELETE FROM temp.checkout_batch")
+        conn.execute(STAGE_SQL, (ids_json,))
+        ingredients = conn.execute(UPSERT_SQL, (stamp,)).rowcount
+        bought = conn.execute(MARK_BOUGHT_SQL).rowcount
+        restocked = conn.execute(
+            "SELECT ingredient_id, SUM(quantity) FROM temp.checkout_batch GROUP BY ingredient_id"
+        ).fetchall()
+        inventory_log.log_changes(conn, dict(restocked), stamp)
+        staged = {row[0] for row in conn.execute("SELECT item_id FROM temp.checkout_batch")}
+        conn.execute("DELETE FROM temp.checkout_batch")
+    # Like the row-by-row path, a repeated id counts once and its repeats are skipped.
+    skipped: List[int] = []
+    for item_id in item_ids:
+        if item_id in staged:
+            staged.discard(item_id)
+        else:
+            skipped.append(item_id)
+    return {"bought": bought, "ingredients": ingredients, "skipped": skipped}
+
+
+def checkout_items_row_by_row(
+    db: Database,
+    item_ids: Sequence[int],
+    now: dt.datetime | None = None,
+    commit_each: bool = True,
+) -> Dict[str, object]:
+    """Reference path: one DAO lookup, unit reconciliation and upsert per item."""
+    stamp = _timestamp(now)
+    bought = 0
+    touched = set()
+    skipped: List[int] = []
+    # Per-item transactions join the outer one when everything commits at the end.
+    with contextlib.nullcontext() if commit_each else db.transaction():
+        for item_id in item_ids:
+            item = db.shopping.find_by_id(item_id)
+            if item is None or item.status != "pending":
+                skipped.append(item_id)
+                continue
+            stock = db.inventory.get(item.ingredient_id)
+            target = stock.unit if stock else db.ingredients.find_by_id(item.ingredient_id).default_unit
+            amount = convert(item.quantity, item.unit, target)
+            if amount is None:
+                skipped.append(item_id)
+                continue
+            with db.transaction() as conn:
+                if stock is None:
+                    db.inventory.upsert(InventoryEntity(item.ingredient_id, amount, target, None, stamp))
+                else:
+                    db.inventory.adjust(item.ingredient_id, amount, stamp)
+                db.shopping.set_status(item_id, "bought")
+                inventory_log.log_changes(conn, {item.ingredient_id: amount}, stamp)
+            bought += 1
+            touched.add(item.ingredient_id)
+    return {"bought": bought, "ingredients": len(touched), "skipped": skipped}
+
+
+def pending_ids(db: Database) -> List[int]:
+    return [item.id for item in db.shopping.get_by_status("pending")]
+
+
+# Benchmark --------------------------------------------------------------------
+def _snapshot(db: Database) -> Tuple[list, list]:
+    with db.connection() as conn:
+        inventory = conn.execute("SELECT ingredient_id, round(quantity, 6), unit FROM Inventory ORDER BY 1").fetchall()
+        statuses = conn.execute("SELECT id, status FROM ShoppingItems ORDER BY id").fetchall()
+    return inventory, statuses
+
+
+def run_benchmark(scale: int, repeat: int) -> None:
+    import benchlib
+
+    pristine = benchlib.scaled_database(scale)
+    work = pristine.with_name("checkout-work.db")
+    now = dt.datetime(2030, 1, 1)
+    state: Dict[str, object] = {}
+
+    def reset(repeats: bool = False) -> None:
+        if "db" in state:
+            state["db"].close()
+        shutil.copyfile(pristine, work)
+        state["db"] = Database(work, pragmas=WAL_PRAGMAS)
+        state["ids"] = pending_ids(state["db"])
+        if repeats:
+            state["ids"] += state["ids"][::10]
+
+    strategies = {
+        "row-by-row, commit per item": lambda: checkout_items_row_by_row(state["db"], state["ids"], now),
+        "row-by-row, one transaction": lambda: checkout_items_row_by_row(
+            state["db"], state["ids"], now, commit_each=False
+        ),
+        "set-based bulk checkout": lambda: checkout_items(state["db"], state["ids"], now),
+    }
+    for repeats in (False, True):
+        outcomes = []
+        for run in strategies.values():
+            reset(repeats)
+            summary = run()
+            outcomes.append((summary, _snapshot(state["db"])))
+        if any(outcome != outcomes[0] for outcome in outcomes):
+            label = " with repeated ids" if repeats else ""
+            raise SystemExit(f"checkout strategies disagree on the summary or resulting state{label}")
+    reset()
+    item_count = len(state["ids"])
+
+    results = {name: benchlib.measure(run, repeat, warmup=0, setup=reset) for name, run in strategies.items()}
+    state["db"].close()
+    benchlib.print_results(f"shopping checkout of {item_count} pending items, scale x{scale}", results)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("items", nargs="*", help='ShoppingItems ids to check out, or "bench"')
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--all-pending", action="store_true", help="check out every pending item")
+    parser.add_argument("--scale", type=int, default=200, help="bench: dataset scale factor")
+    parser.add_argument("--repeat", type=int, default=5, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.items == ["bench"]:
+        run_benchmark(args.scale, args.repeat)
+        return
+    if not args.db.exists():
+        print(f"Database not found at {args.db}", file=sys.stderr)
+        raise SystemExit(1)
+    with Database(args.db) as db:
+        ids = pending_ids(db) if args.all_pending else [int(item) for item in args.items]
+        summary = checkout_items(db, ids)
+    print(
+        f"Bought {summary['bought']} items across {summary['ingredients']} ingredients; "
+        f"skipped {len(summary['skipped'])}: {summary['skipped']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
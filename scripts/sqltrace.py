@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Statement-level SQLite instrumentation with a hot-query JSON report.
+
+``install(path)`` makes every connection opened afterwards through
+``sqlite3.connect`` a ``TracedConnection`` and writes the report to ``path``
+at exit. Per normalized statement (literals -> ``?``, ``VALUES`` groups and
+``IN`` lists collapsed) it aggregates:
+
+  * executions, total / mean / max wall time (execute plus row fetching);
+  * rows_changed (``total_changes`` delta, trigger writes included) and
+    rows_returned;
+  * vm_steps from the progress handler (every PROGRESS_OPS VDBE instructions);
+  * trigger_events - trace-callback events beyond one per execution, i.e.
+    trace events SQLite emitted inside triggers on behalf of this statement.
+    That is one per trigger program entry plus one per statement the trigger
+    runs, so a single-statement trigger adds 2 per firing. Python hands both
+    kinds to the callback with the outer statement's text, so they cannot be
+    told apart and are reported together.
+
+The cursor methods delimit executions; the trace callback only counts what
+SQLite ran inside them. ``executescript`` is split into statements with
+``sqlite3.complete_statement`` and each one runs as its own execution, with
+the connection in autocommit mode just as executescript itself runs them.
+
+Off by default and free when off: nothing is patched until ``install`` runs.
+The loader (``generate_seed_data.py --trace``), the replay driver
+(``inventory_log.py --trace``) and every benchmark (``MOONYAM_SQLTRACE=path``,
+read by benchlib) switch it on.
+
+Usage:
+    MOONYAM_SQLTRACE=build/trace.json python scripts/use_it_up.py bench
+    python scripts/generate_seed_data.py --scale 50 --db /tmp/x.db --no-sql --trace build/load.json
+    python scripts/sqltrace.py show build/load.json --top 10
+    python scripts/sqltrace.py bench --scale 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import datetime as dt
+import functools
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+ENV_VAR = "MOONYAM_SQLTRACE"
+PROGRESS_OPS = 1000
+DEFAULT_TOP = 20
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_SPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, ?\?)+\)", re.IGNORECASE)
+_VALUE_GROUPS = re.compile(r"(\((?:\?|NULL)(?:, ?(?:\?|NULL))*\))(?:, ?\((?:\?|NULL)(?:, ?(?:\?|NULL))*\))+")
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize(sql: str) -> str:
+    """Statement shape: literals become ``?``, whitespace and repeated value groups collapse."""
+    text = _STRING.sub("?", sql)
+    text = _NUMBER.sub("?", text)
+    text = _SPACE.sub(" ", text).strip().rstrip(";").strip()
+    text = _IN_LIST.sub("IN (?)", text)
+    return _VALUE_GROUPS.sub(r"\1, ...", text)
+
+
+class StatementStats:
+    __slots__ = ("executions", "total_ms", "max_ms", "rows_changed", "rows_returned", "vm_steps", "trigger_events")
+
+    def __init__(self) -> None:
+        self.executions = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows_changed = 0
+        self.rows_returned = 0
+        self.vm_steps = 0
+        self.trigger_events = 0
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "executions": self.executions,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.executions, 4) if self.executions else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "rows_changed": self.rows_changed,
+            "rows_returned": self.rows_returned,
+            "vm_steps": self.vm_steps,
+            "trigger_events": self.trigger_events,
+        }
+
+
+class Registry:
+    """Process-wide statistics, shared by every traced connection."""
+
+    def __init__(self, label: str = "") -> None:
+        self.label = label or " ".join(Path(arg).name for arg in sys.argv[:2])
+        self.started = dt.datetime.now()
+        self._stats: Dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        sql: str,
+        executions: int,
+        elapsed_ms: float,
+        rows_changed: int = 0,
+        rows_returned: int = 0,
+        vm_steps: int = 0,
+        trigger_events: int = 0,
+    ) -> None:
+        """Add ``executions`` runs of ``sql``; executions=0 adds fetch time/rows to the last run."""
+        key = normalize(sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StatementStats()
+            stats.executions += executions
+            stats.total_ms += elapsed_ms
+            if executions:
+                stats.max_ms = max(stats.max_ms, elapsed_ms / executions)
+            stats.rows_changed += rows_changed
+            stats.rows_returned += rows_returned
+            stats.vm_steps += vm_steps
+            stats.trigger_events += trigger_events
+
+    def report(self, top: int = DEFAULT_TOP) -> Dict[str, object]:
+        with self._lock:
+            items = [(sql, stats.as_dict()) for sql, stats in self._stats.items()]
+        items.sort(key=lambda item: item[1]["total_ms"], reverse=True)
+        return {
+            "label": self.label,
+            "started_at": self.started.isoformat(timespec="seconds"),
+            "statements": len(items),
+            "totals": {
+                "executions": sum(stats["executions"] for _, stats in items),
+                "total_ms": round(sum(stats["total_ms"] for _, stats in items), 3),
+                "rows_changed": sum(stats["rows_changed"] for _, stats in items),
+                "rows_returned": sum(stats["rows_returned"] for _, stats in items),
+            },
+            "top": [{"sql": sql, **stats} for sql, stats in items[:top]],
+        }
+
+    def write(self, path: Path, top: int = DEFAULT_TOP) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(top), indent=2) + "\n")
+
+
+_registry: Registry | None = None
+_original_connect = sqlite3.connect
+
+
+def split_script(script: str) -> List[str]:
+    """Split an executescript script into its statements (trigger bodies stay whole)."""
+    statements: List[str] = []
+    start = end = 0
+    while (end := script.find(";", end) + 1) > 0:
+        if sqlite3.complete_statement(script[start:end]):
+            statements.append(script[start:end])
+            start = end
+    if any(line.strip() and not line.strip().startswith("--") for line in script[start:].splitlines()):
+        statements.append(script[start:])
+    return statements
+
+
+class _Counted:
+    """Wraps an executemany parameter iterable to count executions (which may be a generator)."""
+
+    def __init__(self, rows: Iterable) -> None:
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self) -> Iterator:
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+class TracedCursor(sqlite3.Cursor):
+    _sql: str | None = None
+    _fetched = 0
+    _fetch_ms = 0.0
+
+    def _flush(self) -> None:
+        if _registry is not None and self._sql is not None and (self._fetched or self._fetch_ms):
+            _registry.record(self._sql, 0, self._fetch_ms, rows_returned=self._fetched)
+        self._fetched, self._fetch_ms = 0, 0.0
+
+    def _run(self, method, sql: str, parameters, executions):
+        self._flush()
+        if _registry is None:  # connection outlived uninstall()
+            return method(sql, parameters)
+        conn = self.connection
+        events, ticks, changes = conn.trace_events, conn.vm_ticks, conn.total_changes
+        start = time.perf_counter()
+        try:
+            return method(sql, parameters)
+        finally:
+            count = executions() if callable(executions) else executions
+            _registry.record(
+                sql,
+                count,
+                (time.perf_counter() - start) * 1000.0,
+                rows_changed=conn.total_changes - changes,
+                vm_steps=(conn.vm_ticks - ticks) * PROGRESS_OPS,
+                trigger_events=max(conn.trace_events - events - count, 0),
+            )
+            self._sql = sql
+
+    def execute(self, sql: str, parameters=()):
+        return self._run(super().execute, sql, parameters, 1)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        rows = _Counted(seq_of_parameters)
+        return self._run(super().executemany, sql, rows, lambda: rows.count)
+
+    def executescript(self, sql_script: str):
+        self._flush()
+        if _registry is None:
+            return super().executescript(sql_script)
+        conn = self.connection
+        if conn.in_transaction:
+            conn.commit()
+        isolation_level, conn.isolation_level = conn.isolation_level, None
+        try:
+            for statement in split_script(sql_script):
+                self._run(super().execute, statement, (), 1)
+                sqlite3.Cursor.fetchall(self)  # executescript steps every statement to completion
+        finally:
+            conn.isolation_level = isolation_level
+            self._sql = None
+        return self
+
+    def _timed_fetch(self, fetch, *args):
+        start = time.perf_counter()
+        result = fetch(*args)
+        self._fetch_ms += (time.perf_counter() - start) * 1000.0
+        return result
+
+    def fetchone(self):
+        row = self._timed_fetch(super().fetchone)
+        if row is not None:
+            self._fetched += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._timed_fetch(super().fetchmany, *args)
+        self._fetched += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed_fetch(super().fetchall)
+        self._fetched += len(rows)
+        self._flush()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed_fetch(super().__next__)
+        except StopIteration:
+            self._flush()
+            raise
+        self._fetched += 1
+        return row
+
+    def close(self) -> None:
+        self._flush()
+        super().close()
+
+    def __del__(self) -> None:
+        self._flush()
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose cursors report to the installed registry."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.trace_events = 0
+        self.vm_ticks = 0
+        self.set_trace_callback(self._on_trace)
+        self.set_progress_handler(self._on_progress, PROGRESS_OPS)
+
+    def _on_trace(self, sql: str) -> None:
+        if sql.startswith("BEGIN") and self.isolation_level is not None and _registry is not None:
+            # The implicit BEGIN sqlite3 issues before the first DML statement.
+            _registry.record("BEGIN", 1, 0.0)
+            return
+        self.trace_events += 1
+
+    def _on_progress(self) -> int:
+        self.vm_ticks += 1
+        return 0
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or TracedCursor)
+
+    # The C shortcuts create a plain cursor internally, so route them explicitly.
+    def execute(self, sql: str, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script: str):
+        return self.cursor().executescript(sql_script)
+
+    def _timed(self, name: str, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if _registry is not None:
+                _registry.record(name, 1, (time.perf_counter() - start) * 1000.0)
+
+    def commit(self) -> None:
+        self._timed("COMMIT", super().commit)
+
+    def rollback(self) -> None:
+        self._timed("ROLLBACK", super().rollback)
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.in_transaction:
+            return super().__exit__(exc_type, exc, tb)
+        return self._timed("COMMIT" if exc_type is None else "ROLLBACK", super().__exit__, exc_type, exc, tb)
+
+
+def _connect(*args, **kwargs):
+    kwargs.setdefault("factory", TracedConnection)
+    return _original_connect(*args, **kwargs)
+
+
+def install(path: Path | str | None = None, top: int = DEFAULT_TOP, label: str = "") -> Registry | None:
+    """Trace connections opened from now on and write the report to ``path`` (or $MOONYAM_SQLTRACE) at exit.
+
+    Returns the registry, or None when neither a path nor the environment variable is set.
+    """
+    global _registry
+    path = path or os.environ.get(ENV_VAR)
+    if not path:
+        return None
+    if _registry is None:
+        _registry = Registry(label)
+        sqlite3.connect = _connect
+        atexit.register(lambda: _registry is not None and _registry.write(Path(path), top))
+    return _registry
+
+
+def uninstall() -> Registry | None:
+    """Stop tracing new connections; returns the registry collected so far (its report is not written)."""
+    global _registry
+    registry, _registry = _registry, None
+    sqlite3.connect = _original_connect
+    return registry
+
+
+def print_report(report: Dict[str, object], top: int = DEFAULT_TOP) -> None:
+    totals = report["totals"]
+    print(f"{report['label']}  ({report['statements']} statements, {totals['executions']} executions, "
+          f"{totals['total_ms']:.0f} ms)")
+    print(f"  {'total ms':>10} {'count':>9} {'max ms':>9} {'changed':>9} {'returned':>9} {'trig ev':>8}  statement")
+    for entry in report["top"][:top]:
+        sql = entry["sql"] if len(entry["sql"]) <= 70 else entry["sql"][:67] + "..."
+        print(
+            f"  {entry['total_ms']:>10.1f} {entry['executions']:>9} {entry['max_ms']:>9.2f} "
+            f"{entry['rows_changed']:>9} {entry['rows_returned']:>9} {entry['trigger_events']:>8}  {sql}"
+        )
+
+
+def run_benchmark(scale: int, repeat: int) -> None:
+    import random
+
+    import benchlib
+    import generate_seed_data as seed
+
+    dataset = seed.generate_dataset(scale, random.Random(42))
+    path = benchlib.BENCH_DIR / f"trace-x{scale}.db"
+    results = {"write_db, tracing off": benchlib.measure(lambda: seed.write_db(path, dataset), repeat, warmup=0)}
+    install(path.with_suffix(".json"), label=f"write_db x{scale}")
+    try:
+        results["write_db, tracing on"] = benchlib.measure(lambda: seed.write_db(path, dataset), repeat, warmup=0)
+        report = _registry.report(5)
+    finally:
+        uninstall()
+    benchlib.print_results(f"sqltrace overhead, seed load at scale x{scale}", results)
+    print()
+    print_report(report, 5)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["show", "bench"])
+    parser.add_argument("report", nargs="?", type=Path, help="show: JSON report written by a traced run")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    parser.add_argument("--scale", type=int, default=20, help="bench: dataset scale factor")
+    parser.add_argument("--repeat", type=int, default=3, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.scale, args.repeat)
+        return
+    if args.report is None or not args.report.exists():
+        print(f"Trace report not found at {args.report}", file=sys.stderr)
+        raise SystemExit(1)
+    print_report(json.loads(args.report.read_text()), args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Carve a small, referentially complete dev database out of a large one.
+
+``subset_database`` samples N recipes stratified by (cuisine, favorite), so the
+subset keeps the source's mix, and follows foreign keys from there:
+
+  Recipes -> RecipeIngredients -> Ingredients -> Inventory, ShoppingItems, InventoryEvents
+  Recipes -> MealPlans, MealPlanRules, CookHistory
+
+Inventory checkpoints and cook rollups are rebuilt from the copied rows rather
+than copied. Tables the source's schema predates (e.g. MealPlanRules or
+InventoryEvents in an older app database) are skipped and stay empty.
+
+On top of that the same share of the whole catalog is sampled per category,
+so pantry rows for ingredients no recipe uses survive too. Every step is one
+``INSERT ... SELECT`` that walks a temp key table and probes the attached
+source through its primary-key / foreign-key indexes (CROSS JOIN pins that
+order; the planner has no statistics for the temp tables); no per-row round
+trips. Ids are kept as they are, so rows can be traced back to the source.
+
+Usage:
+    python scripts/subset_db.py --source big.db --output dev.db --recipes 200
+    python scripts/subset_db.py bench --scale 200 --recipes 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import cook_rollups
+import generate_seed_data as seed
+import inventory_log
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+# (table, temp key table driving it, join column) in parent-first order.
+COPY_STEPS: List[Tuple[str, str, str]] = [
+    ("Ingredients", "keep_ingredients", "id"),
+    ("Recipes", "keep_recipes", "id"),
+    ("RecipeIngredients", "keep_recipes", "recipe_id"),
+    ("Inventory", "keep_ingredients", "ingredient_id"),
+    ("ShoppingItems", "keep_ingredients", "ingredient_id"),
+    ("MealPlans", "keep_recipes", "recipe_id"),
+    ("MealPlanRules", "keep_recipes", "recipe_id"),
+    ("CookHistory", "keep_recipes", "recipe_id"),
+    ("InventoryEvents", "keep_ingredients", "ingredient_id"),
+]
+
+
+def _read_only_uri(path: Path) -> str:
+    # as_uri() percent-escapes spaces, '?' and '#', which a bare "file:{path}" would misparse.
+    return f"{Path(path).resolve().as_uri()}?mode=ro"
+
+
+def _tables(conn: sqlite3.Connection, schema: str = "main") -> set:
+    return {name for (name,) in conn.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table'")}
+
+
+def stratified_sample(rows: Iterable[Tuple[int, object]], n: int, rng: random.Random) -> List[int]:
+    """Sample ``n`` ids from ``(id, stratum)`` rows, allocating per stratum by largest remainder."""
+    strata: Dict[object, List[int]] = {}
+    for row_id, stratum in rows:
+        strata.setdefault(stratum, []).append(row_id)
+    total = sum(len(ids) for ids in strata.values())
+    if n >= total:
+        return sorted(row_id for ids in strata.values() for row_id in ids)
+    quotas = {key: n * len(ids) / total for key, ids in strata.items()}
+    counts = {key: int(quota) for key, quota in quotas.items()}
+    leftover = n - sum(counts.values())
+    for key in sorted(quotas, key=lambda k: counts[k] - quotas[k])[:leftover]:
+        counts[key] += 1
+    sample: List[int] = []
+    for key in sorted(strata, key=repr):
+        sample.extend(rng.sample(strata[key], counts[key]))
+    return sorted(sample)
+
+
+def _copy_sql(table: str, keys: str, column: str) -> str:
+    columns = ", ".join(f"t.{col}" for col in seed.TABLE_COLUMNS[table])
+    return (
+        f"INSERT INTO main.{table} ({', '.join(seed.TABLE_COLUMNS[table])}) "
+        f"SELECT {columns} FROM temp.{keys} AS k CROSS JOIN src.{table} AS t ON t.{column} = k.id"
+    )
+
+
+def subset_database(
+    source: Path,
+    output: Path,
+    recipes: int,
+    seed_value: int = 42,
+    recipe_ids: Sequence[int] | None = None,
+    sample_catalog: bool = True,
+) -> Dict[str, int]:
+    """Write a subset of ``source`` with ``recipes`` sampled recipes (or exactly ``recipe_ids``) to ``output``.
+
+    Returns the number of rows copied per table.
+    """
+    rng = random.Random(seed_value)
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.exists():
+        output.unlink()
+    # URI filenames (for the read-only ATTACH) only work on a connection opened with uri=True.
+    conn = sqlite3.connect(output.resolve().as_uri(), uri=True, isolation_level=None)
+    try:
+        conn.executescript(seed.SCHEMA.read_text())
+        conn.execute("ATTACH DATABASE ? AS src", (_read_only_uri(source),))
+        conn.execute("BEGIN")
+        conn.execute("CREATE TEMP TABLE keep_recipes (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE keep_ingredients (id INTEGER PRIMARY KEY)")
+        total_recipes = conn.execute("SELECT COUNT(*) FROM src.Recipes").fetchone()[0]
+        if recipe_ids is None:
+            recipe_ids = stratified_sample(
+                ((row_id, (cuisine, favorite)) for row_id, cuisine, favorite in
+                 conn.execute("SELECT id, cuisine, favorite FROM src.Recipes")),
+                recipes,
+                rng,
+            )
+        conn.executemany("INSERT OR IGNORE INTO temp.keep_recipes (id) VALUES (?)", ((i,) for i in recipe_ids))
+        conn.execute(
+            "INSERT OR IGNORE INTO temp.keep_ingredients (id) "
+            "SELECT ri.ingredient_id FROM temp.keep_recipes AS k "
+            "CROSS JOIN src.RecipeIngredients AS ri ON ri.recipe_id = k.id"
+        )
+        if sample_catalog and total_recipes:
+            catalog_rows = list(conn.execute("SELECT id, category FROM src.Ingredients"))
+            share = round(len(catalog_rows) * len(recipe_ids) / total_recipes)
+            extra = stratified_sample(catalog_rows, share, rng)
+            conn.executemany("INSERT OR IGNORE INTO temp.keep_ingredients (id) VALUES (?)", ((i,) for i in extra))
+
+        present = _tables(conn, "src")
+        counts: Dict[str, int] = {}
+        with cook_rollups.bulk_load(conn):
+            for table, keys, column in COPY_STEPS:
+                if table not in present:
+                    counts[table] = 0  # newer than the source's schema
+                    continue
+                counts[table] = conn.execute(_copy_sql(table, keys, column)).rowcount
+        conn.execute("COMMIT")
+        conn.execute("DETACH DATABASE src")
+        inventory_log.rebuild_checkpoints(conn)
+        conn.execute("ANALYZE")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return counts
+
+
+def subset_row_by_row(source: Path, output: Path, recipe_ids: Sequence[int]) -> Dict[str, int]:
+    """Baseline: the foreign-key closure of ``recipe_ids`` fetched with one query per parent row."""
+    output = Path(output)
+    if output.exists():
+        output.unlink()
+    src = sqlite3.connect(_read_only_uri(source), uri=True)
+    dst = sqlite3.connect(output)
+    counts = {table: 0 for table, _, _ in COPY_STEPS}
+    present = _tables(src)
+
+    def insert(table: str, row: tuple) -> None:
+        columns = seed.TABLE_COLUMNS[table]
+        dst.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})", row
+        )
+        counts[table] += 1
+
+    def select(table: str, column: str, value: int) -> List[tuple]:
+        if table not in present:
+            return []
+        return src.execute(
+            f"SELECT {', '.join(seed.TABLE_COLUMNS[table])} FROM {table} WHERE {column} = ?", (value,)
+        ).fetchall()
+
+    try:
+        dst.executescript(seed.SCHEMA.read_text())
+        with dst:
+            seen_ingredients = set()
+            for recipe_id in recipe_ids:
+                links = select("RecipeIngredients", "recipe_id", recipe_id)
+                for link in links:
+                    ingredient_id = link[1]
+                    if ingredient_id in seen_ingredients:
+                        continue
+                    seen_ingredients.add(ingredient_id)
+                    for row in select("Ingredients", "id", ingredient_id):
+                        insert("Ingredients", row)
+                    for table in ("Inventory", "ShoppingItems", "InventoryEvents"):
+                        for row in select(table, "ingredient_id", ingredient_id):
+                            insert(table, row)
+                for row in select("Recipes", "id", recipe_id):
+                    insert("Recipes", row)
+                for link in links:
+                    insert("RecipeIngredients", link)
+                for table in ("MealPlans", "MealPlanRules", "CookHistory"):
+                    for row in select(table, "recipe_id", recipe_id):
+                        insert(table, row)
+        dst.execute("ANALYZE")
+    finally:
+        src.close()
+        dst.close()
+    return counts
+
+
+def print_counts(source_counts: Dict[str, int], counts: Dict[str, int]) -> None:
+    print(f"  {'table':<20} {'source':>10} {'subset':>10}")
+    for table, _, _ in COPY_STEPS:
+        print(f"  {table:<20} {source_counts.get(table, 0):>10} {counts[table]:>10}")
+
+
+def table_counts(path: Path) -> Dict[str, int]:
+    conn = sqlite3.connect(_read_only_uri(path), uri=True)
+    try:
+        present = _tables(conn)
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] if table in present else 0
+            for table, _, _ in COPY_STEPS
+        }
+    finally:
+        conn.close()
+
+
+def run_benchmark(scale: int, recipes: int, repeat: int) -> None:
+    import benchlib
+
+    source = benchlib.scaled_database(scale)
+    output = source.with_name("subset.db")
+    conn = sqlite3.connect(source)
+    recipe_ids = stratified_sample(
+        ((row_id, (cuisine, favorite)) for row_id, cuisine, favorite in
+         conn.execute("SELECT id, cuisine, favorite FROM Recipes")),
+        recipes,
+        random.Random(42),
+    )
+    conn.close()
+    counts = subset_database(source, output, recipes)
+    print_counts(table_counts(source), counts)
+    benchlib.print_results(
+        f"subset {recipes} recipes from scale x{scale}",
+        {
+            "one query per parent row": benchlib.measure(
+                lambda: subset_row_by_row(source, output, recipe_ids), repeat, warmup=0
+            ),
+            "set-based INSERT ... SELECT": benchlib.measure(
+                lambda: subset_database(source, output, recipes, recipe_ids=recipe_ids, sample_catalog=False),
+                repeat,
+                warmup=0,
+            ),
+        },
+    )
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["subset", "bench"], default="subset")
+    parser.add_argument("--source", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--output", type=Path, help="subset database to write")
+    parser.add_argument("--recipes", type=int, default=100, help="number of recipes to sample")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--check", action="store_true", help="validate the subset afterwards")
+    parser.add_argument("--scale", type=int, default=200, help="bench: source dataset scale factor")
+    parser.add_argument("--repeat", type=int, default=3, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.scale, args.recipes, args.repeat)
+        return
+    if not args.source.exists():
+        print(f"Database not found at {args.source}", file=sys.stderr)
+        raise SystemExit(1)
+    if args.output is None:
+        print("--output is required", file=sys.stderr)
+        raise SystemExit(2)
+    start = time.perf_counter()
+    counts = subset_database(args.source, args.output, args.recipes, args.seed)
+    print(f"Wrote {args.output} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    print_counts(table_counts(args.source), counts)
+    if args.check:
+        import validate_dataset
+
+        report = validate_dataset.validate_db(args.output)
+        report.print()
+        if not report.ok:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
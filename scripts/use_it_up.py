@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+"Use it up" recipe ranking for the Moonyam pantry app.
+
+Ranks recipes by how much soon-to-expire Inventory stock they consume. Only the
+pantry rows inside the expiry window are read (via idx_inventory_expiry), only
+recipes that touch one of those ingredients are scored (via
+idx_recipeingredients_ingredient), and the top k are picked with a bounded heap
+instead of sorting every candidate.
+
+Scoring: every expiring ingredient a recipe uses adds
+``urgency * share``, where urgency is ``1 / (1 + days_left)`` and share is the
+fraction of the stored quantity the recipe needs (capped at 1). Quantities in a
+different unit than the stored one cannot be compared without a conversion
+table, so they only add a small presence bonus.
+
+Usage:
+    python scripts/use_it_up.py --db src/main/resources/moonyam.db -k 5
+    python scripts/use_it_up.py bench --scale 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import heapq
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+UNIT_MISMATCH_SHARE = 0.1
+
+EXPIRING_LINKS_SQL = """
+SELECT ri.recipe_id, ri.quantity, ri.unit, inv.quantity, inv.unit, inv.expires_at
+FROM Inventory AS inv
+JOIN RecipeIngredients AS ri ON ri.ingredient_id = inv.ingredient_id
+WHERE inv.expires_at >= ? AND inv.expires_at <= ?
+"""
+
+ALL_LINKS_SQL = """
+SELECT ri.recipe_id, ri.quantity, ri.unit, inv.quantity, inv.unit, inv.expires_at
+FROM RecipeIngredients AS ri
+LEFT JOIN Inventory AS inv ON inv.ingredient_id = ri.ingredient_id
+"""
+
+LinkRow = Tuple[int, float, str, float, str, str]
+
+
+def expiry_window(today: dt.date, horizon_days: int) -> Tuple[str, str]:
+    return today.isoformat(), (today + dt.timedelta(days=horizon_days)).isoformat()
+
+
+def score_links(rows: Iterable[LinkRow], today: dt.date, horizon_days: int) -> Dict[int, float]:
+    low, high = expiry_window(today, horizon_days)
+    urgency_by_date: Dict[str, float] = {}
+    scores: Dict[int, float] = {}
+    for recipe_id, need, need_unit, have, have_unit, expires_at in rows:
+        if expires_at is None or not (low <= expires_at[:10] <= high):
+            continue
+        urgency = urgency_by_date.get(expires_at)
+        if urgency is None:
+            days_left = (dt.date.fromisoformat(expires_at[:10]) - today).days
+            urgency = urgency_by_date[expires_at] = 1.0 / (1 + max(days_left, 0))
+        if need_unit == have_unit and have > 0:
+            share = min(need / have, 1.0)
+        else:
+            share = UNIT_MISMATCH_SHARE
+        scores[recipe_id] = scores.get(recipe_id, 0.0) + urgency * share
+    return scores
+
+
+def top_recipes(
+    conn: sqlite3.Connection,
+    k: int = 10,
+    today: dt.date | None = None,
+    horizon_days: int = 7,
+) -> List[Tuple[int, float]]:
+    """Return up to ``k`` ``(recipe_id, score)`` pairs, best first."""
+    today = today or dt.date.today()
+    rows = conn.execute(EXPIRING_LINKS_SQL, expiry_window(today, horizon_days))
+    scores = score_links(rows, today, horizon_days)
+    return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+
+def top_recipes_full_scan(
+    conn: sqlite3.Connection,
+    k: int = 10,
+    today: dt.date | None = None,
+    horizon_days: int = 7,
+) -> List[Tuple[int, float]]:
+    """Reference implementation: score every recipe link and sort all of them."""
+    today = today or dt.date.today()
+    scores = score_links(conn.execute(ALL_LINKS_SQL), today, horizon_days)
+    ranked = sorted(scores.items(), key=lambda item: (item[1], -item[0]), reverse=True)
+    return ranked[:k]
+
+
+def describe(conn: sqlite3.Connection, ranked: List[Tuple[int, float]]) -> List[dict]:
+    if not ranked:
+        return []
+    ids = [recipe_id for recipe_id, _ in ranked]
+    placeholders = ", ".join("?" for _ in ids)
+    names = dict(conn.execute(f"SELECT id, name FROM Recipes WHERE id IN ({placeholders})", ids))
+    return [
+        {"recipe_id": recipe_id, "name": names.get(recipe_id), "score": round(score, 4)}
+        for recipe_id, score in ranked
+    ]
+
+
+def run_benchmark(scale: int, k: int, horizon_days: int, repeat: int) -> None:
+    import benchlib
+
+    path = benchlib.scaled_database(scale)
+    today = dt.date.today()
+    conn = sqlite3.connect(path)
+    try:
+        heap_ranked = top_recipes(conn, k, today, horizon_days)
+        full_ranked = top_recipes_full_scan(conn, k, today, horizon_days)
+        if [r for r, _ in heap_ranked] != [r for r, _ in full_ranked]:
+            raise SystemExit("indexed top-k ranking disagrees with the full scan")
+        counts = conn.execute("SELECT (SELECT COUNT(*) FROM Recipes), (SELECT COUNT(*) FROM Inventory)").fetchone()
+        results = {
+            "full scan + sort": benchlib.measure(
+                lambda: top_recipes_full_scan(conn, k, today, horizon_days), repeat
+            ),
+            "expiry index + heap": benchlib.measure(lambda: top_recipes(conn, k, today, horizon_days), repeat),
+        }
+    finally:
+        conn.close()
+    benchlib.print_results(
+        f"use-it-up top-{k}, scale x{scale} ({counts[0]} recipes, {counts[1]} inventory rows)", results
+    )
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["rank", "bench"], default="rank")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("-k", type=int, default=10, help="number of recipes to return")
+    parser.add_argument("--horizon", type=int, default=7, help="days ahead that count as expiring")
+    parser.add_argument("--today", type=dt.date.fromisoformat, help="reference date (default: today)")
+    parser.add_argument("--scale", type=int, default=100, help="bench: dataset scale factor")
+    parser.add_argument("--repeat", type=int, default=7, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.scale, args.k, args.horizon, args.repeat)
+        return
+    if not args.db.exists():
+        print(f"Database not found at {args.db}", file=sys.stderr)
+        raise SystemExit(1)
+    conn = sqlite3.connect(args.db)
+    try:
+        ranked = top_recipes(conn, args.k, args.today, args.horizon)
+        for row in describe(conn, ranked):
+            print(f"{row['score']:>8.4f}  #{row['recipe_id']:<6} {row['name']}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Single-pass integrity validator for generated datasets and built databases.
+
+Checks, per table, in one streaming pass (parents before children):
+
+  * primary keys unique (Inventory.ingredient_id, the (recipe_id,
+    ingredient_id) pair of RecipeIngredients, every surrogate id) and
+    Ingredients.name unique;
+  * every foreign key resolves;
+  * ShoppingItems.status is pending/bought/skipped, InventoryEvents.kind is a
+    known event kind;
+  * units are known, and agree with the ingredient's default_unit (a
+    disagreement is only a warning - the schema allows other units).
+
+Memory is bounded by the parent key space, not by row count: seen ids live in
+bitmaps, default units in a byte per ingredient (ids from DENSE_ID_LIMIT up,
+which would make those arrays huge, fall back to a set / dict), and (recipe_id,
+ingredient_id) pairs are checked one recipe at a time, which relies on links
+arriving grouped by recipe (generator order, and the primary-key order used
+when reading a database). Every violation is counted; the first few of each
+kind are kept as examples.
+
+Usage:
+    python scripts/validate_dataset.py --db src/main/resources/moonyam.db
+    python scripts/validate_dataset.py --scale 100
+    python scripts/validate_dataset.py bench --scale 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import operator
+import random
+import sqlite3
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+import generate_seed_data as seed
+import inventory_log
+import meal_calendar
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB = ROOT / "src" / "main" / "resources" / "moonyam.db"
+
+SHOPPING_STATUSES = ("pending", "bought", "skipped")
+UNITS = ("g", "kg", "ml", "l", "pcs")
+# Ids below this are tracked densely (a bit per id in bitmaps, at most 2 MiB,
+# plus a byte per ingredient id for default units); larger ids go to a set/dict.
+DENSE_ID_LIMIT = 1 << 24
+# Unit agreement is advisory; everything else blocks a load.
+WARNING_KINDS = {"unit_mismatch"}
+
+# Parents first, so children can be checked against the keys already seen.
+VALIDATION_ORDER = [
+    "Ingredients", "Recipes", "Inventory", "ShoppingItems", "RecipeIngredients", "MealPlans", "MealPlanRules",
+    "CookHistory", "InventoryEvents",
+]
+READ_ORDER = {
+    "Ingredients": "id",
+    "Recipes": "id",
+    "Inventory": "ingredient_id",
+    "ShoppingItems": "id",
+    "RecipeIngredients": "recipe_id, ingredient_id",
+    "MealPlans": "id",
+    "MealPlanRules": "id",
+    "CookHistory": "id",
+    "InventoryEvents": "id",
+}
+
+
+class Violation(NamedTuple):
+    table: str
+    row: int
+    kind: str
+    detail: str
+
+
+class _IdBitmap:
+    """Set of non-negative integer ids: one bit each below DENSE_ID_LIMIT, a plain set above it."""
+
+    __slots__ = ("bits", "sparse")
+
+    def __init__(self):
+        self.bits = bytearray()
+        self.sparse: set = set()
+
+    def __contains__(self, value: int) -> bool:
+        if value >= DENSE_ID_LIMIT:
+            return value in self.sparse
+        byte = value >> 3
+        return 0 <= byte < len(self.bits) and bool(self.bits[byte] & (1 << (value & 7)))
+
+    def add(self, value: int) -> None:
+        if value >= DENSE_ID_LIMIT:
+            self.sparse.add(value)
+            return
+        byte = value >> 3
+        if byte >= len(self.bits):
+            size = min(max(byte + 1, 2 * len(self.bits)), DENSE_ID_LIMIT >> 3)
+            self.bits.extend(bytes(size - len(self.bits)))
+        self.bits[byte] |= 1 << (value & 7)
+
+
+class ValidationReport:
+    def __init__(self, max_examples: int = 20):
+        self.max_examples = max_examples
+        self.counts: Counter = Counter()
+        self.examples: List[Violation] = []
+        self.rows: Counter = Counter()
+
+    def add(self, table: str, row: int, kind: str, detail: str) -> None:
+        key = (table, kind)
+        self.counts[key] += 1
+        if self.counts[key] <= self.max_examples:
+            self.examples.append(Violation(table, row, kind, detail))
+
+    @property
+    def errors(self) -> int:
+        return sum(count for (_, kind), count in self.counts.items() if kind not in WARNING_KINDS)
+
+    @property
+    def warnings(self) -> int:
+        return sum(count for (_, kind), count in self.counts.items() if kind in WARNING_KINDS)
+
+    @property
+    def ok(self) -> bool:
+        return self.errors == 0
+
+    def print(self, file=sys.stdout) -> None:
+        total = sum(self.rows.values())
+        print(f"Validated {total} rows: {self.errors} errors, {self.warnings} warnings", file=file)
+        for (table, kind), count in sorted(self.counts.items()):
+            level = "warning" if kind in WARNING_KINDS else "error"
+            print(f"  {level:<8} {table:<18} {kind:<22} {count:>9}", file=file)
+        for violation in self.examples:
+            print(f"    {violation.table} row {violation.row}: {violation.detail}", file=file)
+
+
+class _Validator:
+    def __init__(self, report: ValidationReport):
+        self.report = report
+        self.ingredient_ids = _IdBitmap()
+        self.default_units = bytearray()
+        self.sparse_default_units: Dict[int, int] = {}
+        self.recipe_ids = _IdBitmap()
+        self.unit_codes = {unit: code for code, unit in enumerate(UNITS, start=1)}
+
+    def _default_unit(self, ingredient_id: int) -> int:
+        """Unit code of the ingredient's default_unit, 0 when unknown."""
+        if ingredient_id >= DENSE_ID_LIMIT:
+            return self.sparse_default_units.get(ingredient_id, 0)
+        return self.default_units[ingredient_id] if 0 <= ingredient_id < len(self.default_units) else 0
+
+    def _check_unit(self, table: str, row: int, ingredient_id: int, unit: str) -> None:
+        code = self.unit_codes.get(unit)
+        default = self._default_unit(ingredient_id)
+        if code is None:
+            self.report.add(table, row, "unknown_unit", f"unit {unit!r} is not one of {', '.join(UNITS)}")
+        elif default not in (0, code):
+            expected = UNITS[default - 1]
+            self.report.add(
+                table, row, "unit_mismatch", f"ingredient {ingredient_id} uses {unit!r}, default_unit is {expected!r}"
+            )
+
+    def _unique(self, table: str, row: int, seen: _IdBitmap, value, column: str) -> None:
+        if not isinstance(value, int) or value < 0:
+            self.report.add(table, row, "bad_key", f"{column} {value!r} is not a non-negative integer")
+        elif value in seen:
+            self.report.add(table, row, "duplicate_key", f"{column} {value} appears more than once")
+        else:
+            seen.add(value)
+
+    def _reference(self, table: str, row: int, parents: _IdBitmap, value, column: str, parent: str) -> bool:
+        if not isinstance(value, int) or value not in parents:
+            self.report.add(table, row, "foreign_key", f"{column} {value!r} not found in {parent}")
+            return False
+        return True
+
+    def ingredients(self, rows: Iterable[tuple]) -> int:
+        # Names are only needed for uniqueness inside this table.
+        names: set = set()
+        count = 0
+        for count, (ingredient_id, name, default_unit, _category) in enumerate(rows, start=1):
+            self._unique("Ingredients", count, self.ingredient_ids, ingredient_id, "id")
+            if name in names:
+                self.report.add("Ingredients", count, "duplicate_name", f"name {name!r} appears more than once")
+            else:
+                names.add(name)
+            code = self.unit_codes.get(default_unit)
+            if code is None:
+                self.report.add("Ingredients", count, "unknown_unit", f"default_unit {default_unit!r} is not known")
+            elif isinstance(ingredient_id, int) and ingredient_id >= DENSE_ID_LIMIT:
+                self.sparse_default_units[ingredient_id] = code
+            elif isinstance(ingredient_id, int) and ingredient_id >= 0:
+                if ingredient_id >= len(self.default_units):
+                    self.default_units.extend(bytes(ingredient_id + 1 - len(self.default_units)))
+                self.default_units[ingredient_id] = code
+        return count
+
+    def recipes(self, rows: Iterable[tuple]) -> int:
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            self._unique("Recipes", count, self.recipe_ids, row[0], "id")
+        return count
+
+    def inventory(self, rows: Iterable[tuple]) -> int:
+        seen = _IdBitmap()
+        count = 0
+        for count, (ingredient_id, _quantity, unit, _expires, _updated) in enumerate(rows, start=1):
+            self._unique("Inventory", count, seen, ingredient_id, "ingredient_id")
+            if self._reference("Inventory", count, self.ingredient_ids, ingredient_id, "ingredient_id", "Ingredients"):
+                self._check_unit("Inventory", count, ingredient_id, unit)
+        return count
+
+    def shopping_items(self, rows: Iterable[tuple]) -> int:
+        seen = _IdBitmap()
+        count = 0
+        for count, (item_id, ingredient_id, _quantity, unit, status, _notes, _created) in enumerate(rows, start=1):
+            self._unique("ShoppingItems", count, seen, item_id, "id")
+            if self._reference("ShoppingItems", count, self.ingredient_ids, ingredient_id, "ingredient_id", "Ingredients"):
+                self._check_unit("ShoppingItems", count, ingredient_id, unit)
+            if status not in SHOPPING_STATUSES:
+                self.report.add("ShoppingItems", count, "bad_status", f"status {status!r} is not one of {SHOPPING_STATUSES}")
+        return count
+
+    def recipe_ingredients(self, rows: Iterable[tuple]) -> int:
+        finished = _IdBitmap()
+        current_recipe = None
+        current_links: set = set()
+        count = 0
+        for count, (recipe_id, ingredient_id, _quantity, unit, _optional) in enumerate(rows, start=1):
+            if recipe_id != current_recipe:
+                if isinstance(current_recipe, int) and current_recipe >= 0:
+                    finished.add(current_recipe)
+                if isinstance(recipe_id, int) and recipe_id in finished:
+                    self.report.add(
+                        "RecipeIngredients", count, "unordered_links",
+                        f"links for recipe {recipe_id} are not contiguous; pair uniqueness cannot be checked",
+                    )
+                current_recipe = recipe_id
+                current_links = set()
+            if ingredient_id in current_links:
+                self.report.add(
+                    "RecipeIngredients", count, "duplicate_key",
+                    f"(recipe_id, ingredient_id) ({recipe_id}, {ingredient_id}) appears more than once",
+                )
+            current_links.add(ingredient_id)
+            self._reference("RecipeIngredients", count, self.recipe_ids, recipe_id, "recipe_id", "Recipes")
+            if self._reference(
+                "RecipeIngredients", count, self.ingredient_ids, ingredient_id, "ingredient_id", "Ingredients"
+            ):
+                self._check_unit("RecipeIngredients", count, ingredient_id, unit)
+        return count
+
+    def recipe_events(self, table: str, rows: Iterable[tuple]) -> int:
+        seen = _IdBitmap()
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            self._unique(table, count, seen, row[0], "id")
+            self._reference(table, count, self.recipe_ids, row[1], "recipe_id", "Recipes")
+        return count
+
+    def meal_plan_rules(self, rows: Iterable[tuple]) -> int:
+        seen = _IdBitmap()
+        count = 0
+        for count, (rule_id, recipe_id, starts_on, ends_on, freq, every, weekdays, _time, _servings) in enumerate(
+            rows, start=1
+        ):
+            self._unique("MealPlanRules", count, seen, rule_id, "id")
+            self._reference("MealPlanRules", count, self.recipe_ids, recipe_id, "recipe_id", "Recipes")
+            if freq not in meal_calendar.FREQUENCIES:
+                self.report.add(
+                    "MealPlanRules", count, "bad_rule", f"freq {freq!r} is not one of {meal_calendar.FREQUENCIES}"
+                )
+            if not isinstance(every, int) or every < 1:
+                self.report.add("MealPlanRules", count, "bad_rule", f"every {every!r} is not a positive integer")
+            if not isinstance(weekdays, int) or not 0 <= weekdays <= 127:
+                self.report.add("MealPlanRules", count, "bad_rule", f"weekdays {weekdays!r} is not a 7-bit mask")
+            if ends_on is not None and ends_on < starts_on:
+                self.report.add(
+                    "MealPlanRules", count, "bad_rule", f"ends_on {ends_on} is before starts_on {starts_on}"
+                )
+        return count
+
+    def inventory_events(self, rows: Iterable[tuple]) -> int:
+        seen = _IdBitmap()
+        count = 0
+        for count, (event_id, ingredient_id, _at, kind, _delta, _quantity, unit, _expires) in enumerate(rows, start=1):
+            self._unique("InventoryEvents", count, seen, event_id, "id")
+            if self._reference("InventoryEvents", count, self.ingredient_ids, ingredient_id, "ingredient_id", "Ingredients"):
+                self._check_unit("InventoryEvents", count, ingredient_id, unit)
+            if kind not in inventory_log.EVENT_KINDS:
+                self.report.add("InventoryEvents", count, "bad_kind", f"kind {kind!r} is not one of {inventory_log.EVENT_KINDS}")
+        return count
+
+
+def _as_tuples(table: str, rows: Iterable) -> Iterator[tuple]:
+    row_values = operator.itemgetter(*seed.TABLE_COLUMNS[table])
+    for row in rows:
+        yield row_values(row) if isinstance(row, dict) else row
+
+
+def validate(dataset: Dict[str, Iterable], max_examples: int = 20) -> ValidationReport:
+    """Validate ``dataset`` (table -> iterable of dict rows or column-ordered tuples), consuming each iterable once."""
+    report = ValidationReport(max_examples)
+    validator = _Validator(report)
+    checks = {
+        "Ingredients": validator.ingredients,
+        "Recipes": validator.recipes,
+        "Inventory": validator.inventory,
+        "ShoppingItems": validator.shopping_items,
+        "RecipeIngredients": validator.recipe_ingredients,
+        "MealPlans": lambda rows: validator.recipe_events("MealPlans", rows),
+        "MealPlanRules": validator.meal_plan_rules,
+        "CookHistory": lambda rows: validator.recipe_events("CookHistory", rows),
+        "InventoryEvents": validator.inventory_events,
+    }
+    for table in VALIDATION_ORDER:
+        report.rows[table] = checks[table](_as_tuples(table, dataset.get(table, ())))
+    return report
+
+
+def stream_database(conn: sqlite3.Connection, arraysize: int = 4096) -> Dict[str, Iterator[tuple]]:
+    """Lazy, key-ordered row streams for every table of an open database (tables it lacks are skipped)."""
+    present = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    def rows(table: str) -> Iterator[tuple]:
+        cursor = conn.execute(
+            f"SELECT {', '.join(seed.TABLE_COLUMNS[table])} FROM {table} ORDER BY {READ_ORDER[table]}"
+        )
+        while True:
+            batch = cursor.fetchmany(arraysize)
+            if not batch:
+                return
+            yield from batch
+
+    return {table: rows(table) for table in VALIDATION_ORDER if table in present}
+
+
+def validate_db(path: Path, max_examples: int = 20) -> ValidationReport:
+    conn = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        return validate(stream_database(conn), max_examples)
+    finally:
+        conn.close()
+
+
+def run_benchmark(scale: int, repeat: int) -> None:
+    import benchlib
+
+    dataset = seed.generate_dataset(scale, random.Random(42))
+    path = benchlib.scaled_database(scale)
+    rows = sum(len(table_rows) for table_rows in dataset.values())
+
+    def sqlite_checks() -> None:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA foreign_key_check").fetchall()
+        conn.execute("PRAGMA integrity_check").fetchall()
+        conn.close()
+
+    benchlib.print_results(
+        f"dataset validation, scale x{scale} ({rows} rows)",
+        {
+            "validate(dataset) in memory": benchlib.measure(lambda: validate(dataset), repeat),
+            "validate_db (streamed)": benchlib.measure(lambda: validate_db(path), repeat),
+            "load + PRAGMA fk/integrity check": benchlib.measure(
+                lambda: (seed.write_db(path, dataset), sqlite_checks()), repeat
+            ),
+        },
+    )
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["check", "bench"], default="check")
+    parser.add_argument("--db", type=Path, help="validate an existing database")
+    parser.add_argument("--scale", type=int, default=1, help="validate a freshly generated dataset of this scale")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--examples", type=int, default=20, help="examples kept per violation kind")
+    parser.add_argument("--repeat", type=int, default=3, help="bench: timed repetitions per case")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None):
+    args = parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.scale, args.repeat)
+        return
+    if args.db:
+        if not args.db.exists():
+            print(f"Database not found at {args.db}", file=sys.stderr)
+            raise SystemExit(1)
+        report = validate_db(args.db, args.examples)
+    else:
+        report = validate(seed.generate_dataset(args.scale, random.Random(args.seed)), args.examples)
+    report.print()
+    if not report.ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()